@@ -0,0 +1,115 @@
+"""
+Submission throughput benchmark.
+
+``http`` mode fires ``--requests`` concurrent ``POST /calculate_pi`` calls at a running API.
+``manager`` mode drives ``CeleryTaskManager.enqueue`` directly against a Redis broker and
+compares the async publisher with the executor fallback.
+
+    python -m benchmarks.bench_enqueue http --base-url http://localhost:8000 --requests 1000
+    python -m benchmarks.bench_enqueue manager --redis-url redis://localhost:6379/0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+from src.app.domain.models.payloads import ComputePiPayload
+from src.app.domain.models.task import Task
+from src.app.domain.models.task_metadata import TaskMetadata
+from src.app.domain.models.task_progress import TaskProgress
+from src.app.domain.models.task_state import TaskState
+from src.app.domain.models.task_status import TaskStatus
+from src.app.domain.models.task_type import TaskType
+from src.app.infrastructure.celery.app import celery_app
+from src.app.infrastructure.celery.publisher import RedisCeleryPublisher
+from src.app.infrastructure.celery.repositories import CeleryTaskManager
+
+
+def _report(label: str, count: int, failures: int, elapsed: float) -> None:
+    rate = count / elapsed if elapsed else float("inf")
+    print(f"{label:<10} {count} submissions in {elapsed:.3f}s -> {rate:,.0f}/s ({failures} failed)")
+
+
+async def bench_http(base_url: str, requests: int, digits: int) -> None:
+    limits = httpx.Limits(max_connections=requests, max_keepalive_connections=requests)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(
+            *(client.post("/calculate_pi", json={"n": digits}) for _ in range(requests)),
+            return_exceptions=True,
+        )
+        elapsed = time.perf_counter() - started
+    failures = sum(
+        1
+        for response in responses
+        if isinstance(response, Exception) or response.status_code >= 400
+    )
+    _report("http", requests, failures, elapsed)
+
+
+def _task() -> Task:
+    return Task(
+        id=str(uuid.uuid4()),
+        task_type=TaskType.COMPUTE_PI,
+        payload=ComputePiPayload(digits=10),
+        status=TaskStatus(state=TaskState.QUEUED, progress=TaskProgress()),
+        metadata=TaskMetadata(),
+    )
+
+
+async def _drive(manager: CeleryTaskManager, requests: int) -> tuple[int, float]:
+    tasks = [_task() for _ in range(requests)]
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(manager.enqueue(task) for task in tasks), return_exceptions=True
+    )
+    elapsed = time.perf_counter() - started
+    return sum(isinstance(outcome, Exception) for outcome in outcomes), elapsed
+
+
+async def bench_manager(redis_url: str, requests: int, max_connections: int, threads: int) -> None:
+    celery_app.conf.broker_url = redis_url
+    celery_app.conf.result_backend = redis_url
+
+    publisher = RedisCeleryPublisher.from_url(
+        celery_app, redis_url, max_connections=max_connections
+    )
+    failures, elapsed = await _drive(CeleryTaskManager(publisher=publisher), requests)
+    await publisher.close()
+    _report("redis", requests, failures, elapsed)
+
+    failures, elapsed = await _drive(CeleryTaskManager(executor_workers=threads), requests)
+    _report("thread", requests, failures, elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    http = subparsers.add_parser("http")
+    http.add_argument("--base-url", default="http://localhost:8000")
+    http.add_argument("--requests", type=int, default=1000)
+    http.add_argument("--digits", type=int, default=10)
+
+    manager = subparsers.add_parser("manager")
+    manager.add_argument("--redis-url", default="redis://localhost:6379/0")
+    manager.add_argument("--requests", type=int, default=1000)
+    manager.add_argument("--max-connections", type=int, default=50)
+    manager.add_argument("--threads", type=int, default=8)
+
+    args = parser.parse_args()
+    if args.mode == "http":
+        asyncio.run(bench_http(args.base_url, args.requests, args.digits))
+    else:
+        asyncio.run(
+            bench_manager(args.redis_url, args.requests, args.max_connections, args.threads)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Inverted index benchmark.
+
+Compares a full scan of one document with answering the same keywords from its inverted
+index: the one-off build, then repeated queries. Without --document a file of --size-mb
+generated lines is written to a temp dir.
+
+    python -m benchmarks.bench_index --size-mb 64 --keywords whale harpoon
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.bench_scan import _write_document
+from src.app.worker.inverted_index import DocumentIndexStore
+from src.app.worker.scanning import DocumentScanner
+
+
+def _timed(label: str, size: int, run) -> None:
+    started = time.perf_counter()
+    hits = run()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<14} {elapsed:8.3f}s  {size / elapsed / 1e6:9.1f} MB/s  {hits:,} hits")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--document")
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--keywords", nargs="+", default=["whale", "harpoon"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.document
+        if path is None:
+            path = os.path.join(directory, "document.txt")
+            _write_document(path, args.size_mb * 1024 * 1024, random.Random(7))
+        size = os.path.getsize(path)
+        scanner = DocumentScanner(args.keywords, max_hits_per_block=None)
+        store = DocumentIndexStore(os.path.join(directory, "index"), max_bytes=1 << 40)
+
+        def scan() -> int:
+            return sum(len(window.hits) for window in scanner.scan(path))
+
+        def query() -> int:
+            with store.open(path) as index:
+                return sum(len(window.hits) for window in scanner.scan_indexed(path, index))
+
+        _timed("scan", size, scan)
+        _timed("build + query", size, query)
+        for _ in range(args.repeat):
+            _timed("index query", size, query)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Keyword matcher benchmark.
+
+Scans a Gutenberg-sized text (a real book via --document, otherwise ~1.2 MB of generated
+English-like text) with the regex alternation and the Aho-Corasick matcher for each
+keyword count. Keywords are drawn from the text's vocabulary, padded with words that do
+not occur.
+
+    python -m benchmarks.bench_matcher --document pg2701.txt --keywords 10 1000 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import string
+import time
+
+from src.app.worker.matching import AhoCorasickMatcher, KeywordMatcher, RegexMatcher
+
+CORPUS_BYTES = 1_200_000
+
+
+def _generated_corpus(rng: random.Random, size: int) -> str:
+    vocabulary = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10))) for _ in range(20_000)
+    ]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    words: list[str] = []
+    length = 0
+    while length < size:
+        batch = rng.choices(vocabulary, weights=weights, k=10_000)
+        words.extend(batch)
+        length += sum(len(word) + 1 for word in batch)
+    return " ".join(words)[:size]
+
+
+def _keywords(rng: random.Random, text: str, count: int) -> list[str]:
+    vocabulary = sorted(set(re.findall(r"[a-z]{4,}", text.lower())))
+    found = rng.sample(vocabulary, min(count // 2, len(vocabulary)))
+    missing = [
+        "".join(rng.choices(string.ascii_lowercase, k=12)) for _ in range(count - len(found))
+    ]
+    return found + missing
+
+
+def _scan(matcher: KeywordMatcher, text: str) -> tuple[float, int]:
+    started = time.perf_counter()
+    matches = sum(1 for _ in matcher.finditer(text))
+    return time.perf_counter() - started, matches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--document", help="Text file to scan instead of generated text.")
+    parser.add_argument("--keywords", type=int, nargs="+", default=[10, 1_000, 50_000])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    if args.document:
+        with open(args.document, encoding="utf-8", errors="ignore") as handle:
+            text = handle.read()
+    else:
+        text = _generated_corpus(rng, CORPUS_BYTES)
+    print(f"corpus: {len(text):,} characters")
+
+    for count in args.keywords:
+        keywords = _keywords(rng, text, count)
+        for name, factory in (("regex", RegexMatcher), ("aho-corasick", AhoCorasickMatcher)):
+            started = time.perf_counter()
+            matcher = factory(keywords)
+            build = time.perf_counter() - started
+            elapsed, matches = _scan(matcher, text)
+            print(
+                f"{count:>6} keywords  {name:<13} build {build:7.3f}s  scan {elapsed:8.3f}s  "
+                f"{len(text) / elapsed / 1e6:7.2f} MB/s  {matches:,} matches"
+            )
+
+
+if __name__ == "__main__":
+    main()
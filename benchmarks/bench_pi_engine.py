@@ -0,0 +1,62 @@
+"""
+π engine benchmark.
+
+Times the in-repo Chudnovsky engine (serially and across a process pool) against
+mpmath for every requested digit count and checks that all engines agree.
+
+    python -m benchmarks.bench_pi_engine --digits 1000 10000 100000 1000000 --processes 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+
+from mpmath.libmp import BACKEND, mpf_pi, to_str
+
+from src.app.worker import chudnovsky
+from src.app.worker.chudnovsky import pi_decimals
+
+
+def mpmath_decimals(count: int) -> str:
+    dps = count + chudnovsky.GUARD_DIGITS
+    return to_str(mpf_pi(int(dps * 3.3219280948873626) + 16), dps + 1)[2 : 2 + count]
+
+
+def _time(engine: Callable[[int], str], digits: int, repeat: int) -> tuple[float, str]:
+    best = float("inf")
+    result = ""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = engine(digits)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--digits", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3, help="Best of N runs per engine.")
+    args = parser.parse_args()
+
+    engines: dict[str, Callable[[int], str]] = {
+        f"mpmath ({BACKEND})": mpmath_decimals,
+        "chudnovsky": pi_decimals,
+        f"chudnovsky x{args.processes}": lambda n: pi_decimals(n, processes=args.processes),
+    }
+    print(f"gmpy2: {'yes' if chudnovsky.gmpy2 is not None else 'no'}")
+    for digits in args.digits:
+        reference = None
+        for name, engine in engines.items():
+            elapsed, result = _time(engine, digits, args.repeat)
+            reference = reference or result
+            status = "ok" if result == reference else "MISMATCH"
+            print(f"{digits:>9} digits  {name:<22} {elapsed:9.3f}s  {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Document scan benchmark.
+
+Compares the memory-mapped window scanner, serially and across --processes worker
+processes, with the previous line-chunk loop (``islice`` of lines, per-line decode,
+join, ``split`` for word counts) on one file. Without --document a file of --size-mb
+generated lines is written to a temp dir.
+
+    python -m benchmarks.bench_scan --size-mb 512 --processes 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import os
+import random
+import re
+import string
+import tempfile
+import time
+
+from src.app.worker.scanning import DocumentScanner
+
+LINES_PER_CHUNK = 175
+
+
+def _write_document(path: str, size: int, rng: random.Random) -> None:
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(5000)]
+    words += ["whale", "harpoon"]
+    with open(path, "w", encoding="utf-8") as handle:
+        written = 0
+        while written < size:
+            line = " ".join(rng.choices(words, k=12)) + "\n"
+            handle.write(line)
+            written += len(line)
+
+
+def scan_lines(path: str, keywords: list[str]) -> tuple[int, int]:
+    pattern = re.compile("|".join(re.escape(keyword) for keyword in keywords), re.IGNORECASE)
+    matches = words = 0
+    with open(path, "rb") as handle:
+        while lines := list(itertools.islice(handle, LINES_PER_CHUNK)):
+            text_lines = [line.decode("utf-8", errors="ignore") for line in lines]
+            chunk_text = "".join(text_lines)
+            list(itertools.accumulate((len(line) for line in text_lines), initial=0))
+            words += len(chunk_text.split())
+            matches += sum(1 for _ in pattern.finditer(chunk_text))
+    return matches, words
+
+
+def scan_mmap(path: str, keywords: list[str]) -> tuple[int, int]:
+    matches = words = 0
+    scanner = DocumentScanner(keywords, max_hits_per_block=None)
+    for window in scanner.scan(path):
+        matches += len(window.hits)
+        words += window.words
+    return matches, words
+
+
+def scan_parallel(path: str, keywords: list[str], processes: int) -> tuple[int, int]:
+    matches = words = 0
+    scanner = DocumentScanner(keywords, max_hits_per_block=None)
+    for window in scanner.scan_parallel(path, processes):
+        matches += len(window.hits)
+        words += window.words
+    return matches, words
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--document")
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--keywords", nargs="+", default=["whale", "harpoon"])
+    parser.add_argument("--processes", type=int, nargs="*", default=[2, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.document
+        if path is None:
+            path = os.path.join(directory, "document.txt")
+            _write_document(path, args.size_mb * 1024 * 1024, random.Random(7))
+        size = os.path.getsize(path)
+        scans = [("line chunks", scan_lines), ("mmap windows", scan_mmap)]
+        scans += [
+            (f"mmap x{processes}", lambda p, k, n=processes: scan_parallel(p, k, n))
+            for processes in args.processes
+        ]
+        for name, scan in scans:
+            started = time.perf_counter()
+            matches, words = scan(path, args.keywords)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{name:<13} {elapsed:8.2f}s  {size / elapsed / 1e6:8.1f} MB/s  "
+                f"{matches:,} matches  {words:,} words"
+            )
+
+
+if __name__ == "__main__":
+    main()
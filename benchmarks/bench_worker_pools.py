@@ -0,0 +1,151 @@
+"""
+Worker pool throughput benchmark.
+
+For every ``pool:min:max[:prefetch]`` configuration a dedicated worker is started on the
+task type's queue, ``--tasks`` jobs are published, and the run ends once all of them have
+emitted their final ``task.result`` event on the stream. Use a scratch Redis: the queue is
+flushed before each run and no other worker should consume it.
+
+    python -m benchmarks.bench_worker_pools --redis-url redis://localhost:6379/0 \\
+        --task-type compute_pi prefork:1:4 prefork:4:4 threads:8:8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+from redis.asyncio import Redis
+
+from src.app.domain.models.payloads import ComputePiPayload, DocumentAnalysisPayload
+from src.app.domain.models.task import Task
+from src.app.domain.models.task_metadata import TaskMetadata
+from src.app.domain.models.task_progress import TaskProgress
+from src.app.domain.models.task_state import TaskState
+from src.app.domain.models.task_status import TaskStatus
+from src.app.domain.events.task_event import EventType
+from src.app.domain.models.task_type import TaskType
+from src.app.infrastructure.celery.app import celery_app
+from src.app.infrastructure.celery.publisher import (
+    RedisCeleryPublisher,
+    broker_queue_key,
+    priority_steps,
+)
+from src.app.infrastructure.celery.repositories import CeleryTaskManager
+from src.app.infrastructure.celery.task_registry import TaskRegistry
+from src.app.infrastructure.streams.consumer import STREAM_TASK_EVENTS
+
+
+def _payload(task_type: TaskType, args: argparse.Namespace):
+    if task_type == TaskType.COMPUTE_PI:
+        return ComputePiPayload(digits=args.digits)
+    return DocumentAnalysisPayload(document_path=args.document_path, keywords=args.keywords)
+
+
+def _task(task_type: TaskType, args: argparse.Namespace) -> Task:
+    return Task(
+        id=str(uuid.uuid4()),
+        task_type=task_type,
+        payload=_payload(task_type, args),
+        status=TaskStatus(state=TaskState.QUEUED, progress=TaskProgress()),
+        metadata=TaskMetadata(),
+    )
+
+
+def _pool_settings(queue: str, spec: str) -> dict[str, object]:
+    pool, minimum, maximum, *rest = spec.split(":")
+    return {
+        "queue": queue,
+        "pool": pool,
+        "min_concurrency": int(minimum),
+        "max_concurrency": int(maximum),
+        "prefetch_multiplier": int(rest[0]) if rest else 1,
+    }
+
+
+async def _wait_for_results(
+    redis: Redis, task_ids: set[str], start_id: str, timeout: float
+) -> int:
+    pending = set(task_ids)
+    last_id = start_id
+    deadline = time.monotonic() + timeout
+    while pending and time.monotonic() < deadline:
+        replies = await redis.xread({STREAM_TASK_EVENTS: last_id}, count=500, block=1000)
+        for _, entries in replies:
+            for entry_id, fields in entries:
+                last_id = entry_id
+                if fields.get("type") == EventType.TASK_RESULT.value:
+                    pending.discard(fields.get("task_id"))
+    return len(task_ids) - len(pending)
+
+
+async def run_configuration(args: argparse.Namespace, spec: str) -> None:
+    task_type = TaskType(args.task_type)
+    queue = TaskRegistry().route_for_task_type(task_type).queue or "celery"
+    redis = Redis.from_url(args.redis_url, decode_responses=True)
+    await redis.delete(
+        *(broker_queue_key(celery_app, queue, step) for step in priority_steps(celery_app))
+    )
+
+    env = {
+        **os.environ,
+        "REDIS_URL": args.redis_url,
+        "WORKER_POOLS": json.dumps([_pool_settings(queue, spec)]),
+        "LOG_LEVEL": "WARNING",
+    }
+    worker = subprocess.Popen(
+        [sys.executable, "-m", "src.app.worker.main", "--queue", queue], env=env
+    )
+    publisher = RedisCeleryPublisher.from_url(celery_app, args.redis_url, store_sent_state=False)
+    try:
+        await asyncio.sleep(args.warmup)
+        tasks = [_task(task_type, args) for _ in range(args.tasks)]
+        latest = await redis.xrevrange(STREAM_TASK_EVENTS, count=1)
+        start_id = latest[0][0] if latest else "0-0"
+        started = time.perf_counter()
+        await CeleryTaskManager(publisher=publisher).enqueue_many(tasks)
+        completed = await _wait_for_results(
+            redis, {task.id for task in tasks}, start_id, args.timeout
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        worker.terminate()
+        worker.wait()
+        await publisher.close()
+        await redis.aclose()
+    print(
+        f"{spec:<20} {completed}/{args.tasks} tasks in {elapsed:.2f}s "
+        f"-> {completed / elapsed:.2f} tasks/s"
+    )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    celery_app.conf.broker_url = args.redis_url
+    for spec in args.configs:
+        await run_configuration(args, spec)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("configs", nargs="+", help="pool:min:max[:prefetch], e.g. prefork:1:4")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    parser.add_argument("--task-type", choices=[t.value for t in TaskType], default="compute_pi")
+    parser.add_argument("--tasks", type=int, default=50)
+    parser.add_argument("--digits", type=int, default=5)
+    parser.add_argument("--document-path", help="Document analysed by document_analysis jobs.")
+    parser.add_argument("--keywords", nargs="+", default=["the"])
+    parser.add_argument(
+        "--warmup", type=float, default=3.0, help="Seconds to let the worker boot."
+    )
+    parser.add_argument("--timeout", type=float, default=600.0)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
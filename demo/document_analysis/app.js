@@ -32,6 +32,33 @@ const formatBytes = (bytes) => {
   return `${(bytes / (1024 * 1024)).toFixed(2)} MB`;
 };
 
+// Expands a columnar result chunk (see to_columns in src/app/worker/reporter.py) back into
+// items: header fields are shared, dictionary columns hold indexes, dotted keys nest.
+function fromColumns(data) {
+  const items = [];
+  const columns = Object.entries(data.columns ?? {});
+  const dictionaries = data.dictionaries ?? {};
+  for (let i = 0; i < (data.count ?? 0); i += 1) {
+    const flat = { ...(data.header ?? {}) };
+    for (const [key, values] of columns) {
+      const value = values[i];
+      if (value === null || value === undefined) continue;
+      flat[key] = dictionaries[key] ? dictionaries[key][value] : value;
+    }
+    const item = {};
+    for (const [key, value] of Object.entries(flat)) {
+      const parts = key.split(".");
+      let target = item;
+      for (const part of parts.slice(0, -1)) {
+        target = target[part] ??= {};
+      }
+      target[parts[parts.length - 1]] = value;
+    }
+    items.push(item);
+  }
+  return items;
+}
+
 function log(level, message, data) {
   const ts = new Date().toISOString().split("T")[1].split(".")[0];
   let line = `[${ts}] ${level.toUpperCase()}: ${message}`;
@@ -227,7 +254,13 @@ class StreamingEngine {
     }
     if (message.type === "task.result_chunk") {
       const payload = message.payload;
-      const data = Array.isArray(payload?.data) ? payload.data : [];
+      const data = payload?.data?.format === "columnar"
+        ? fromColumns(payload.data)
+        : Array.isArray(payload?.data) ? payload.data : [];
+      const watermark = payload?.progress?.percentage;
+      if (typeof watermark === "number") {
+        this.state.progress = Math.max(this.state.progress, watermark);
+      }
       if (data.length) {
         const lines = [];
         for (const item of data) {
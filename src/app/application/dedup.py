@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import hashlib
+import json
+
+from src.app.domain.models import TaskPayload, TaskType
+
+# Results of these types are streamed as result chunks that are not stored, so a copied
+# result or a run joined midway would miss them. Identical submissions of these types
+# (e.g. the same document and keyword set) each run on their own.
+_STREAMED_RESULT_TYPES = frozenset({TaskType.DOCUMENT_ANALYSIS})
+
+
+def is_reusable(task_type: TaskType) -> bool:
+    """Whether a run of ``task_type`` can serve identical submissions."""
+    return task_type not in _STREAMED_RESULT_TYPES
+
+
+def task_fingerprint(task_type: TaskType, payload: TaskPayload) -> str:
+    """
+    Content address of a submission: sha256 over canonical JSON of the task type and
+    the payload's outcome-relevant fields (sorted keys, no insignificant whitespace).
+    """
+    canonical = json.dumps(
+        {"task_type": task_type.value, "payload": payload.fingerprint_data()},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
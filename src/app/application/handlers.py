@@ -5,7 +5,9 @@ from functools import wraps
 import inject
 
 from src.app.application.broadcaster import TaskStatusBroadcaster
+from src.app.application.notifier import TaskChangeNotifier, status_notifier
 from src.app.domain.events.task_event import TaskEvent
+from src.app.domain.models.task_progress import TaskProgress
 from src.app.domain.models.task_result import TaskResult
 from src.app.domain.models.task_state import TaskState
 from src.app.domain.models.task_status import TaskStatus
@@ -41,12 +43,21 @@ class TaskEventHandler:
         storage: StorageRepository | None = None,
         broadcaster: TaskStatusBroadcaster | None = None,
         status_delta: float = 0.02,
+        notifier: TaskChangeNotifier | None = None,
     ) -> None:
         self._storage = storage or inject.instance(StorageRepository)
         self._broadcaster = broadcaster or inject.instance(TaskStatusBroadcaster)
+        self._notifier = notifier or status_notifier
         self._status_delta = status_delta
         self._status_cache: dict[str, float] = {}
+        # Last running status per task, which chunk progress watermarks are applied to.
+        self._running_status: dict[str, TaskStatus] = {}
         self._cpu_ws_total_ms: dict[str, float] = {}
+        # Dedup followers per leader, with the follower version they were loaded at.
+        self._followers: dict[str, list[str]] = {}
+        self._follower_versions: dict[str, int] = {}
+        # Leaders cancelled by their owner whose run goes on for their followers.
+        self._released: set[str] = set()
 
     @ws_cpu_meter
     async def handle_status_event(self, event: TaskEvent) -> None:
@@ -59,19 +70,20 @@ class TaskEventHandler:
         status.metadata["server_cpu_ms_ws"] = self._cpu_ws_total_ms.get(event.task_id, 0.0)
         status.metadata["server_sent_ts"] = time.time()
         event.payload["status"] = status.model_dump(mode="json")
-        pct = status.progress.percentage or 0.0
-        last_pct = self._status_cache.get(event.task_id)
         is_terminal = status.state in {
             TaskState.COMPLETED,
             TaskState.FAILED,
             TaskState.CANCELLED,
         }
-        if last_pct is None or abs(pct - last_pct) >= self._status_delta or is_terminal:
-            await self._storage.update_task_status(event.task_id, status)
-            self._status_cache[event.task_id] = pct
-            if is_terminal:
-                self._status_cache.pop(event.task_id, None)
-        await self._broadcaster.broadcast_status(event)
+        await self._persist_status(event.task_id, status, is_terminal)
+        if is_terminal:
+            self._running_status.pop(event.task_id, None)
+        else:
+            self._running_status[event.task_id] = status
+        for follower_event in self._with_followers(event):
+            await self._broadcaster.broadcast_status(follower_event)
+        if is_terminal:
+            self._forget_followers(event.task_id)
 
     async def handle_result_event(self, event: TaskEvent) -> None:
         result_payload = event.payload.get("result")
@@ -81,7 +93,12 @@ class TaskEventHandler:
             result = TaskResult.model_validate(result_data)
         else:
             result = TaskResult(task_id=event.task_id, data=result_payload)
-        await self._storage.set_task_result(event.task_id, result)
+        await self._load_followers(event.task_id)
+        for task_id in self._targets(event.task_id):
+            await self._storage.set_task_result(
+                task_id, result.model_copy(update={"task_id": task_id}), finished_at=event.ts
+            )
+        self._forget_followers(event.task_id)
 
     @ws_cpu_meter
     async def handle_result_chunk_event(self, event: TaskEvent) -> None:
@@ -90,4 +107,69 @@ class TaskEventHandler:
             raise ValueError("Result chunk payload is missing or invalid")
         if "chunk_id" not in payload or "data" not in payload:
             raise ValueError("Result chunk payload must include chunk_id and data")
-        await self._broadcaster.broadcast_result_chunk(event)
+        await self._load_followers(event.task_id)
+        watermark = payload.get("progress")
+        running = self._running_status.get(event.task_id)
+        if isinstance(watermark, dict) and running is not None:
+            # Chunks stand in for status events between them: their progress is stored on
+            # the last running status, which keeps that status's metrics and message.
+            status = running.model_copy(update={"progress": TaskProgress.model_validate(watermark)})
+            if await self._persist_status(event.task_id, status, is_terminal=False, forward=True):
+                self._running_status[event.task_id] = status
+        for follower_event in self._with_followers(event):
+            await self._broadcaster.broadcast_result_chunk(follower_event)
+
+    async def _persist_status(
+        self, task_id: str, status: TaskStatus, is_terminal: bool, forward: bool = False
+    ) -> bool:
+        """
+        Store ``status`` for the task and its followers when its percentage moved by at
+        least the status delta (only upwards with ``forward``) or it is terminal.
+        """
+        pct = status.progress.percentage or 0.0
+        last_pct = self._status_cache.get(task_id)
+        moved = last_pct is None or abs(pct - last_pct) >= self._status_delta
+        if forward and last_pct is not None:
+            moved = pct - last_pct >= self._status_delta
+        if not (moved or is_terminal):
+            return False
+        await self._load_followers(task_id)
+        for target_id in self._targets(task_id):
+            version = await self._storage.update_task_status(target_id, status)
+            await self._notifier.notify_status(target_id, version)
+        self._status_cache[task_id] = pct
+        if is_terminal:
+            self._status_cache.pop(task_id, None)
+        return True
+
+    async def _load_followers(self, task_id: str) -> list[str]:
+        """
+        Dedup followers of ``task_id``, read from storage only the first time and after
+        the task service reported a follower change for it. A leader found CANCELLED
+        while it has followers was cancelled by its owner, and its run goes on for them.
+        """
+        version = self._notifier.follower_version(task_id)
+        if task_id not in self._followers or self._follower_versions.get(task_id) != version:
+            followers = await self._storage.get_follower_ids(task_id)
+            self._followers[task_id] = followers
+            self._follower_versions[task_id] = version
+            if followers and await self._storage.get_task_state(task_id) == TaskState.CANCELLED:
+                self._released.add(task_id)
+        return self._followers[task_id]
+
+    def _forget_followers(self, task_id: str) -> None:
+        self._followers.pop(task_id, None)
+        self._follower_versions.pop(task_id, None)
+        self._released.discard(task_id)
+
+    def _targets(self, task_id: str) -> list[str]:
+        """Tasks the run of ``task_id`` reports to: itself unless released, and its followers."""
+        own = [] if task_id in self._released else [task_id]
+        return [*own, *self._followers.get(task_id, [])]
+
+    def _with_followers(self, event: TaskEvent) -> list[TaskEvent]:
+        """The event for each task the run reports to, addressed to that task."""
+        return [
+            event if task_id == event.task_id else event.model_copy(update={"task_id": task_id})
+            for task_id in self._targets(event.task_id)
+        ]
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+
+
+class TaskChangeNotifier:
+    """
+    In-process status versions that long-polling requests can park on.
+
+    The event handler bumps a task's version whenever it persists a status change;
+    waiters blocked on that task are woken through an ``asyncio.Condition``. The task
+    service likewise bumps a leader's follower version when a dedup follower attaches,
+    so the event handler can cache follower lists between changes.
+    """
+
+    def __init__(self, max_tracked: int = 10_000) -> None:
+        self._max_tracked = max_tracked
+        self._versions: OrderedDict[str, int] = OrderedDict()
+        self._conditions: dict[str, asyncio.Condition] = {}
+        self._waiters: dict[str, int] = {}
+        self._follower_versions: OrderedDict[str, int] = OrderedDict()
+        # Follower versions come from one counter, so a version evicted and bumped again
+        # never repeats a value a cache may still hold.
+        self._follower_changes = 0
+
+    def status_version(self, task_id: str) -> int:
+        return self._versions.get(task_id, 0)
+
+    async def notify_status(self, task_id: str, version: int | None = None) -> int:
+        """Record a status change for ``task_id`` and wake its waiters."""
+        if version is None:
+            version = self.status_version(task_id) + 1
+        self._versions[task_id] = version
+        self._versions.move_to_end(task_id)
+        while len(self._versions) > self._max_tracked:
+            self._versions.popitem(last=False)
+        condition = self._conditions.get(task_id)
+        if condition is not None:
+            async with condition:
+                condition.notify_all()
+        return version
+
+    def follower_version(self, task_id: str) -> int:
+        return self._follower_versions.get(task_id, 0)
+
+    def notify_followers(self, task_id: str) -> int:
+        """Record that the followers of ``task_id`` changed."""
+        self._follower_changes += 1
+        version = self._follower_changes
+        self._follower_versions[task_id] = version
+        self._follower_versions.move_to_end(task_id)
+        while len(self._follower_versions) > self._max_tracked:
+            self._follower_versions.popitem(last=False)
+        return version
+
+    async def wait_for_status(
+        self, task_id: str, since_version: int | None, timeout: float
+    ) -> int:
+        """
+        Wait until the status version differs from ``since_version`` or ``timeout`` elapses.
+        Returns the version observed on wake-up; without ``since_version`` it returns at once.
+        """
+        if (
+            since_version is None
+            or timeout <= 0
+            or self.status_version(task_id) != since_version
+        ):
+            return self.status_version(task_id)
+
+        condition = self._conditions.setdefault(task_id, asyncio.Condition())
+        self._waiters[task_id] = self._waiters.get(task_id, 0) + 1
+        try:
+            async with condition:
+                await asyncio.wait_for(
+                    condition.wait_for(lambda: self.status_version(task_id) != since_version),
+                    timeout,
+                )
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            remaining = self._waiters[task_id] - 1
+            if remaining:
+                self._waiters[task_id] = remaining
+            else:
+                self._waiters.pop(task_id, None)
+                self._conditions.pop(task_id, None)
+        return self.status_version(task_id)
+
+
+status_notifier = TaskChangeNotifier()
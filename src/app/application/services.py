@@ -1,6 +1,12 @@
+import asyncio
 import inject
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from src.app.application.dedup import is_reusable, task_fingerprint
+from src.app.application.notifier import TaskChangeNotifier, status_notifier
+from src.app.domain.exceptions import TaskNotCancellableError, TaskNotFoundError
 from src.app.domain.models import (
+    DocumentAnalysisPayload,
+    ExecutionConfig,
     Task,
     TaskMetadata,
     TaskPayload,
@@ -10,14 +16,30 @@ from src.app.domain.models import (
     TaskStatus,
     TaskType,
 )
-from src.app.domain.repositories import StorageRepository, TaskManagerRepository
+from src.app.domain.repositories import (
+    DocumentRepository,
+    StorageRepository,
+    TaskManagerRepository,
+)
 
 class TaskService:
     """Handles submission of asynchronous tasks to the Celery broker."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        notifier: TaskChangeNotifier | None = None,
+        dedup_ttl_seconds: int | None = None,
+        documents: DocumentRepository | None = None,
+    ):
+        """
+        ``dedup_ttl_seconds`` enables deduplication and bounds how old a reused result may be.
+        ``documents`` serves snippet context for document analysis tasks.
+        """
         self._task_manager: TaskManagerRepository = inject.instance(TaskManagerRepository)
         self._storage: StorageRepository = inject.instance(StorageRepository)
+        self._notifier = notifier or status_notifier
+        self._dedup_ttl_seconds = dedup_ttl_seconds
+        self._documents = documents
 
     async def push_task(
         self, task_type: TaskType, payload: TaskPayload, user_id: str = "anonymous"
@@ -27,18 +49,40 @@ class TaskService:
         return task.id
 
     async def create_task(
-        self, task_type: TaskType, payload: TaskPayload, user_id: str = "anonymous"
+        self,
+        task_type: TaskType,
+        payload: TaskPayload,
+        user_id: str = "anonymous",
+        execution: ExecutionConfig | None = None,
     ) -> Task:
         """
         Create a typed task and enqueue it via the task manager.
+        ``execution`` overrides the broker priority, limits and scheduling for this task.
+
+        With deduplication enabled, an identical submission reuses a recent result or
+        attaches to the in-flight run instead of being enqueued again. Document analysis
+        is never deduplicated: its snippets are streamed, not stored.
         """
+        now = datetime.now(timezone.utc)
         task = Task(
             task_type=task_type,
             payload=payload,
             status=TaskStatus(state=TaskState.QUEUED, progress=TaskProgress()),
-            metadata=TaskMetadata(created_at=datetime.now(timezone.utc)),
+            metadata=TaskMetadata(created_at=now),
+            execution=execution,
         )
+        task.fingerprint = self._fingerprint(task_type, payload)
+        if task.fingerprint is not None:
+            leader = await self._find_leader(task.fingerprint, now)
+            if leader is not None:
+                return await self._attach_to_leader(task, leader, user_id)
+
         task.id = await self._storage.create_task(user_id, task)
+        await self._enqueue(task)
+        return task
+
+    async def _enqueue(self, task: Task) -> None:
+        """Enqueue a stored task, marking it FAILED if the broker rejects it."""
         try:
             task.id = await self._task_manager.enqueue(task)
         except Exception as exc:
@@ -48,12 +92,245 @@ class TaskService:
                 metadata=TaskMetadata(updated_at=datetime.now(timezone.utc)),
             )
             raise
+
+    def _fingerprint(self, task_type: TaskType, payload: TaskPayload) -> str | None:
+        if self._dedup_ttl_seconds is None or not is_reusable(task_type):
+            return None
+        return task_fingerprint(task_type, payload)
+
+    async def _find_leader(self, fingerprint: str, now: datetime) -> Task | None:
+        completed_since = now - timedelta(seconds=self._dedup_ttl_seconds or 0)
+        return await self._storage.find_dedup_leader(fingerprint, completed_since)
+
+    async def _attach_to_leader(self, task: Task, leader: Task, user_id: str) -> Task:
+        """
+        Store ``task`` as a follower of ``leader``: a finished leader's result is copied
+        right away, otherwise the event handler fans the leader's events out to it. A
+        leader that stopped without a result before the follower was stored leaves it
+        to run on its own.
+        """
+        task.leader_id = leader.id
+        if leader.result is not None:
+            task.id = await self._storage.create_task(user_id, task)
+            await self._copy_result(task, leader)
+            return task
+
+        task.status = leader.status
+        task.id = await self._storage.create_task(user_id, task)
+        self._notifier.notify_followers(leader.id)
+        # The leader may have finished between the lookup and the insert, in which case
+        # no event will reach this follower any more.
+        if await self._storage.get_task_state(leader.id) in {TaskState.QUEUED, TaskState.RUNNING}:
+            return task
+        finished = await self._find_leader(task.fingerprint, datetime.now(timezone.utc))
+        if finished is not None and finished.result is not None:
+            await self._copy_result(task, finished)
+        else:
+            await self._run_detached(task)
         return task
 
+    async def _run_detached(self, task: Task) -> None:
+        """Turn a follower into a task of its own and enqueue it."""
+        await self._storage.detach_follower(task.id)
+        task.leader_id = None
+        task.status = TaskStatus(state=TaskState.QUEUED, progress=TaskProgress())
+        version = await self._storage.update_task_status(task.id, task.status)
+        await self._notifier.notify_status(task.id, version)
+        await self._enqueue(task)
+
+    async def _copy_result(self, task: Task, leader: Task) -> None:
+        finished_at = datetime.now(timezone.utc)
+        task.result = leader.result
+        task.status = TaskStatus(
+            state=TaskState.COMPLETED,
+            progress=TaskProgress(percentage=1.0),
+            message=f"Result reused from task {leader.id}.",
+        )
+        task.metadata.finished_at = finished_at
+        await self._storage.set_task_result(
+            task.id, TaskResult(task_id=task.id, data=leader.result), finished_at=finished_at
+        )
+        version = await self._storage.update_task_status(task.id, task.status)
+        await self._notifier.notify_status(task.id, version)
+
+    async def create_tasks(
+        self,
+        submissions: list[tuple[TaskType, TaskPayload, ExecutionConfig | None]],
+        user_id: str = "anonymous",
+    ) -> list[Task]:
+        """
+        Create many typed tasks in one storage transaction and enqueue them together.
+
+        Tasks the broker rejects are marked FAILED (with the error as message) instead of
+        aborting the batch, mirroring the single-task fallback. Batch items are always run
+        but carry their fingerprint, so later identical submissions can reuse them.
+        """
+        now = datetime.now(timezone.utc)
+        tasks = [
+            Task(
+                task_type=task_type,
+                payload=payload,
+                status=TaskStatus(state=TaskState.QUEUED, progress=TaskProgress()),
+                metadata=TaskMetadata(created_at=now),
+                execution=execution,
+                fingerprint=self._fingerprint(task_type, payload),
+            )
+            for task_type, payload, execution in submissions
+        ]
+        if not tasks:
+            return tasks
+        await self._storage.create_tasks(user_id, tasks)
+        try:
+            outcomes = await self._task_manager.enqueue_many(tasks)
+        except Exception as exc:
+            outcomes = [exc] * len(tasks)
+
+        failed: dict[str, TaskStatus] = {}
+        for task, outcome in zip(tasks, outcomes):
+            if not isinstance(outcome, Exception):
+                task.id = outcome
+                continue
+            task.status = TaskStatus(
+                state=TaskState.FAILED, progress=TaskProgress(), message=str(outcome)
+            )
+            failed[task.id] = task.status
+        if failed:
+            await self._storage.update_task_statuses(
+                failed, metadata=TaskMetadata(updated_at=datetime.now(timezone.utc))
+            )
+        return tasks
+
+    async def cancel_task(self, task_id: str, user_id: str = "anonymous") -> TaskStatus:
+        """
+        Ask the worker running ``task_id`` to stop; it reports CANCELLED at its next
+        check, and a queued task is cancelled when it starts. Returns the status at the
+        time of the request. Raises ``TaskNotCancellableError`` for finished tasks.
+
+        Dedup runs are shared, so cancelling never reaches another user's task: a
+        follower is detached from its leader and cancelled on its own, and a leader
+        with followers is cancelled while its run goes on for them. The run is only
+        stopped once no task is waiting for it.
+        """
+        task = await self._storage.get_task(user_id, task_id)
+        if task is None:
+            raise TaskNotFoundError(task_id)
+        if task.status.state in {TaskState.COMPLETED, TaskState.FAILED, TaskState.CANCELLED}:
+            raise TaskNotCancellableError(task_id, f"it is already {task.status.state.value}")
+        if task.leader_id is not None:
+            await self._storage.detach_follower(task_id)
+            await self._mark_cancelled(task_id, f"Stopped following task {task.leader_id}.")
+            self._notifier.notify_followers(task.leader_id)
+            if (
+                await self._storage.get_task_state(task.leader_id) == TaskState.CANCELLED
+                and not await self._storage.get_follower_ids(task.leader_id)
+            ):
+                # The leader was cancelled and kept its run only for its followers.
+                await self._task_manager.request_cancellation(task.leader_id)
+            return task.status
+        if await self._storage.get_follower_ids(task_id):
+            await self._mark_cancelled(task_id, "Cancelled; the run continues for its followers.")
+            # The event handler reloads the followers, sees the leader cancelled and
+            # stops writing the run's events to it.
+            self._notifier.notify_followers(task_id)
+            return task.status
+        await self._task_manager.request_cancellation(task_id)
+        return task.status
+
+    async def _mark_cancelled(self, task_id: str, message: str) -> None:
+        status = TaskStatus(state=TaskState.CANCELLED, progress=TaskProgress(), message=message)
+        version = await self._storage.update_task_status(
+            task_id, status, metadata=TaskMetadata(updated_at=datetime.now(timezone.utc))
+        )
+        await self._notifier.notify_status(task_id, version)
+
     async def get_status(self, task_id: str, user_id: str = "anonymous") -> TaskStatus:
         """Return the current status for the task identified by ``task_id``."""
         return await self._storage.get_status(user_id, task_id)
 
+    async def get_status_with_version(
+        self, task_id: str, user_id: str = "anonymous"
+    ) -> tuple[TaskStatus, int]:
+        """Return the current status for ``task_id`` and its version from one lookup."""
+        return await self._storage.get_status_with_version(user_id, task_id)
+
+    async def get_statuses(
+        self, task_ids: list[str], user_id: str = "anonymous"
+    ) -> dict[str, TaskStatus]:
+        """Return statuses for every task in ``task_ids`` owned by the user, in one lookup."""
+        return await self._storage.get_statuses(user_id, list(dict.fromkeys(task_ids)))
+
+    async def get_status_version(
+        self,
+        task_id: str,
+        since_version: int | None = None,
+        wait_seconds: float = 0.0,
+        user_id: str = "anonymous",
+    ) -> int:
+        """
+        Return the status version for ``task_id`` without loading the status itself.
+
+        When ``since_version`` matches the current version and ``wait_seconds`` is positive,
+        park until the event handler reports a change or the wait expires (long polling).
+        """
+        # Take the in-process marker first so a change landing between the lookup and
+        # the wait still wakes us up.
+        marker = self._notifier.status_version(task_id)
+        version = await self._storage.get_status_version(user_id, task_id)
+        if since_version is None or version != since_version or wait_seconds <= 0:
+            return version
+        await self._notifier.wait_for_status(task_id, marker, wait_seconds)
+        return await self._storage.get_status_version(user_id, task_id)
+
+    async def get_result_version(self, task_id: str, user_id: str = "anonymous") -> int:
+        """Return the result version for ``task_id`` without loading the result itself."""
+        return await self._storage.get_result_version(user_id, task_id)
+
     async def get_result(self, task_id: str, user_id: str = "anonymous") -> TaskResult:
         """Return the current result payload for the task identified by ``task_id``."""
         return await self._storage.get_result(user_id, task_id)
+
+    async def get_snippet_contexts(
+        self,
+        task_id: str,
+        snippets: list[tuple[int, int, int]],
+        radius: int,
+        user_id: str = "anonymous",
+    ) -> list[str]:
+        """
+        Context around compact snippets of a document analysis task.
+
+        Each snippet is ``(document, keyword_id, byte_offset)`` as emitted by the task;
+        the matched keyword's length comes from the payload. Raises ``ValueError`` for
+        snippets that do not belong to the task and ``FileNotFoundError`` when the
+        document is no longer available.
+        """
+        if self._documents is None:
+            raise ValueError("snippet context is not available")
+        task = await self._storage.get_task(user_id, task_id)
+        if task is None:
+            raise TaskNotFoundError(task_id)
+        if not isinstance(task.payload, DocumentAnalysisPayload):
+            raise ValueError("snippet context is only available for document analysis tasks")
+        sources = task.payload.sources()
+        keywords = task.payload.keywords
+        requests: dict[str, list[tuple[int, int, int]]] = {}
+        for position, (document, keyword_id, offset) in enumerate(snippets):
+            if not 0 <= document < len(sources):
+                raise ValueError(f"document {document} is not part of task {task_id}")
+            if not 0 <= keyword_id < len(keywords):
+                raise ValueError(f"keyword_id {keyword_id} is not part of task {task_id}")
+            length = len(keywords[keyword_id].lower().encode("utf-8"))
+            path = self._documents.path_for(sources[document])
+            requests.setdefault(path, []).append((position, offset, offset + length))
+
+        contexts = [""] * len(snippets)
+        for path, spans in requests.items():
+            texts = await asyncio.to_thread(
+                self._documents.read_contexts,
+                path,
+                [(start, end) for _, start, end in spans],
+                radius,
+            )
+            for (position, _, _), text in zip(spans, texts):
+                contexts[position] = text
+        return contexts
@@ -8,6 +8,7 @@ from uuid import uuid4
 
 from pydantic import BaseModel
 
+from src.app.domain.models.task_progress import TaskProgress
 from src.app.domain.models.task_status import TaskStatus
 
 
@@ -42,16 +43,21 @@ class TaskEvent(BaseModel):
         chunk_id: str,
         data: Any,
         is_last: bool = False,
+        progress: TaskProgress | None = None,
     ) -> "TaskEvent":
         safe_data = data
         if isinstance(data, (bytes, bytearray, memoryview)):
             safe_data = base64.b64encode(bytes(data)).decode("ascii")
+        payload: dict[str, Any] = {"chunk_id": chunk_id, "data": safe_data, "is_last": is_last}
+        if progress is not None:
+            # Progress of the task when the chunk was produced.
+            payload["progress"] = progress.model_dump(mode="json")
         return cls(
             event_id=str(uuid4()),
             type=EventType.TASK_RESULT_CHUNK,
             task_id=task_id,
             ts=datetime.now(tz=timezone.utc),
-            payload={"chunk_id": chunk_id, "data": safe_data, "is_last": is_last},
+            payload=payload,
         )
 
     @classmethod
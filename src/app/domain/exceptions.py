@@ -12,3 +12,12 @@ class TaskAccessDeniedError(Exception):
         super().__init__(f"User '{user_id}' has no access to task '{task_id}'.")
         self.task_id = task_id
         self.user_id = user_id
+
+
+class TaskNotCancellableError(Exception):
+    """Raised when cancellation is requested for a task that cannot be cancelled."""
+
+    def __init__(self, task_id: str, reason: str) -> None:
+        super().__init__(f"Task '{task_id}' cannot be cancelled: {reason}.")
+        self.task_id = task_id
+        self.reason = reason
@@ -1,5 +1,12 @@
 from src.app.domain.models.execution_config import ExecutionConfig
-from src.app.domain.models.payloads import ComputePiPayload, DocumentAnalysisPayload, TaskPayload
+from src.app.domain.models.pacing import PacingConfig, PacingMode
+from src.app.domain.models.payloads import (
+    ComputePiPayload,
+    DocumentAnalysisPayload,
+    DocumentSource,
+    SnippetMode,
+    TaskPayload,
+)
 from src.app.domain.models.task import Task
 from src.app.domain.models.task_metadata import TaskMetadata
 from src.app.domain.models.task_progress import TaskProgress
@@ -17,8 +24,12 @@ __all__ = [
     "TaskType",
     "TaskPayload",
     "DocumentAnalysisPayload",
+    "DocumentSource",
+    "SnippetMode",
     "ComputePiPayload",
     "ExecutionConfig",
+    "PacingConfig",
+    "PacingMode",
     "TaskMetadata",
     "TaskResult",
     "TaskView",
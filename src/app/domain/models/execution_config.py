@@ -2,6 +2,8 @@ from datetime import datetime
 
 from pydantic import BaseModel, Field
 
+from src.app.domain.models.pacing import PacingConfig
+
 
 class ExecutionConfig(BaseModel):
     """Execution-related configuration attached to a task."""
@@ -16,7 +18,10 @@ class ExecutionConfig(BaseModel):
         default=None, description="Absolute expiration time for the task."
     )
     priority: int | None = Field(
-        default=None, description="Execution priority."
+        default=None,
+        ge=0,
+        le=9,
+        description="Execution priority, from 0 (most urgent) to 9 (least urgent).",
     )
     retry_limit: int | None = Field(
         default=None, description="Maximum number of retry attempts."
@@ -24,3 +29,6 @@ class ExecutionConfig(BaseModel):
     eta: datetime | None = Field(
         default=None, description="Estimated time of arrival for scheduling."
     )
+    pacing: PacingConfig | None = Field(
+        default=None, description="Delay between reported steps; worker default if unset."
+    )
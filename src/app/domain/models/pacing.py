@@ -0,0 +1,24 @@
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+
+class PacingMode(str, Enum):
+    NONE = "none"
+    FIXED = "fixed"
+    RANDOM = "random"
+
+
+class PacingConfig(BaseModel):
+    """Artificial delay a worker inserts between the steps it reports."""
+
+    mode: PacingMode = Field(
+        description="none: full speed; fixed: sleep delay_seconds; "
+        "random: sleep uniformly between 0 and twice delay_seconds."
+    )
+    delay_seconds: float | None = Field(
+        default=None,
+        ge=0,
+        le=10,
+        description="Per-step delay; defaults to the worker setting for the task type.",
+    )
@@ -1,10 +1,38 @@
+from enum import Enum
+from typing import Any
+
 from pydantic import BaseModel, Field
 
+from src.app.domain.models.task_type import TaskType
+
 
 class TaskPayload(BaseModel):
     """Marker/base class for task payloads."""
 
-    pass
+    def fingerprint_data(self) -> dict[str, Any]:
+        """Payload fields that determine the task's outcome, used for deduplication."""
+        return self.model_dump(mode="json")
+
+
+MAX_DOCUMENTS_PER_TASK = 100
+
+
+class DocumentSource(BaseModel):
+    document_path: str | None = Field(
+        default=None,
+        description="Local path to the document to analyze.",
+    )
+    document_url: str | None = Field(
+        default=None,
+        description="Optional URL to download the document before processing.",
+    )
+
+
+class SnippetMode(str, Enum):
+    # One item per match with its keyword, context and location.
+    FULL = "full"
+    # Packed (keyword_id, byte_offset, line) batches; context is fetched on demand.
+    COMPACT = "compact"
 
 
 class DocumentAnalysisPayload(TaskPayload):
@@ -16,10 +44,35 @@ class DocumentAnalysisPayload(TaskPayload):
         default=None,
         description="Optional URL to download the document before processing.",
     )
+    documents: list[DocumentSource] = Field(
+        default_factory=list,
+        max_length=MAX_DOCUMENTS_PER_TASK,
+        description="Further documents scanned concurrently in the same task.",
+    )
     keywords: list[str] = Field(
         description="Keywords to search for (case-insensitive substring match)."
     )
+    snippet_mode: SnippetMode = Field(
+        default=SnippetMode.FULL,
+        description="full: snippets with context; compact: packed offsets, "
+        "context through the snippet context endpoint.",
+    )
+
+    def sources(self) -> list[DocumentSource]:
+        """Documents in the order the worker numbers them: the single one, then ``documents``."""
+        sources = list(self.documents)
+        if self.document_path or self.document_url:
+            sources.insert(
+                0, DocumentSource(document_path=self.document_path, document_url=self.document_url)
+            )
+        return sources
 
 
 class ComputePiPayload(TaskPayload):
     digits: int = Field(description="Number of digits to compute.")
+
+
+PAYLOAD_MODELS: dict[TaskType, type[TaskPayload]] = {
+    TaskType.COMPUTE_PI: ComputePiPayload,
+    TaskType.DOCUMENT_ANALYSIS: DocumentAnalysisPayload,
+}
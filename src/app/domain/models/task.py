@@ -1,3 +1,5 @@
+from typing import Any
+
 from pydantic import BaseModel, Field, SerializeAsAny
 
 from src.app.domain.models.execution_config import ExecutionConfig
@@ -13,7 +15,7 @@ class Task(BaseModel):
     payload: SerializeAsAny[TaskPayload] = Field(
         description="Task-specific payload data."
     )
-    result: dict | None = Field(
+    result: Any | None = Field(
         default=None, description="Raw result payload, if available."
     )
     status: TaskStatus = Field(description="Current status information.")
@@ -21,3 +23,10 @@ class Task(BaseModel):
     execution: ExecutionConfig | None = Field(
         default=None, description="Execution configuration overrides."
     )
+    fingerprint: str | None = Field(
+        default=None, description="Content hash of task type and payload used for dedup."
+    )
+    leader_id: str | None = Field(
+        default=None,
+        description="Task whose run this task reuses when an identical one was submitted.",
+    )
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from typing import Protocol, Sequence
+from typing import Mapping, Protocol, Sequence
 
+from src.app.domain.models.payloads import DocumentSource
 from src.app.domain.models.task import Task
 from src.app.domain.models.task_metadata import TaskMetadata
 from src.app.domain.models.task_state import TaskState
@@ -19,9 +20,15 @@ class TaskManagerRepository(Protocol):
     async def enqueue(self, task: Task) -> str:
         """Schedule a task and return its identifier."""
 
+    async def enqueue_many(self, tasks: Sequence[Task]) -> list[str | Exception]:
+        """Schedule tasks over one broker connection; failures are returned in place of ids."""
+
     async def get_status(self, task_id: str) -> TaskStatus:
         """Fetch the current status representation for the task identified by ``task_id``."""
 
+    async def request_cancellation(self, task_id: str) -> None:
+        """Flag ``task_id`` for cooperative cancellation by the worker running it."""
+
 
 class StorageRepository(Protocol):
     """Repository contract for task persistence and access control."""
@@ -33,15 +40,45 @@ class StorageRepository(Protocol):
     ) -> str:
         """Persist a new task owned by ``user_id`` and return its id."""
 
+    async def create_tasks(self, user_id: str, tasks: Sequence[Task]) -> list[str]:
+        """Persist several tasks owned by ``user_id`` in one transaction and return their ids."""
+
     async def get_task(self, user_id: str, task_id: str) -> Task | None:
         """Return the task if owned by ``user_id``; otherwise ``None``."""
 
     async def get_status(self, user_id: str, task_id: str) -> TaskStatus:
         """Return the status for a task owned by ``user_id``."""
 
+    async def get_status_with_version(self, user_id: str, task_id: str) -> tuple[TaskStatus, int]:
+        """Return the status for a task owned by ``user_id`` and its version, in one lookup."""
+
+    async def get_statuses(self, user_id: str, task_ids: Sequence[str]) -> dict[str, TaskStatus]:
+        """Return statuses keyed by id for the given tasks owned by ``user_id``; others are omitted."""
+
     async def get_result(self, user_id: str, task_id: str) -> TaskResult:
         """Return the result payload for a task owned by ``user_id``."""
 
+    async def get_status_version(self, user_id: str, task_id: str) -> int:
+        """Return the status version for a task owned by ``user_id`` without loading it."""
+
+    async def get_result_version(self, user_id: str, task_id: str) -> int:
+        """Return the result version for a task owned by ``user_id`` without loading it."""
+
+    async def find_dedup_leader(self, fingerprint: str, completed_since: datetime) -> Task | None:
+        """
+        Return a task with this fingerprint that can be reused regardless of owner: one whose
+        result was stored at or after ``completed_since`` (preferred) or one still in flight.
+        """
+
+    async def get_follower_ids(self, task_id: str) -> list[str]:
+        """Return the ids of tasks attached to ``task_id`` as their dedup leader."""
+
+    async def get_task_state(self, task_id: str) -> TaskState | None:
+        """Return the state of ``task_id`` regardless of owner; ``None`` if it does not exist."""
+
+    async def detach_follower(self, task_id: str) -> None:
+        """Clear the dedup leader of ``task_id`` so it no longer follows another run."""
+
     async def list_tasks(
         self,
         user_id: str,
@@ -58,16 +95,26 @@ class StorageRepository(Protocol):
         task_id: str,
         status: TaskStatus,
         metadata: TaskMetadata | None = None,
+    ) -> int:
+        """Persist status changes and optional metadata updates; return the new status version."""
+
+    async def update_task_statuses(
+        self,
+        statuses: Mapping[str, TaskStatus],
+        metadata: TaskMetadata | None = None,
     ) -> None:
-        """Persist status changes and optional metadata updates."""
+        """
+        Persist the statuses of many tasks, and the same metadata updates for each, in one
+        transaction. Unknown task ids are skipped.
+        """
 
     async def set_task_result(
         self,
         task_id: str,
         result: TaskResult,
         finished_at: datetime | None = None,
-    ) -> None:
-        """Persist the task result payload and finalization timestamp."""
+    ) -> int:
+        """Persist the task result payload and finalization timestamp; return the new result version."""
 
 
 class TaskEventPublisherRepository(Protocol):
@@ -75,3 +122,22 @@ class TaskEventPublisherRepository(Protocol):
 
     def publish(self, events: TaskEvent | Sequence[TaskEvent]) -> None:
         """Publish task event(s) to the stream."""
+
+
+class TaskCancellationRepository(Protocol):
+    """Repository contract for workers checking whether their task was cancelled."""
+
+    def is_cancel_requested(self, task_id: str) -> bool:
+        """Return whether cancellation of ``task_id`` has been requested."""
+
+
+class DocumentRepository(Protocol):
+    """Repository contract for reading the documents analysed by tasks."""
+
+    def path_for(self, source: DocumentSource) -> str:
+        """Local path of a task's document source."""
+
+    def read_contexts(
+        self, path: str, spans: Sequence[tuple[int, int]], radius: int
+    ) -> list[str]:
+        """Text around each ``(start, end)`` byte span of the document at ``path``."""
@@ -1,6 +1,7 @@
 from celery import Celery
 from celery.signals import after_task_publish
 
+from src.app.infrastructure.celery.task_registry import PRIORITY_STEPS
 from src.setup.celery_config import get_celery_settings
 
 _settings = get_celery_settings()
@@ -13,12 +14,18 @@ celery_app = Celery(
 celery_app.autodiscover_tasks(["src.app.worker"])
 
 celery_app.conf.update(
-    task_ignore_result=False,
+    task_ignore_result=_settings.TASK_STATE_AUTHORITY == "postgres",
     result_expires=_settings.RESULT_TTL_SECONDS,
+    # Workers drain every queue's higher-priority lists first and reserve a single
+    # message per process, so quick tasks are not stuck behind prefetched long ones.
+    broker_transport_options={
+        "priority_steps": PRIORITY_STEPS,
+        "queue_order_strategy": "priority",
+    },
+    worker_prefetch_multiplier=1,
 )
 
 
-@after_task_publish.connect
 def mark_task_sent(sender=None, headers=None, body=None, **kwargs):
     """
     Store an explicit SENT state for tasks right after they are published.
@@ -28,3 +35,7 @@ def mark_task_sent(sender=None, headers=None, body=None, **kwargs):
     task_id = (headers or {}).get("id") or (body or {}).get("id")
     if task_id:
         celery_app.backend.store_result(task_id, result=None, state="SENT")
+
+
+if _settings.TASK_STATE_AUTHORITY == "celery":
+    after_task_publish.connect(mark_task_sent)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from redis import Redis as SyncRedis
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.app.domain.repositories import TaskCancellationRepository
+
+logger = logging.getLogger(__name__)
+
+CANCEL_KEY_PREFIX = "task-cancel:"
+# Long enough for a task that is still queued to see its flag once it starts.
+CANCEL_FLAG_TTL_SECONDS = 24 * 3600
+
+
+def cancel_key(task_id: str) -> str:
+    return f"{CANCEL_KEY_PREFIX}{task_id}"
+
+
+class RedisCancellationFlags:
+    """
+    Cancellation requests stored as expiring Redis keys, one per task.
+
+    The API sets the key; the worker running the task polls it through
+    ``RedisTaskCancellationRepository`` and stops at its next check.
+    """
+
+    def __init__(self, redis: Redis, ttl_seconds: int = CANCEL_FLAG_TTL_SECONDS) -> None:
+        self._redis = redis
+        self._ttl_seconds = ttl_seconds
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> RedisCancellationFlags:
+        return cls(Redis.from_url(url), **kwargs)
+
+    async def request(self, task_id: str) -> None:
+        await self._redis.set(cancel_key(task_id), 1, ex=self._ttl_seconds)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+class RedisTaskCancellationRepository(TaskCancellationRepository):
+    """Worker-side reads of the flags set by ``RedisCancellationFlags``."""
+
+    def __init__(self, redis: SyncRedis) -> None:
+        self._redis = redis
+
+    @classmethod
+    def from_url(cls, url: str) -> RedisTaskCancellationRepository:
+        return cls(SyncRedis.from_url(url))
+
+    def is_cancel_requested(self, task_id: str) -> bool:
+        try:
+            return bool(self._redis.exists(cancel_key(task_id)))
+        except RedisError as exc:
+            # A task keeps running rather than failing when the flag cannot be read.
+            logger.warning("Checking cancellation of task %s failed: %s", task_id, exc)
+            return False
+
+    def close(self) -> None:
+        self._redis.close()
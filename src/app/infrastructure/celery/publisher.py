@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import base64
+from bisect import bisect
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import uuid4
+
+from celery import Celery
+from kombu.transport.redis import PRIORITY_STEPS
+from kombu.utils.json import dumps
+from redis.asyncio import BlockingConnectionPool, Redis
+
+DEFAULT_PRIORITY_SEP = "\x06\x16"
+
+
+def priority_steps(app: Celery) -> list[int]:
+    transport_options = app.conf.broker_transport_options or {}
+    return list(transport_options.get("priority_steps", PRIORITY_STEPS))
+
+
+def broker_queue_key(app: Celery, queue: str, priority: int = 0) -> str:
+    """Mirror ``Channel._q_for_pri``: non-zero priority steps live in suffixed lists."""
+    steps = priority_steps(app)
+    step = steps[bisect(steps, priority) - 1]
+    if step:
+        sep = (app.conf.broker_transport_options or {}).get("sep", DEFAULT_PRIORITY_SEP)
+        return f"{queue}{sep}{step}"
+    return queue
+
+
+@dataclass(frozen=True)
+class TaskMessage:
+    task_id: str
+    name: str
+    args: tuple[Any, ...] = ()
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    queue: str | None = None
+    priority: int | None = None
+    options: dict[str, Any] = field(default_factory=dict)
+
+
+class RedisCeleryPublisher:
+    """
+    Publishes Celery protocol v2 messages straight onto the Redis broker lists.
+
+    Messages are built with ``app.amqp.as_task_v2`` and wrapped in the same JSON
+    envelope kombu's Redis transport writes, so workers consume them unchanged.
+    Publishing goes through ``redis.asyncio`` with a bounded connection pool, which
+    keeps bursts of submissions off the thread pool entirely.
+
+    ``after_task_publish`` is not fired on this path, so when ``store_sent_state`` is
+    enabled (``TASK_STATE_AUTHORITY=celery``) the SENT result meta that ``mark_task_sent``
+    would write is stored here instead.
+    """
+
+    def __init__(
+        self,
+        app: Celery,
+        redis: Redis,
+        *,
+        store_sent_state: bool = True,
+        result_ttl_seconds: int | None = None,
+    ) -> None:
+        self._app = app
+        self._redis = redis
+        self._store_sent_state = store_sent_state
+        self._result_ttl_seconds = result_ttl_seconds
+
+    @classmethod
+    def from_url(
+        cls,
+        app: Celery,
+        url: str,
+        *,
+        max_connections: int = 50,
+        pool_timeout: float = 5.0,
+        **kwargs: Any,
+    ) -> RedisCeleryPublisher:
+        pool = BlockingConnectionPool.from_url(
+            url,
+            max_connections=max_connections,
+            timeout=pool_timeout,
+        )
+        return cls(app, Redis(connection_pool=pool), **kwargs)
+
+    async def publish(self, message: TaskMessage) -> None:
+        outcome = (await self.publish_many([message]))[0]
+        if outcome is not None:
+            raise outcome
+
+    async def publish_many(self, messages: Sequence[TaskMessage]) -> list[Exception | None]:
+        """
+        Push all messages in one pipelined round trip.
+        Returns ``None`` per published message or the exception that rejected it.
+        """
+        if not messages:
+            return []
+        pipe = self._redis.pipeline(transaction=False)
+        commands_per_message = 2 if self._store_sent_state else 1
+        for message in messages:
+            queue, envelope = self.build_envelope(message)
+            pipe.lpush(queue, envelope)
+            if self._store_sent_state:
+                pipe.set(
+                    self._app.backend.get_key_for_task(message.task_id),
+                    self._sent_meta(message.task_id),
+                    ex=self._result_ttl_seconds,
+                )
+        try:
+            replies = await pipe.execute(raise_on_error=False)
+        except Exception as exc:
+            return [exc for _ in messages]
+
+        outcomes: list[Exception | None] = []
+        for index in range(len(messages)):
+            start = index * commands_per_message
+            errors = [
+                reply
+                for reply in replies[start : start + commands_per_message]
+                if isinstance(reply, Exception)
+            ]
+            outcomes.append(errors[0] if errors else None)
+        return outcomes
+
+    def build_envelope(self, message: TaskMessage) -> tuple[str, str]:
+        """Return the broker list key and the serialized kombu envelope for ``message``."""
+        queue = message.queue or self._app.conf.task_default_queue
+        priority = message.priority or 0
+        task_message = self._app.amqp.as_task_v2(
+            message.task_id,
+            message.name,
+            args=message.args,
+            kwargs=message.kwargs,
+            **message.options,
+        )
+        body = dumps(task_message.body).encode("utf-8")
+        envelope = {
+            "body": base64.b64encode(body).decode("ascii"),
+            "content-encoding": "utf-8",
+            "content-type": "application/json",
+            "headers": task_message.headers,
+            "properties": {
+                **task_message.properties,
+                "delivery_mode": 2,
+                "delivery_info": {"exchange": queue, "routing_key": queue},
+                "priority": priority,
+                "body_encoding": "base64",
+                "delivery_tag": str(uuid4()),
+            },
+        }
+        return broker_queue_key(self._app, queue, priority), dumps(envelope)
+
+    def _sent_meta(self, task_id: str) -> bytes | str:
+        backend = self._app.backend
+        meta = backend._get_result_meta(result=None, state="SENT", traceback=None, request=None)
+        meta["task_id"] = task_id
+        return backend.encode(meta)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
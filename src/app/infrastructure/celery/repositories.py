@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 
 from celery.result import AsyncResult
 
 from src.app.domain.repositories import TaskManagerRepository
+from src.app.domain.models.execution_config import ExecutionConfig
 from src.app.domain.models.task_result import TaskResult
 from src.app.infrastructure.celery.app import celery_app
+from src.app.infrastructure.celery.cancellation import RedisCancellationFlags
 from src.app.infrastructure.celery.mappers import OrmMapper
+from src.app.infrastructure.celery.publisher import RedisCeleryPublisher, TaskMessage
 from src.app.infrastructure.celery.task_registry import TaskRegistry
 from src.app.domain.models.task import Task
 from src.app.domain.models.task_status import TaskStatus
@@ -16,31 +22,131 @@ from src.app.domain.models.task_status import TaskStatus
 class CeleryTaskManager(TaskManagerRepository):
     """
     Orchestrates task queue operations such as enqueuing tasks and retrieving their status.
+
+    With a ``publisher`` tasks are pushed to the broker over the async Redis client;
+    otherwise ``send_task`` runs on a dedicated, bounded executor so submission bursts
+    never drain the event loop's default thread pool. ``cancellation_flags`` stores
+    cancellation requests for the workers to poll.
     """
 
-    def __init__(self, celery_app_instance=celery_app):
+    def __init__(
+        self,
+        celery_app_instance=celery_app,
+        publisher: RedisCeleryPublisher | None = None,
+        executor_workers: int = 8,
+        cancellation_flags: RedisCancellationFlags | None = None,
+    ):
         self._celery_app = celery_app_instance
         self._registry = TaskRegistry()
+        self._publisher = publisher
+        self._cancellation_flags = cancellation_flags
+        self._executor = ThreadPoolExecutor(
+            max_workers=executor_workers, thread_name_prefix="celery-enqueue"
+        )
 
     async def enqueue(self, task: Task) -> str:
         """
         Enqueue a task and return the task id.
         """
+        if self._publisher is not None:
+            await self._publisher.publish(self._message_for(task))
+            return task.id
+        loop = asyncio.get_running_loop()
+        async_result = await loop.run_in_executor(self._executor, self._send, task)
+        return async_result.id
+
+    async def enqueue_many(self, tasks: Sequence[Task]) -> list[str | Exception]:
+        """
+        Enqueue several tasks over a single broker connection.
+        Per-task failures are returned in place of the task id.
+        """
+        tasks = list(tasks)
+        if self._publisher is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._send_many, tasks)
+
+        outcomes: list[str | Exception | None] = [None] * len(tasks)
+        messages: list[TaskMessage] = []
+        positions: list[int] = []
+        for index, task in enumerate(tasks):
+            try:
+                messages.append(self._message_for(task))
+                positions.append(index)
+            except Exception as exc:
+                outcomes[index] = exc
+        published = await self._publisher.publish_many(messages)
+        for index, error in zip(positions, published):
+            outcomes[index] = error if error is not None else tasks[index].id
+        return outcomes
+
+    def _send_many(self, tasks: list[Task]) -> list[str | Exception]:
+        outcomes: list[str | Exception] = []
+        with self._celery_app.producer_or_acquire() as producer:
+            for task in tasks:
+                try:
+                    outcomes.append(self._send(task, producer=producer).id)
+                except Exception as exc:
+                    outcomes.append(exc)
+        return outcomes
+
+    def _send(self, task: Task, producer=None) -> AsyncResult:
+        message = self._message_for(task)
+        return self._celery_app.send_task(
+            message.name,
+            args=list(message.args),
+            queue=message.queue,
+            task_id=message.task_id,
+            priority=message.priority,
+            producer=producer,
+            **message.options,
+        )
+
+    def _message_for(self, task: Task) -> TaskMessage:
         if task.id is None:
             raise ValueError("Task id is required to enqueue a task.")
         route = self._registry.route_for_task_type(task.task_type)
-        message = {
+        body = {
             "task_type": task.task_type.value,
             "payload": task.payload.model_dump(),
         }
-        async_result = await asyncio.to_thread(
-            self._celery_app.send_task,
-            route.celery_task,
-            args=[message],
-            queue=route.queue,
+        if task.execution is not None and task.execution.pacing is not None:
+            body["pacing"] = task.execution.pacing.model_dump(mode="json")
+        priority = route.priority
+        if task.execution is not None and task.execution.priority is not None:
+            priority = task.execution.priority
+        return TaskMessage(
             task_id=task.id,
+            name=route.celery_task,
+            args=(body,),
+            queue=route.queue,
+            priority=priority,
+            options=self._execution_options(task.execution),
         )
-        return async_result.id
+
+    @staticmethod
+    def _execution_options(execution: ExecutionConfig | None) -> dict[str, Any]:
+        """Translate an ``ExecutionConfig`` into Celery message options."""
+        if execution is None:
+            return {}
+        options: dict[str, Any] = {}
+        if execution.time_limit_seconds is not None:
+            options["time_limit"] = execution.time_limit_seconds
+        if execution.soft_time_limit_seconds is not None:
+            options["soft_time_limit"] = execution.soft_time_limit_seconds
+        if execution.expires_at is not None:
+            options["expires"] = execution.expires_at
+        if execution.eta is not None:
+            options["eta"] = execution.eta
+        return options
+
+    async def request_cancellation(self, task_id: str) -> None:
+        """
+        Flag the task for cancellation; the worker stops at its next check and reports
+        CANCELLED. A task still queued is cancelled as soon as it starts.
+        """
+        if self._cancellation_flags is None:
+            raise NotImplementedError("task cancellation requires a Redis broker")
+        await self._cancellation_flags.request(task_id)
 
     async def get_status(self, task_id: str) -> TaskStatus:
         """
@@ -2,12 +2,19 @@ from dataclasses import dataclass
 
 from src.app.domain.models.task_type import TaskType
 
+# Broker priority classes; lower values are consumed first (kombu Redis semantics).
+HIGH_PRIORITY = 0
+NORMAL_PRIORITY = 3
+LOW_PRIORITY = 6
+PRIORITY_STEPS = [HIGH_PRIORITY, NORMAL_PRIORITY, LOW_PRIORITY, 9]
+
 
 @dataclass(frozen=True)
 class TaskRoute:
     task_type: TaskType
     celery_task: str
     queue: str | None = None
+    priority: int = NORMAL_PRIORITY
 
 
 class TaskRegistry:
@@ -19,11 +26,13 @@ class TaskRegistry:
                 task_type=TaskType.COMPUTE_PI,
                 celery_task="compute_pi",
                 queue=None,
+                priority=HIGH_PRIORITY,
             ),
             TaskType.DOCUMENT_ANALYSIS: TaskRoute(
                 task_type=TaskType.DOCUMENT_ANALYSIS,
                 celery_task="document_analysis",
                 queue="doc-tasks",
+                priority=LOW_PRIORITY,
             ),
         }
 
@@ -0,0 +1,3 @@
+from src.app.infrastructure.documents.repositories import FileDocumentRepository, document_key
+
+__all__ = ["FileDocumentRepository", "document_key"]
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from collections.abc import Sequence
+
+from src.app.domain.models.payloads import DocumentSource
+from src.app.domain.repositories import DocumentRepository
+
+
+def document_key(url: str) -> str:
+    """Name of ``url``'s body in the worker's download cache."""
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class FileDocumentRepository(DocumentRepository):
+    """
+    Reads byte ranges of analysed documents with ``os.pread``.
+
+    Sources resolve to their ``document_path`` or, for URLs, to the body in the download
+    cache at ``download_dir``, so only documents a task was given can be read. Local
+    paths must resolve (symlinks included) to a file under ``documents_dir``; any task
+    may name any path, so without the check every file the API can open would be readable.
+    """
+
+    def __init__(
+        self, download_dir: str | os.PathLike[str], documents_dir: str | os.PathLike[str]
+    ) -> None:
+        self._download_dir = os.fspath(download_dir)
+        self._documents_dir = os.path.realpath(documents_dir)
+
+    def path_for(self, source: DocumentSource) -> str:
+        if source.document_url:
+            return os.path.join(self._download_dir, f"{document_key(source.document_url)}.doc")
+        if source.document_path:
+            path = os.path.realpath(source.document_path)
+            if os.path.commonpath([path, self._documents_dir]) != self._documents_dir:
+                raise ValueError("document_path is outside the documents directory")
+            return path
+        raise ValueError("document_path or document_url is required")
+
+    def read_contexts(
+        self, path: str, spans: Sequence[tuple[int, int]], radius: int
+    ) -> list[str]:
+        """
+        ``[start - radius, end + radius)`` of ``path`` for each ``(start, end)`` span,
+        decoded as UTF-8 and ignoring sequences cut at the edges.
+        """
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            size = os.fstat(fd).st_size
+            contexts = []
+            for start, end in spans:
+                if not 0 <= start <= end <= size:
+                    raise ValueError(f"offset {start} is outside the document")
+                begin = max(start - radius, 0)
+                data = os.pread(fd, min(end + radius, size) - begin, begin)
+                contexts.append(data.decode("utf-8", errors="ignore"))
+            return contexts
+        finally:
+            os.close(fd)
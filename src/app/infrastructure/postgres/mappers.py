@@ -31,6 +31,8 @@ class OrmMapper:
             id=task.id,
             user_id=user_id,
             task_type=task.task_type,
+            fingerprint=task.fingerprint,
+            leader_id=task.leader_id,
         )
 
     @staticmethod
@@ -53,17 +55,21 @@ class OrmMapper:
 
     @staticmethod
     def to_status_row(task_id: str, status: TaskStatus) -> TaskStatusRow:
+        return TaskStatusRow(task_id=task_id, **OrmMapper.to_status_values(status))
+
+    @staticmethod
+    def to_status_values(status: TaskStatus) -> dict:
+        """Status columns of ``status``, for rows and bulk UPDATEs alike."""
         progress = status.progress
-        return TaskStatusRow(
-            task_id=task_id,
-            state=status.state,
-            progress_current=progress.current,
-            progress_total=progress.total,
-            progress_percentage=progress.percentage,
-            progress_phase=progress.phase,
-            message=status.message,
-            metrics=status.metrics,
-        )
+        return {
+            "state": status.state,
+            "progress_current": progress.current,
+            "progress_total": progress.total,
+            "progress_percentage": progress.percentage,
+            "progress_phase": progress.phase,
+            "message": status.message,
+            "metrics": status.metrics,
+        }
 
     @staticmethod
     def to_result_row(task_id: str, result: TaskResult) -> TaskResultRow:
@@ -90,6 +96,8 @@ class OrmMapper:
             result=result_payload,
             status=status,
             metadata=metadata,
+            fingerprint=row.fingerprint,
+            leader_id=row.leader_id,
         )
 
     @staticmethod
@@ -106,19 +114,23 @@ class OrmMapper:
 
     @staticmethod
     def to_domain_status(row: TaskRow) -> TaskStatus:
-        if row.status is None:
+        return OrmMapper.status_from_row(row.status)
+
+    @staticmethod
+    def status_from_row(status_row: TaskStatusRow | None) -> TaskStatus:
+        if status_row is None:
             return TaskStatus(state=TaskState.QUEUED, progress=TaskProgress())
         progress = TaskProgress(
-            current=row.status.progress_current,
-            total=row.status.progress_total,
-            percentage=row.status.progress_percentage,
-            phase=row.status.progress_phase,
+            current=status_row.progress_current,
+            total=status_row.progress_total,
+            percentage=status_row.progress_percentage,
+            phase=status_row.progress_phase,
         )
         return TaskStatus(
-            state=row.status.state,
+            state=status_row.state,
             progress=progress,
-            message=row.status.message,
-            metrics=row.status.metrics,
+            message=status_row.message,
+            metrics=status_row.metrics,
         )
 
     @staticmethod
@@ -27,6 +27,8 @@ class TaskRow(Base):
     task_type: Mapped[TaskType] = mapped_column(
         Enum(TaskType, name="task_type"), nullable=False
     )
+    fingerprint: Mapped[str | None] = mapped_column(String(64), index=True)
+    leader_id: Mapped[str | None] = mapped_column(String(64), index=True)
 
     payload: Mapped["TaskPayloadRow"] = relationship(
         back_populates="task", uselist=False, cascade="all, delete-orphan"
@@ -83,6 +85,7 @@ class TaskStatusRow(Base):
     progress_phase: Mapped[str | None] = mapped_column(String(128))
     message: Mapped[str | None] = mapped_column(Text)
     metrics: Mapped[dict | None] = mapped_column(JSON)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
     task: Mapped[TaskRow] = relationship(back_populates="status")
 
@@ -97,6 +100,7 @@ class TaskResultRow(Base):
     finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     ttl_seconds: Mapped[int | None] = mapped_column(Integer)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
     task: Mapped[TaskRow] = relationship(back_populates="result")
 
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
 from datetime import datetime
 
 from uuid import uuid4
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 
@@ -47,6 +49,23 @@ class PostgresStorageRepository(StorageRepository):
                 session.add(task_row)
         return task.id
 
+    async def create_tasks(self, user_id: str, tasks: Sequence[Task]) -> list[str]:
+        task_rows = []
+        for task in tasks:
+            if task.id is None:
+                task.id = uuid4().hex
+            task_row = OrmMapper.to_task_row(user_id, task)
+            task_row.payload = OrmMapper.to_payload_row(task.id, task.payload)
+            task_row.task_metadata = OrmMapper.to_metadata_row(task.id, task.metadata)
+            task_row.status = OrmMapper.to_status_row(task.id, task.status)
+            task_rows.append(task_row)
+
+        async with self._orm.session_factory() as session:
+            async with session.begin():
+                # The unit of work batches each table into multi-row INSERTs.
+                session.add_all(task_rows)
+        return [task.id for task in tasks]
+
     async def get_task(self, user_id: str, task_id: str) -> Task | None:
         async with self._orm.session_factory() as session:
             result = await session.execute(
@@ -68,8 +87,39 @@ class PostgresStorageRepository(StorageRepository):
         return OrmMapper.to_domain_task(task_row)
 
     async def get_status(self, user_id: str, task_id: str) -> TaskStatus:
-        task = await self.get_task(user_id, task_id)
-        return task.status
+        status, _ = await self.get_status_with_version(user_id, task_id)
+        return status
+
+    async def get_status_with_version(self, user_id: str, task_id: str) -> tuple[TaskStatus, int]:
+        async with self._orm.session_factory() as session:
+            result = await session.execute(
+                select(TaskRow.user_id, TaskStatusRow)
+                .outerjoin(TaskStatusRow, TaskStatusRow.task_id == TaskRow.id)
+                .where(TaskRow.id == task_id)
+            )
+            row = result.one_or_none()
+
+        if row is None:
+            raise TaskNotFoundError(task_id)
+        owner_id, status_row = row
+        if owner_id != user_id:
+            raise TaskAccessDeniedError(task_id, user_id)
+        version = status_row.version if status_row is not None else 0
+        return OrmMapper.status_from_row(status_row), version
+
+    async def get_statuses(self, user_id: str, task_ids: Sequence[str]) -> dict[str, TaskStatus]:
+        if not task_ids:
+            return {}
+        async with self._orm.session_factory() as session:
+            # Ownership is part of the filter, so foreign ids simply do not come back.
+            result = await session.execute(
+                select(TaskRow.id, TaskStatusRow)
+                .outerjoin(TaskStatusRow, TaskStatusRow.task_id == TaskRow.id)
+                .where(TaskRow.id.in_(task_ids), TaskRow.user_id == user_id)
+            )
+            rows = result.all()
+
+        return {task_id: OrmMapper.status_from_row(status_row) for task_id, status_row in rows}
 
     async def get_result(self, user_id: str, task_id: str) -> TaskResult:
         async with self._orm.session_factory() as session:
@@ -86,6 +136,63 @@ class PostgresStorageRepository(StorageRepository):
             raise TaskAccessDeniedError(task_id, user_id)
         return OrmMapper.to_domain_result(task_row)
 
+    async def get_status_version(self, user_id: str, task_id: str) -> int:
+        return await self._get_version(user_id, task_id, TaskStatusRow)
+
+    async def get_result_version(self, user_id: str, task_id: str) -> int:
+        return await self._get_version(user_id, task_id, TaskResultRow)
+
+    async def find_dedup_leader(self, fingerprint: str, completed_since: datetime) -> Task | None:
+        statement = (
+            select(TaskRow)
+            .options(
+                selectinload(TaskRow.payload),
+                selectinload(TaskRow.task_metadata),
+                selectinload(TaskRow.status),
+                selectinload(TaskRow.result),
+            )
+            .outerjoin(TaskResultRow, TaskResultRow.task_id == TaskRow.id)
+            .outerjoin(TaskStatusRow, TaskStatusRow.task_id == TaskRow.id)
+            .where(
+                TaskRow.fingerprint == fingerprint,
+                TaskRow.leader_id.is_(None),
+                or_(
+                    TaskResultRow.finished_at >= completed_since,
+                    and_(
+                        TaskResultRow.task_id.is_(None),
+                        TaskStatusRow.state.in_([TaskState.QUEUED, TaskState.RUNNING]),
+                    ),
+                ),
+            )
+            # Finished runs first: their result can be copied without waiting.
+            .order_by(TaskResultRow.finished_at.desc().nulls_last())
+            .limit(1)
+        )
+        async with self._orm.session_factory() as session:
+            result = await session.execute(statement)
+            task_row = result.scalar_one_or_none()
+
+        return OrmMapper.to_domain_task(task_row) if task_row is not None else None
+
+    async def get_follower_ids(self, task_id: str) -> list[str]:
+        async with self._orm.session_factory() as session:
+            result = await session.execute(select(TaskRow.id).where(TaskRow.leader_id == task_id))
+            return list(result.scalars().all())
+
+    async def get_task_state(self, task_id: str) -> TaskState | None:
+        async with self._orm.session_factory() as session:
+            result = await session.execute(
+                select(TaskStatusRow.state).where(TaskStatusRow.task_id == task_id)
+            )
+            return result.scalar_one_or_none()
+
+    async def detach_follower(self, task_id: str) -> None:
+        async with self._orm.session_factory() as session:
+            async with session.begin():
+                await session.execute(
+                    update(TaskRow).where(TaskRow.id == task_id).values(leader_id=None)
+                )
+
     async def list_tasks(
         self,
         user_id: str,
@@ -118,7 +225,7 @@ class PostgresStorageRepository(StorageRepository):
         task_id: str,
         status: TaskStatus,
         metadata: TaskMetadata | None = None,
-    ) -> None:
+    ) -> int:
         async with self._orm.session_factory() as session:
             async with session.begin():
                 # Ensure the task exists before mutating status/metadata.
@@ -128,6 +235,7 @@ class PostgresStorageRepository(StorageRepository):
 
                 status_row = OrmMapper.to_status_row(task_id, status)
                 await session.merge(status_row)
+                version = await self._bump_version(session, TaskStatusRow, task_id)
 
                 if metadata is not None:
                     metadata_row = await session.get(TaskMetadataRow, task_id)
@@ -136,13 +244,44 @@ class PostgresStorageRepository(StorageRepository):
                         session.add(metadata_row)
                     else:
                         self._merge_metadata(metadata_row, metadata)
+        return version
+
+    async def update_task_statuses(
+        self,
+        statuses: Mapping[str, TaskStatus],
+        metadata: TaskMetadata | None = None,
+    ) -> None:
+        if not statuses:
+            return
+        # Tasks sharing a status (a batch the broker rejected) take a single UPDATE.
+        groups: dict[str, tuple[TaskStatus, list[str]]] = {}
+        for task_id, status in statuses.items():
+            groups.setdefault(status.model_dump_json(), (status, []))[1].append(task_id)
+        async with self._orm.session_factory() as session:
+            async with session.begin():
+                for status, task_ids in groups.values():
+                    await session.execute(
+                        update(TaskStatusRow)
+                        .where(TaskStatusRow.task_id.in_(task_ids))
+                        .values(
+                            **OrmMapper.to_status_values(status),
+                            version=TaskStatusRow.version + 1,
+                        )
+                    )
+                values = self._metadata_values(metadata) if metadata is not None else {}
+                if values:
+                    await session.execute(
+                        update(TaskMetadataRow)
+                        .where(TaskMetadataRow.task_id.in_(list(statuses)))
+                        .values(**values)
+                    )
 
     async def set_task_result(
         self,
         task_id: str,
         result: TaskResult,
         finished_at: datetime | None = None,
-    ) -> None:
+    ) -> int:
         async with self._orm.session_factory() as session:
             async with session.begin():
                 # Enforce task existence; results are keyed to the task id.
@@ -154,6 +293,7 @@ class PostgresStorageRepository(StorageRepository):
                 if finished_at is not None:
                     result_row.finished_at = finished_at
                 await session.merge(result_row)
+                version = await self._bump_version(session, TaskResultRow, task_id)
 
                 if finished_at is not None:
                     metadata_row = await session.get(TaskMetadataRow, task_id)
@@ -165,10 +305,54 @@ class PostgresStorageRepository(StorageRepository):
                         session.add(metadata_row)
                     else:
                         self._merge_metadata(metadata_row, TaskMetadata(finished_at=finished_at))
+        return version
+
+    async def _get_version(
+        self,
+        user_id: str,
+        task_id: str,
+        row_type: type[TaskStatusRow] | type[TaskResultRow],
+    ) -> int:
+        # Two scalar columns by primary key; no relationship loading or model hydration.
+        async with self._orm.session_factory() as session:
+            result = await session.execute(
+                select(TaskRow.user_id, row_type.version)
+                .outerjoin(row_type, row_type.task_id == TaskRow.id)
+                .where(TaskRow.id == task_id)
+            )
+            row = result.one_or_none()
+
+        if row is None:
+            raise TaskNotFoundError(task_id)
+        owner_id, version = row
+        if owner_id != user_id:
+            raise TaskAccessDeniedError(task_id, user_id)
+        return version or 0
+
+    @staticmethod
+    async def _bump_version(
+        session: AsyncSession,
+        row_type: type[TaskStatusRow] | type[TaskResultRow],
+        task_id: str,
+    ) -> int:
+        # Increment in SQL so concurrent writers never hand out the same version.
+        result = await session.execute(
+            update(row_type)
+            .where(row_type.task_id == task_id)
+            .values(version=row_type.version + 1)
+            .returning(row_type.version)
+        )
+        return result.scalar_one()
 
     @staticmethod
-    def _merge_metadata(target: TaskMetadataRow, updates: TaskMetadata) -> None:
-        for field in ("created_at", "updated_at", "started_at", "finished_at", "custom"):
-            value = getattr(updates, field)
-            if value is not None:
-                setattr(target, field, value)
+    def _metadata_values(updates: TaskMetadata) -> dict:
+        return {
+            field: value
+            for field in ("created_at", "updated_at", "started_at", "finished_at", "custom")
+            if (value := getattr(updates, field)) is not None
+        }
+
+    @classmethod
+    def _merge_metadata(cls, target: TaskMetadataRow, updates: TaskMetadata) -> None:
+        for field, value in cls._metadata_values(updates).items():
+            setattr(target, field, value)
@@ -1,34 +1,159 @@
 import logging
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from pydantic import BaseModel, Field, ValidationError
 
 from src.app.application.services import TaskService
 from src.app.domain.models import (
     ComputePiPayload,
     DocumentAnalysisPayload,
+    ExecutionConfig,
+    TaskPayload,
     TaskResult,
     TaskType,
 )
-from src.app.domain.exceptions import TaskNotFoundError
+from src.app.domain.models.payloads import PAYLOAD_MODELS
+from src.app.domain.exceptions import TaskNotCancellableError, TaskNotFoundError
 from src.app.domain.models.task import Task
+from src.app.domain.models.task_state import TaskState
 from src.app.domain.models.task_status import TaskStatus
+from src.app.infrastructure.documents import FileDocumentRepository
 from src.setup.api_config import ApiSettings
 
 router = APIRouter(tags=["tasks"])
 logger = logging.getLogger(__name__)
 
+STATUS_VERSION_HEADER = "X-Status-Version"
+
 
 _settings = ApiSettings()
 
-_task_service = TaskService()
+_dedup_ttl_seconds = _settings.DEDUP_RESULT_TTL_SECONDS if _settings.DEDUP_ENABLED else None
+
+_task_service = TaskService(
+    dedup_ttl_seconds=_dedup_ttl_seconds,
+    documents=FileDocumentRepository(_settings.DOWNLOAD_CACHE_DIR, _settings.DOCUMENTS_DIR),
+)
 
 
 def get_task_service() -> TaskService:
-    return TaskService()
+    return TaskService(dedup_ttl_seconds=_dedup_ttl_seconds)
+
+
+def _etag(kind: str, version: int) -> str:
+    return f'"{kind}-{version}"'
+
+
+def _etag_version(if_none_match: str | None, kind: str) -> int | None:
+    """Extract the version from an If-None-Match header carrying one of our ETags."""
+    if not if_none_match:
+        return None
+    for candidate in if_none_match.split(","):
+        tag = candidate.strip().removeprefix("W/").strip('"')
+        prefix, _, version = tag.partition("-")
+        if prefix == kind and version.isdigit():
+            return int(version)
+    return None
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _not_modified(etag: str, headers: dict[str, str] | None = None) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, **(headers or {})})
+
 
 class CalculatePiRequest(BaseModel):
     n: int = Field(..., ge=1, le=_settings.MAX_DIGITS, description="Number of digits after decimal")
+    execution: ExecutionConfig | None = Field(
+        default=None, description="Optional priority, limits and scheduling overrides."
+    )
+
+
+class BatchTaskItem(BaseModel):
+    task_type: TaskType = Field(description="Type of task to create.")
+    payload: dict[str, Any] = Field(description="Task-specific payload data.")
+    execution: ExecutionConfig | None = Field(
+        default=None, description="Optional priority, limits and scheduling overrides."
+    )
+
+
+class BatchTaskRequest(BaseModel):
+    tasks: list[BatchTaskItem] = Field(
+        ...,
+        min_length=1,
+        max_length=_settings.MAX_BATCH_TASKS,
+        description="Tasks to create, processed in order.",
+    )
+
+
+class BatchTaskItemResult(BaseModel):
+    index: int = Field(description="Position of the item in the request.")
+    id: str | None = Field(default=None, description="Task id, if the task was created.")
+    status: TaskStatus | None = Field(default=None, description="Status after submission.")
+    error: str | None = Field(default=None, description="Why the item was not queued.")
+
+
+class BatchTaskResponse(BaseModel):
+    items: list[BatchTaskItemResult] = Field(description="One entry per requested task.")
+
+
+def _parse_batch_payload(item: BatchTaskItem) -> TaskPayload:
+    """Validate a batch item's payload against its task type; raises ``ValueError``."""
+    payload = PAYLOAD_MODELS[item.task_type].model_validate(item.payload)
+    if isinstance(payload, ComputePiPayload) and not 1 <= payload.digits <= _settings.MAX_DIGITS:
+        raise ValueError(f"digits must be between 1 and {_settings.MAX_DIGITS}")
+    return payload
+
+
+class SnippetRef(BaseModel):
+    document: int = Field(default=0, ge=0, description="Document index from the snippet item.")
+    keyword_id: int = Field(ge=0, description="Index of the keyword in the task payload.")
+    offset: int = Field(ge=0, description="Byte offset of the match in the document.")
+
+
+class SnippetContextRequest(BaseModel):
+    snippets: list[SnippetRef] = Field(
+        ...,
+        min_length=1,
+        max_length=_settings.MAX_SNIPPET_CONTEXTS,
+        description="Compact snippets to fetch context for.",
+    )
+    radius: int = Field(
+        default=30,
+        ge=0,
+        le=_settings.MAX_SNIPPET_CONTEXT_RADIUS,
+        description="Bytes of context on each side of the match.",
+    )
+
+
+class SnippetContext(SnippetRef):
+    snippet: str = Field(description="The match with its surrounding context.")
+
+
+class SnippetContextResponse(BaseModel):
+    snippets: list[SnippetContext] = Field(description="One entry per requested snippet.")
+
+
+class BatchStatusRequest(BaseModel):
+    task_ids: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=_settings.MAX_BATCH_STATUS_IDS,
+        description="Task ids to look up.",
+    )
+
+
+class BatchStatusResponse(BaseModel):
+    statuses: dict[str, TaskStatus] = Field(description="Statuses keyed by task id.")
+    missing: list[str] = Field(
+        description="Requested ids that do not exist or are not owned by the caller."
+    )
 
 
 @router.post(
@@ -48,7 +173,9 @@ async def calculate_pi(body: CalculatePiRequest):
     """
     try:
         payload = ComputePiPayload(digits=body.n)
-        task = await _task_service.create_task(TaskType.COMPUTE_PI, payload)
+        task = await _task_service.create_task(
+            TaskType.COMPUTE_PI, payload, execution=body.execution
+        )
         return task
     except Exception as exc:
         logger.exception("Failed to enqueue task compute_pi: %s", exc)
@@ -65,8 +192,16 @@ async def calculate_pi(body: CalculatePiRequest):
         "- progress: object with current/total/percentage/phase (optional)\n"
         "- message: optional error message\n"
         "\nExample: {'state':'RUNNING','progress':{'percentage':0.25},'message':Null}\n"
+        "\nLong polling: pass `since_version` (the value of the previous response's "
+        f"`{STATUS_VERSION_HEADER}` header) and `wait_ms` to hold the request until the "
+        "status changes or the wait expires.\n"
+        "\nConditional requests: responses carry an `ETag`; sending it back in "
+        "`If-None-Match` yields 304 while the status is unchanged.\n"
     ),
     responses={
+        304: {
+            "description": "Status unchanged since the version in If-None-Match.",
+        },
         404: {
             "description": "Task id not found.",
         },
@@ -75,12 +210,37 @@ async def calculate_pi(body: CalculatePiRequest):
         },
     },
 )
-async def check_progress(task_id: str = Query(..., description="Celery task id")):
+async def check_progress(
+    response: Response,
+    task_id: str = Query(..., description="Celery task id"),
+    wait_ms: int = Query(
+        0,
+        ge=0,
+        le=_settings.LONG_POLL_MAX_WAIT_MS,
+        description="Maximum time to wait for a status change, in milliseconds.",
+    ),
+    since_version: int | None = Query(
+        None, ge=0, description="Status version the client already has."
+    ),
+    if_none_match: str | None = Header(None),
+):
     """
     Reads the Celery result backend for the given task id.
     """
     try:
-        status = await _task_service.get_status(task_id)
+        if since_version is None:
+            since_version = _etag_version(if_none_match, "s")
+        if since_version is not None:
+            # Only a client holding a version can get a 304 or wait for a change.
+            version = await _task_service.get_status_version(
+                task_id, since_version=since_version, wait_seconds=wait_ms / 1000
+            )
+            etag = _etag("s", version)
+            if _etag_matches(if_none_match, etag):
+                return _not_modified(etag, {STATUS_VERSION_HEADER: str(version)})
+        status, version = await _task_service.get_status_with_version(task_id)
+        response.headers["ETag"] = _etag("s", version)
+        response.headers[STATUS_VERSION_HEADER] = str(version)
         return status
     except TaskNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
@@ -89,6 +249,78 @@ async def check_progress(task_id: str = Query(..., description="Celery task id")
         raise HTTPException(status_code=500)  # noqa: B904
 
 
+@router.post(
+    "/tasks:batch",
+    response_model=BatchTaskResponse,
+    summary="Create many tasks",
+    description=(
+        "Create up to `MAX_BATCH_TASKS` tasks in one request. All valid tasks are stored in "
+        "a single transaction and enqueued together; each item reports its id or error."
+    ),
+    responses={
+        500: {
+            "description": "Internal server error.",
+        },
+    },
+)
+async def create_tasks_batch(body: BatchTaskRequest):
+    """
+    Validates every item, then persists and enqueues the valid ones in bulk.
+    """
+    items: list[BatchTaskItemResult] = []
+    submissions: list[tuple[TaskType, TaskPayload, ExecutionConfig | None]] = []
+    accepted: list[BatchTaskItemResult] = []
+    for index, item in enumerate(body.tasks):
+        try:
+            payload = _parse_batch_payload(item)
+        except (ValidationError, ValueError) as exc:
+            items.append(BatchTaskItemResult(index=index, error=str(exc)))
+            continue
+        submissions.append((item.task_type, payload, item.execution))
+        accepted.append(BatchTaskItemResult(index=index))
+        items.append(accepted[-1])
+
+    try:
+        tasks = await _task_service.create_tasks(submissions)
+    except Exception as exc:
+        logger.exception("Failed to create task batch: %s", exc)
+        raise HTTPException(status_code=500)  # noqa: B904
+
+    for item, task in zip(accepted, tasks):
+        item.id = task.id
+        item.status = task.status
+        if task.status.state == TaskState.FAILED:
+            item.error = task.status.message
+    return BatchTaskResponse(items=items)
+
+
+@router.post(
+    "/tasks/status:batch",
+    response_model=BatchStatusResponse,
+    summary="Check progress of many tasks",
+    description=(
+        "Return the statuses of up to `MAX_BATCH_STATUS_IDS` tasks in one request. "
+        "Ids that do not exist or belong to another user are listed in `missing`."
+    ),
+    responses={
+        500: {
+            "description": "Internal server error.",
+        },
+    },
+)
+async def check_progress_batch(body: BatchStatusRequest):
+    """
+    Reads the statuses of all requested tasks with a single storage lookup.
+    """
+    try:
+        statuses = await _task_service.get_statuses(body.task_ids)
+    except Exception as exc:
+        logger.exception("Failed to get batch progress: %s", exc)
+        raise HTTPException(status_code=500)  # noqa: B904
+    missing = [task_id for task_id in dict.fromkeys(body.task_ids) if task_id not in statuses]
+    return BatchStatusResponse(statuses=statuses, missing=missing)
+
+
 @router.post(
     "/tasks/document-analysis",
     response_model=Task,
@@ -108,8 +340,14 @@ async def create_doc_task(
     "/task_result",
     response_model=TaskResult,
     summary="Fetch task result",
-    description="Retrieve the result payload for a task id, if available.",
+    description=(
+        "Retrieve the result payload for a task id, if available. Responses carry an "
+        "`ETag`; sending it back in `If-None-Match` yields 304 while the result is unchanged."
+    ),
     responses={
+        304: {
+            "description": "Result unchanged since the version in If-None-Match.",
+        },
         404: {
             "description": "Task id not found.",
         },
@@ -118,15 +356,110 @@ async def create_doc_task(
         },
     },
 )
-async def get_task_result(task_id: str = Query(..., description="Celery task id")):
+async def get_task_result(
+    response: Response,
+    task_id: str = Query(..., description="Celery task id"),
+    if_none_match: str | None = Header(None),
+):
     """
     Reads the Celery result backend for the given task id.
     """
     try:
+        etag = _etag("r", await _task_service.get_result_version(task_id))
+        if _etag_matches(if_none_match, etag):
+            return _not_modified(etag)
         result = await _task_service.get_result(task_id)
+        response.headers["ETag"] = etag
         return result
     except TaskNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except Exception as exc:
         logger.exception("Failed to get result for task %s: %s", task_id, exc)
         raise HTTPException(status_code=500)  # noqa: B904
+
+
+@router.post(
+    "/tasks/{task_id}/cancel",
+    response_model=TaskStatus,
+    status_code=202,
+    summary="Cancel a task",
+    description=(
+        "Request cooperative cancellation of a queued or running task. The worker stops "
+        "at its next check and reports a `CANCELLED` status; the response is the status "
+        "at the time of the request. A deduplicated task is cancelled on its own: the "
+        "shared run goes on while other tasks still follow it."
+    ),
+    responses={
+        404: {
+            "description": "Task id not found.",
+        },
+        409: {
+            "description": "Task already finished.",
+        },
+        501: {
+            "description": "Cancellation is not supported by the task broker.",
+        },
+        500: {
+            "description": "Internal server error.",
+        },
+    },
+)
+async def cancel_task(task_id: str):
+    """
+    Sets the task's cancellation flag for the worker to pick up.
+    """
+    try:
+        return await _task_service.cancel_task(task_id)
+    except TaskNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except TaskNotCancellableError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    except NotImplementedError as exc:
+        raise HTTPException(status_code=501, detail=str(exc)) from exc
+    except Exception as exc:
+        logger.exception("Failed to cancel task %s: %s", task_id, exc)
+        raise HTTPException(status_code=500)  # noqa: B904
+
+
+@router.post(
+    "/tasks/{task_id}/snippets:context",
+    response_model=SnippetContextResponse,
+    summary="Fetch context for compact snippets",
+    description=(
+        "Return the text around up to `MAX_SNIPPET_CONTEXTS` snippets emitted by a "
+        "document analysis task in `compact` snippet mode, read from the task's documents."
+    ),
+    responses={
+        400: {
+            "description": "Snippet does not belong to the task or lies outside the document.",
+        },
+        404: {
+            "description": "Task id not found or document no longer available.",
+        },
+        500: {
+            "description": "Internal server error.",
+        },
+    },
+)
+async def get_snippet_context(task_id: str, body: SnippetContextRequest):
+    """
+    Reads the requested byte ranges of the task's documents.
+    """
+    snippets = [(ref.document, ref.keyword_id, ref.offset) for ref in body.snippets]
+    try:
+        contexts = await _task_service.get_snippet_contexts(task_id, snippets, body.radius)
+    except TaskNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail="document is no longer available") from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:
+        logger.exception("Failed to read snippet context for task %s: %s", task_id, exc)
+        raise HTTPException(status_code=500)  # noqa: B904
+    return SnippetContextResponse(
+        snippets=[
+            SnippetContext(**ref.model_dump(), snippet=context)
+            for ref, context in zip(body.snippets, contexts)
+        ]
+    )
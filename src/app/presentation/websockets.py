@@ -1,16 +1,107 @@
 from __future__ import annotations
 
+import asyncio
+import json
+
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from src.app.application.broadcaster import TaskStatusBroadcaster
-from src.app.domain.events.task_event import TaskEvent
+from src.app.domain.events.task_event import EventType, TaskEvent
+from src.setup.api_config import ApiSettings
+
+try:
+    from websockets.exceptions import ConnectionClosed
+except ImportError:  # only installed with uvicorn[standard]
+    ConnectionClosed = RuntimeError
 
 router = APIRouter(tags=["ws"])
 
+MULTIPLEX_TICK_SECONDS = 0.05
+# Errors a send to a client that went away can raise, depending on the server.
+_SEND_ERRORS = (RuntimeError, OSError, WebSocketDisconnect, ConnectionClosed)
+
+_settings = ApiSettings()
+
+
+class MultiplexSession:
+    """
+    One WebSocket subscribed to many tasks.
+
+    Frames are buffered and flushed once per tick as a single ``batch`` frame.
+    Status updates are coalesced per task (only the latest survives a tick, after
+    everything that arrived before it), while result chunks are kept in arrival order.
+    All frames go through ``send``, one at a time, so batches and control replies
+    never interleave; events arriving during a send wait for the next tick.
+    """
+
+    def __init__(self, websocket: WebSocket, tick_seconds: float) -> None:
+        self.websocket = websocket
+        self.task_ids: set[str] = set()
+        self._tick_seconds = tick_seconds
+        # Superseded statuses are left as None and dropped at flush time.
+        self._pending: list[dict[str, object] | None] = []
+        self._pending_status: dict[str, int] = {}
+        self._flush_task: asyncio.Task[None] | None = None
+        self._send_lock = asyncio.Lock()
+        self._closed = False
+
+    def enqueue(self, payload: dict[str, object]) -> None:
+        if self._closed:
+            return
+        task_id = str(payload.get("task_id"))
+        if payload.get("type") == EventType.TASK_STATUS.value:
+            index = self._pending_status.get(task_id)
+            if index is not None:
+                # The newer status goes after chunks that arrived before it.
+                self._pending[index] = None
+            self._pending_status[task_id] = len(self._pending)
+            self._pending.append(payload)
+        else:
+            self._pending.append(payload)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_tick())
+
+    async def send(self, frame: dict[str, object]) -> None:
+        async with self._send_lock:
+            await self.websocket.send_json(frame)
+
+    async def _flush_after_tick(self) -> None:
+        # The task stays registered until its last send finished, so a single flush
+        # runs per session and batches leave in order.
+        try:
+            while True:
+                await asyncio.sleep(self._tick_seconds)
+                events = [event for event in self._pending if event is not None]
+                self._pending = []
+                self._pending_status = {}
+                if events:
+                    await self.send({"type": "batch", "events": events})
+                if not self._pending:
+                    self._flush_task = None
+                    return
+        except _SEND_ERRORS:
+            self._flush_task = None
+            self.close()
+
+    def close(self) -> None:
+        self._closed = True
+        self._pending.clear()
+        self._pending_status.clear()
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
 
 class TaskConnectionManager:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        tick_seconds: float = MULTIPLEX_TICK_SECONDS,
+        max_subscriptions: int = _settings.MAX_WS_SUBSCRIPTIONS,
+    ) -> None:
         self._connections: dict[str, set[WebSocket]] = {}
+        self._sessions: dict[str, set[MultiplexSession]] = {}
+        self._tick_seconds = tick_seconds
+        self._max_subscriptions = max_subscriptions
 
     async def create_task_session(self, task_id: str, websocket: WebSocket) -> None:
         await websocket.accept()
@@ -24,12 +115,44 @@ class TaskConnectionManager:
         if not connections:
             self._connections.pop(task_id, None)
 
+    async def create_multiplex_session(self, websocket: WebSocket) -> MultiplexSession:
+        await websocket.accept()
+        return MultiplexSession(websocket, self._tick_seconds)
+
+    def subscribe(self, session: MultiplexSession, task_ids: list[str]) -> list[str]:
+        """Subscribe ``session`` to ``task_ids``; returns those refused by the cap."""
+        refused = []
+        for task_id in task_ids:
+            if task_id not in session.task_ids:
+                if len(session.task_ids) >= self._max_subscriptions:
+                    refused.append(task_id)
+                    continue
+                session.task_ids.add(task_id)
+            self._sessions.setdefault(task_id, set()).add(session)
+        return refused
+
+    def unsubscribe(self, session: MultiplexSession, task_ids: list[str]) -> None:
+        for task_id in task_ids:
+            session.task_ids.discard(task_id)
+            sessions = self._sessions.get(task_id)
+            if not sessions:
+                continue
+            sessions.discard(session)
+            if not sessions:
+                self._sessions.pop(task_id, None)
+
+    def close_multiplex_session(self, session: MultiplexSession) -> None:
+        self.unsubscribe(session, list(session.task_ids))
+        session.close()
+
     async def broadcast(self, task_id: str, payload: dict[str, object]) -> None:
+        for session in self._sessions.get(task_id, ()):
+            session.enqueue(payload)
         connections = list(self._connections.get(task_id, set()))
         for websocket in connections:
             try:
                 await websocket.send_json(payload)
-            except RuntimeError:
+            except _SEND_ERRORS:
                 self.disconnect(task_id, websocket)
 
 
@@ -61,6 +184,55 @@ class WebSocketStatusBroadcaster(TaskStatusBroadcaster):
 connection_manager = TaskConnectionManager()
 
 
+def _parse_control_message(raw: str) -> tuple[str, list[str]] | None:
+    try:
+        message = json.loads(raw)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(message, dict):
+        return None
+    action = message.get("action")
+    task_ids = message.get("task_ids")
+    if action not in {"subscribe", "unsubscribe"} or not isinstance(task_ids, list):
+        return None
+    return action, [str(task_id) for task_id in task_ids]
+
+
+@router.websocket("/ws/tasks")
+async def multiplexed_task_updates(websocket: WebSocket) -> None:
+    """
+    Accepts ``{"action": "subscribe" | "unsubscribe", "task_ids": [...]}`` messages
+    and streams ``batch`` frames of tagged events for every subscribed task.
+    A session follows at most ``MAX_WS_SUBSCRIPTIONS`` tasks; ids beyond that are
+    reported in an ``error`` frame before the acknowledgement.
+    Anything else (e.g. keepalive pings) is ignored.
+    """
+    session = await connection_manager.create_multiplex_session(websocket)
+    try:
+        while True:
+            control = _parse_control_message(await websocket.receive_text())
+            if control is None:
+                continue
+            action, task_ids = control
+            if action == "subscribe":
+                refused = connection_manager.subscribe(session, task_ids)
+                if refused:
+                    await session.send(
+                        {
+                            "type": "error",
+                            "detail": "Subscription limit reached.",
+                            "task_ids": refused,
+                        }
+                    )
+            else:
+                connection_manager.unsubscribe(session, task_ids)
+            await session.send({"type": f"{action}d", "task_ids": sorted(session.task_ids)})
+    except _SEND_ERRORS:
+        pass
+    finally:
+        connection_manager.close_multiplex_session(session)
+
+
 @router.websocket("/ws/tasks/{task_id}")
 async def task_updates(websocket: WebSocket, task_id: str) -> None:
     await connection_manager.create_task_session(task_id, websocket)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import logging
+from time import monotonic
+
+from celery.worker import state
+from celery.worker.autoscale import Autoscaler
+from redis import Redis
+
+from src.app.infrastructure.celery.publisher import broker_queue_key, priority_steps
+from src.setup.worker_config import get_worker_settings
+
+logger = logging.getLogger(__name__)
+
+# Scaling is re-evaluated on every received task message; cap the LLEN round trips.
+DEPTH_REFRESH_SECONDS = 1.0
+
+
+class QueueDepthAutoscaler(Autoscaler):
+    """
+    Scale the pool towards the backlog of the worker's queues.
+
+    Celery's default autoscaler only counts requests this worker already reserved, which
+    with a prefetch multiplier of 1 barely exceeds the pool size. Here the demand is the
+    reserved requests plus the length of every consumed queue's priority lists in Redis,
+    clamped to ``[min_concurrency, max_concurrency]`` by the base class.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        kwargs.setdefault("keepalive", get_worker_settings().AUTOSCALE_KEEPALIVE_SECONDS)
+        super().__init__(*args, **kwargs)
+        self._redis: Redis | None = None
+        self._keys: list[str] | None = None
+        self._depth = 0
+        self._depth_checked_at: float | None = None
+
+    @property
+    def qty(self) -> int:
+        return len(state.reserved_requests) + self.queue_depth()
+
+    def queue_depth(self) -> int:
+        now = monotonic()
+        checked_at = self._depth_checked_at
+        if checked_at is not None and now - checked_at < DEPTH_REFRESH_SECONDS:
+            return self._depth
+        self._depth_checked_at = now
+        try:
+            with self._client().pipeline(transaction=False) as pipe:
+                for key in self._queue_keys():
+                    pipe.llen(key)
+                self._depth = sum(pipe.execute())
+        except Exception as exc:
+            logger.warning("Queue depth unavailable, scaling on reserved tasks only: %s", exc)
+            self._depth = 0
+        return self._depth
+
+    def _client(self) -> Redis:
+        if self._redis is None:
+            self._redis = Redis.from_url(self.worker.app.conf.broker_url)
+        return self._redis
+
+    def _queue_keys(self) -> list[str]:
+        if self._keys is None:
+            app = self.worker.app
+            self._keys = [
+                broker_queue_key(app, queue, step)
+                for queue in app.amqp.queues.consume_from
+                for step in priority_steps(app)
+            ]
+        return self._keys
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from math import sqrt
+from typing import Any
+
+from billiard import Pool
+
+try:
+    import gmpy2
+except ImportError:  # optional: `pip install .[fast]`
+    gmpy2 = None
+
+# 640320**3 / 24; each series term contributes log10(151931373056000) ≈ 14.18 digits.
+C3_OVER_24 = 640320**3 // 24
+DIGITS_PER_TERM = 14.181647462725477
+GUARD_DIGITS = 20
+# Below this many terms per worker the pickling round trip costs more than it saves.
+MIN_TERMS_PER_PROCESS = 2000
+# CPython 3.11 divides and converts to str in quadratic time. Above these sizes the
+# Python-int path divides through a Newton reciprocal (Karatsuba multiplications only)
+# and converts by splitting on powers of ten.
+_NEWTON_MIN_BITS = 20_000
+_STR_BLOCK_DIGITS = 2000
+
+Split = tuple[Any, Any, Any]
+
+
+def _int(value: int) -> Any:
+    return gmpy2.mpz(value) if gmpy2 is not None else value
+
+
+def binary_split(a: int, b: int) -> Split:
+    """``(P, Q, T)`` of Chudnovsky terms ``[a, b)``."""
+    if b - a == 1:
+        if a == 0:
+            p = q = _int(1)
+        else:
+            p = _int((6 * a - 5) * (2 * a - 1) * (6 * a - 1))
+            q = _int(a) * a * a * C3_OVER_24
+        t = p * (13591409 + 545140134 * a)
+        return p, q, -t if a & 1 else t
+    middle = (a + b) // 2
+    return merge(binary_split(a, middle), binary_split(middle, b))
+
+
+def merge(left: Split, right: Split) -> Split:
+    p1, q1, t1 = left
+    p2, q2, t2 = right
+    return p1 * p2, q1 * q2, t1 * q2 + p1 * t2
+
+
+def _split_range(bounds: tuple[int, int]) -> tuple[int, int, int]:
+    # Shipped back to the parent as Python ints so the result pickles without gmpy2.
+    return tuple(int(value) for value in binary_split(*bounds))
+
+
+def _split_parallel(terms: int, processes: int) -> Split:
+    step = -(-terms // processes)
+    bounds = [(start, min(start + step, terms)) for start in range(0, terms, step)]
+    # billiard, unlike multiprocessing, may fork from the daemonic children of Celery's
+    # prefork pool, where the π store grows.
+    with Pool(processes=len(bounds)) as pool:
+        parts = [tuple(_int(value) for value in part) for part in pool.map(_split_range, bounds)]
+    while len(parts) > 1:
+        pairs = [merge(parts[i], parts[i + 1]) for i in range(0, len(parts) - 1, 2)]
+        parts = pairs + parts[len(pairs) * 2 :]
+    return parts[0]
+
+
+def pi_decimals(count: int, processes: int = 1) -> str:
+    """
+    First ``count`` decimals of π (the digits after ``3.``).
+
+    Binary splitting of the Chudnovsky series over Python ints, or gmpy2 when installed.
+    With ``processes > 1`` the term range is split into contiguous blocks computed in a
+    process pool and merged pairwise in the caller.
+    """
+    if count <= 0:
+        return ""
+    digits = count + GUARD_DIGITS
+    terms = int(digits / DIGITS_PER_TERM) + 2
+    if processes > 1 and terms >= 2 * MIN_TERMS_PER_PROCESS:
+        _, q, t = _split_parallel(terms, min(processes, terms // MIN_TERMS_PER_PROCESS))
+    else:
+        _, q, t = binary_split(0, terms)
+    if gmpy2 is not None:
+        scale = gmpy2.mpz(10) ** digits
+        pi = (q * 426880 * gmpy2.isqrt(10005 * scale * scale)) // t
+    else:
+        # π = 426880 · 10005 · Q / (√10005 · T), evaluated as a binary fixed point with
+        # Newton reciprocals so only multiplications run at full size.
+        bits = int(digits * 3.3219280948873626) + 64
+        x = q * (426880 * 10005) * inverse_sqrt(10005, bits)
+        shift = max(x.bit_length() - bits - 32, 0)
+        x >>= shift
+        pi_fixed = (x * _reciprocal(t, bits)) >> (bits + t.bit_length() - shift)
+        pi = (pi_fixed * _power_of_ten(digits)) >> bits
+    return to_decimal_string(pi, digits + 1)[1 : count + 1]
+
+
+def inverse_sqrt(value: int, bits: int) -> int:
+    """``2**bits / sqrt(value)`` for a small positive integer, within a few units."""
+    if bits <= 40:
+        return int((1 << bits) / sqrt(value))
+    half = bits // 2 + 16
+    y = inverse_sqrt(value, half) << (bits - half)
+    # y += y * (1 - value * y²) / 2, in units of 2**bits.
+    error = (1 << (2 * bits)) - value * y * y
+    return y + ((y * error) >> (2 * bits + 1))
+
+
+def divide(a: int, b: int) -> int:
+    """``a // b`` for non-negative ``a`` and positive ``b``."""
+    precision = a.bit_length() - b.bit_length() + 32
+    if precision < _NEWTON_MIN_BITS or b.bit_length() < _NEWTON_MIN_BITS:
+        return a // b
+    quotient = (a * _reciprocal(b, precision)) >> (precision + b.bit_length())
+    remainder = a - quotient * b
+    while remainder < 0:
+        quotient -= 1
+        remainder += b
+    while remainder >= b:
+        quotient += 1
+        remainder -= b
+    return quotient
+
+
+def _reciprocal(d: int, bits: int) -> int:
+    """About ``2**(bits + d.bit_length()) / d``, correct to ``bits`` bits."""
+    length = d.bit_length()
+    shift = max(length - bits - 32, 0)
+    d >>= shift
+    length -= shift
+    if bits <= _NEWTON_MIN_BITS:
+        return (1 << (bits + length)) // d
+    half = bits // 2 + 16
+    y = _reciprocal(d, half) << (bits - half)
+    # y += y * (1 - d * y), in units of 2**(bits + length).
+    error = (1 << (bits + length)) - d * y
+    return y + ((y * error) >> (bits + length))
+
+
+def to_decimal_string(value: Any, width: int) -> str:
+    """Zero-padded decimal representation of a non-negative integer."""
+    if gmpy2 is not None:
+        return gmpy2.mpz(value).digits(10).zfill(width)
+    return _to_decimal(int(value), width)
+
+
+def _to_decimal(value: int, width: int) -> str:
+    if width <= _STR_BLOCK_DIGITS:
+        return str(value).zfill(width)
+    low_width = width // 2
+    power = _power_of_ten(low_width)
+    high = divide(value, power)
+    low = value - high * power
+    return _to_decimal(high, width - low_width) + _to_decimal(low, low_width)
+
+
+@lru_cache(maxsize=128)
+def _power_of_ten(exponent: int) -> int:
+    return 10**exponent
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import hashlib
+import http.client
+import json
+import logging
+import os
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from src.app.infrastructure.documents import document_key
+from src.app.worker.file_cache import LruFiles
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_TIMEOUT_SECONDS = 60.0
+_COPY_BYTES = 1024 * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class Download:
+    path: Path
+    # Body size, None while streaming a response without Content-Length.
+    size: int | None
+    # Body blocks still to be downloaded, None when ``path`` is already complete.
+    blocks: Iterator[bytes] | None
+    # SHA-256 of a complete body, None while it is still downloading.
+    sha256: str | None = None
+
+
+class DownloadCache:
+    """
+    Downloaded documents cached on disk under the SHA-256 of their URL.
+
+    Each URL owns ``<key>.doc`` (the body) and ``<key>.json`` (URL, validators, size and
+    SHA-256 of the body). Validating or downloading an entry holds an exclusive ``flock``
+    on ``locks/<key>.lock``, so concurrent tasks for one URL download it once and the
+    others reuse the result; the lock is released as soon as the entry is validated or
+    committed. Readers hold a shared ``flock`` on ``locks/<key>.use.lock`` for as long as
+    they use the entry, so any number of them scan one copy at the same time.
+    Bodies are written to a temp file and renamed into place, so a reader never sees a
+    partial document. Copies older than ``revalidate_after`` seconds are revalidated
+    with ``If-None-Match``/``If-Modified-Since``; a ``304`` only refreshes them.
+    After each download the least recently used documents are evicted until the cache
+    fits ``max_bytes``; eviction only takes an entry's use lock without blocking, so
+    documents in use are skipped.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        max_bytes: int,
+        *,
+        revalidate_after: float = 0.0,
+        timeout: float = DOWNLOAD_TIMEOUT_SECONDS,
+    ) -> None:
+        self._directory = Path(directory)
+        self._files = LruFiles(directory, ".doc", max_bytes, evict_lock_suffix=".use")
+        self._revalidate_after = revalidate_after
+        self._timeout = timeout
+
+    @staticmethod
+    def key(url: str) -> str:
+        return document_key(url)
+
+    def path_for(self, url: str) -> Path:
+        return self._directory / f"{self.key(url)}.doc"
+
+    def fetch(self, url: str) -> Path:
+        """Local path of ``url``'s body, downloading or revalidating it when needed."""
+        with self.open(url) as download:
+            if download.blocks is not None:
+                for _ in download.blocks:
+                    pass
+        return download.path
+
+    @contextmanager
+    def open(self, url: str) -> Iterator[Download]:
+        """
+        ``url``'s cache entry, protected from eviction for the duration of the block.
+
+        A valid copy comes with ``blocks=None``. Otherwise ``blocks`` yields the response
+        body as it arrives while writing it to the cache; the entry is committed once
+        ``blocks`` is exhausted and discarded if the block exits before that. Other
+        tasks for the same URL wait only until the entry is valid, not for the block.
+        """
+        key = self.key(url)
+        path = self._directory / f"{key}.doc"
+        with self._files.locked(f"{key}.use", shared=True), ExitStack() as fetching:
+            fetching.enter_context(self._files.locked(key))
+            meta = self._read_meta(key, url)
+            if meta is not None and time.time() - meta["checked_at"] < self._revalidate_after:
+                os.utime(path)
+                fetching.close()
+                yield Download(path, meta["size"], None, meta.get("sha256"))
+                return
+            try:
+                response = self._request(url, key, meta)
+            except (OSError, ValueError) as exc:
+                if meta is None:
+                    raise
+                logger.warning("Revalidating %s failed, serving cached copy: %s", url, exc)
+                response = None
+            if response is None:
+                os.utime(path)
+                fetching.close()
+                yield Download(path, meta["size"], None, meta.get("sha256"))
+                return
+            with response:
+                length = response.headers.get("Content-Length")
+                blocks = _released_after(self._store(url, key, response), fetching)
+                try:
+                    yield Download(path, int(length) if length is not None else None, blocks)
+                finally:
+                    blocks.close()
+        self.evict(keep=key)
+
+    def evict(self, keep: str | None = None) -> int:
+        """Drop least recently used documents until the cache fits; returns bytes freed."""
+        return self._files.evict(
+            keep, remove=lambda path: path.with_suffix(".json").unlink(missing_ok=True)
+        )
+
+    def _request(
+        self, url: str, key: str, meta: dict[str, Any] | None
+    ) -> http.client.HTTPResponse | None:
+        """Conditional GET of ``url``; None when the cached copy is still valid."""
+        request = urllib.request.Request(url)
+        if meta is not None:
+            if meta.get("etag"):
+                request.add_header("If-None-Match", meta["etag"])
+            if meta.get("last_modified"):
+                request.add_header("If-Modified-Since", meta["last_modified"])
+        try:
+            return urllib.request.urlopen(request, timeout=self._timeout)
+        except urllib.error.HTTPError as exc:
+            if exc.code == 304 and meta is not None:
+                meta["checked_at"] = time.time()
+                self._write_meta(key, meta)
+                return None
+            raise
+
+    def _store(
+        self, url: str, key: str, response: http.client.HTTPResponse
+    ) -> Iterator[bytes]:
+        """Yield the body of ``response`` while writing it to a temp file, then commit it."""
+        fd, tmp_path = tempfile.mkstemp(dir=self._directory, prefix=f".{key}.")
+        try:
+            digest = hashlib.sha256()
+            size = 0
+            with os.fdopen(fd, "wb") as tmp:
+                while block := response.read1(_COPY_BYTES):
+                    digest.update(block)
+                    tmp.write(block)
+                    size += len(block)
+                    yield block
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            expected = response.headers.get("Content-Length")
+            if expected is not None and int(expected) != size:
+                raise ValueError(f"truncated download: {size} of {expected} bytes")
+            os.replace(tmp_path, self._directory / f"{key}.doc")
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self._write_meta(
+            key,
+            {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "size": size,
+                "sha256": digest.hexdigest(),
+                "checked_at": time.time(),
+            },
+        )
+        logger.info("Downloaded %s (%d bytes)", url, size)
+
+    def _read_meta(self, key: str, url: str) -> dict[str, Any] | None:
+        """Metadata of a complete cached copy of ``url``, or None."""
+        try:
+            meta = json.loads((self._directory / f"{key}.json").read_text())
+            size = (self._directory / f"{key}.doc").stat().st_size
+        except (FileNotFoundError, ValueError):
+            return None
+        if meta.get("url") != url or meta.get("size") != size:
+            return None
+        return meta
+
+    def _write_meta(self, key: str, meta: dict[str, Any]) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self._directory, prefix=f".{key}.")
+        try:
+            with os.fdopen(fd, "w") as tmp:
+                json.dump(meta, tmp)
+            os.replace(tmp_path, self._directory / f"{key}.json")
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+
+def _released_after(blocks: Iterator[bytes], lock: ExitStack) -> Iterator[bytes]:
+    """``blocks``, closing ``lock`` once the body is committed (or abandoned)."""
+    try:
+        yield from blocks
+    finally:
+        lock.close()
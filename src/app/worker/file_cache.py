@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import fcntl
+import logging
+import os
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class LruFiles:
+    """
+    Files ``<key><suffix>`` in one directory, kept within ``max_bytes`` by evicting the
+    least recently modified first; users ``os.utime`` an entry to mark it as used.
+
+    Entries are guarded by ``flock``s on ``locks/<name>.lock``. Eviction takes the lock
+    named ``<key><evict_lock_suffix>`` without blocking and skips entries whose lock is
+    held, so holding it (shared or exclusive) keeps an entry on disk.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        suffix: str,
+        max_bytes: int,
+        *,
+        evict_lock_suffix: str = "",
+    ) -> None:
+        self.directory = Path(directory)
+        self._suffix = suffix
+        self._max_bytes = max_bytes
+        self._evict_lock_suffix = evict_lock_suffix
+
+    @contextmanager
+    def locked(self, name: str, blocking: bool = True, shared: bool = False) -> Iterator[bool]:
+        """Hold the lock ``name``; yields False if ``blocking`` is off and it is taken."""
+        lock_dir = self.directory / "locks"
+        lock_dir.mkdir(parents=True, exist_ok=True)
+        with (lock_dir / f"{name}.lock").open("a") as lock_file:
+            operation = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+            try:
+                fcntl.flock(lock_file, operation if blocking else operation | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def evict(
+        self, keep: str | None = None, remove: Callable[[Path], None] | None = None
+    ) -> int:
+        """
+        Drop least recently used entries until the directory fits; returns bytes freed.
+        ``remove`` deletes an entry's companion files, called while its lock is held.
+        """
+        entries = []
+        for path in self.directory.glob(f"*{self._suffix}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        freed = 0
+        for _, size, path in sorted(entries):
+            if total - freed <= self._max_bytes:
+                break
+            key = path.name[: -len(self._suffix)]
+            if key == keep:
+                continue
+            with self.locked(f"{key}{self._evict_lock_suffix}", blocking=False) as acquired:
+                if not acquired:
+                    continue
+                path.unlink(missing_ok=True)
+                if remove is not None:
+                    remove(path)
+            logger.info("Evicted %s (%d bytes)", path.name, size)
+            freed += size
+        return freed
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+from src.app.worker.file_cache import LruFiles
+from src.app.worker.matching import KeywordMatcher
+
+# Tokens are maximal runs of these bytes in the ASCII-lower-cased document. A keyword made
+# only of them can only occur inside one token, so matching it against the vocabulary
+# finds exactly the occurrences a scan of the document would. Non-ASCII bytes keep their
+# case; the binary matcher folds those keywords on the decoded vocabulary.
+TOKEN_PATTERN = re.compile(rb"[0-9a-z_\x80-\xff]+")
+# The same tokens in the document as written, lower-cased one by one, so the document
+# itself is never copied.
+_DOCUMENT_TOKEN_PATTERN = re.compile(rb"[0-9A-Za-z_\x80-\xff]+")
+# Words as ``bytes.split()`` sees them.
+_WORD_PATTERN = re.compile(rb"[^ \t\n\r\x0b\x0c]+")
+_MAGIC = b"PTIDX1\n\x00"
+_HEADER = struct.Struct("<8sQ")
+
+
+def is_indexable(keyword: str) -> bool:
+    return TOKEN_PATTERN.fullmatch(keyword.lower().encode("utf-8")) is not None
+
+
+class InvertedIndex:
+    """
+    Token positions of one document, read through a memory map of its index file.
+
+    The file holds a JSON header and five sections: the offset of each token in the
+    vocabulary, the offset of each token's postings, the postings (byte offsets of every
+    token occurrence, grouped by token), the offsets of the document's newlines and the
+    vocabulary itself (sorted tokens joined by ``\\n``). Only the vocabulary is read per
+    query; postings are sliced for the tokens that match.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_size = _HEADER.unpack_from(self._mmap)
+        if magic != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f"not a document index: {path}")
+        header = json.loads(self._mmap[_HEADER.size : _HEADER.size + header_size])
+        self.size: int = header["size"]
+        self.words: int = header["words"]
+        view = memoryview(self._mmap)
+        self._views = [view]
+        offset = _HEADER.size + header_size
+        sections = []
+        for name in ("token_starts", "posting_starts", "postings", "newlines"):
+            length = header[name] * array(header["typecode"]).itemsize
+            section = view[offset : offset + length].cast(header["typecode"])
+            self._views.append(section)
+            sections.append(section)
+            offset += length
+        self._token_starts, self._posting_starts, self._postings, self._newlines = sections
+        self._vocabulary = bytes(view[offset : offset + header["vocabulary"]])
+
+    def __enter__(self) -> InvertedIndex:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._mmap.close()
+
+    def find(self, matcher: KeywordMatcher) -> list[tuple[int, int]]:
+        """
+        ``(start, end)`` byte offsets of every match of ``matcher`` in the document, in
+        the order a scan reports them (by end, longest first). The matcher's keywords
+        must all be indexable.
+        """
+        hits: list[tuple[int, int]] = []
+        token_starts, posting_starts, postings = (
+            self._token_starts,
+            self._posting_starts,
+            self._postings,
+        )
+        for match in matcher.finditer(self._vocabulary):
+            token = bisect_right(token_starts, match.start) - 1
+            shift = match.start - token_starts[token]
+            length = match.end - match.start
+            for position in postings[posting_starts[token] : posting_starts[token + 1]]:
+                hits.append((position + shift, position + shift + length))
+        hits.sort(key=lambda hit: (hit[1], hit[0]))
+        return hits
+
+    def line(self, offset: int) -> int:
+        """1-based line number of byte ``offset``."""
+        return bisect_left(self._newlines, offset) + 1
+
+    def newlines(self, start: int, stop: int) -> int:
+        """Newlines in ``[start, stop)``."""
+        return bisect_left(self._newlines, stop) - bisect_left(self._newlines, start)
+
+    @staticmethod
+    def build(document_path: str | os.PathLike[str], index_path: str | os.PathLike[str]) -> None:
+        with open(document_path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            # The vocabulary is at most twice the document (one separator per token).
+            typecode = "I" if 2 * size < 2**32 else "Q"
+            if size:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                    positions, newlines, words = _tokenize(view, typecode)
+            else:
+                positions, newlines, words = _tokenize(b"", typecode)
+        tokens = sorted(positions)
+        vocabulary = b"\n".join(tokens)
+        token_starts = array(typecode, [0])
+        posting_starts = array(typecode, [0])
+        postings = array(typecode)
+        for token in tokens:
+            token_starts.append(token_starts[-1] + len(token) + 1)
+            postings.extend(positions[token])
+            posting_starts.append(len(postings))
+        header = {
+            "size": size,
+            "words": words,
+            "typecode": typecode,
+            "token_starts": len(token_starts),
+            "posting_starts": len(posting_starts),
+            "postings": len(postings),
+            "newlines": len(newlines),
+            "vocabulary": len(vocabulary),
+        }
+        encoded = json.dumps(header).encode("utf-8")
+        # Pads the header so the arrays that follow it are aligned to 8 bytes.
+        encoded += b" " * (-(_HEADER.size + len(encoded)) % 8)
+        with open(index_path, "wb") as out:
+            out.write(_HEADER.pack(_MAGIC, len(encoded)))
+            out.write(encoded)
+            for section in (token_starts, posting_starts, postings, newlines):
+                section.tofile(out)
+            out.write(vocabulary)
+
+
+def _tokenize(data: bytes | mmap.mmap, typecode: str) -> tuple[dict[bytes, array], array, int]:
+    """
+    Token positions, newline offsets and word count of ``data``, offsets packed in
+    ``typecode`` arrays rather than lists of ints. Kept in a function of its own so no
+    match object outlives it and holds the memory map open.
+    """
+    positions: dict[bytes, array] = {}
+    for match in _DOCUMENT_TOKEN_PATTERN.finditer(data):
+        token = match.group().lower()
+        postings = positions.get(token)
+        if postings is None:
+            postings = positions[token] = array(typecode)
+        postings.append(match.start())
+    newlines = array(typecode, (match.start() for match in re.finditer(b"\n", data)))
+    words = sum(1 for _ in _WORD_PATTERN.finditer(data))
+    return positions, newlines, words
+
+
+class DocumentIndexStore:
+    """
+    Index files of documents, named after the SHA-256 of the document's content.
+
+    The first request for a document builds its index under an exclusive ``flock`` and
+    renames it into place, so concurrent tasks build it once; later requests, for any
+    path with the same content, open the existing file under a shared lock. Digests are
+    taken from the caller when known (the download cache records them) and are otherwise
+    cached under ``digests/`` by path, inode, size and mtime, so an unchanged document is
+    hashed once. After each build the least recently used indexes are evicted until they
+    fit ``max_bytes``, skipping those being built or opened, and digests of evicted
+    indexes are dropped with them.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], max_bytes: int) -> None:
+        self._directory = Path(directory)
+        self._files = LruFiles(directory, ".idx", max_bytes)
+
+    def index_path(self, digest: str) -> Path:
+        return self._directory / f"{digest}.idx"
+
+    def open(
+        self, document_path: str | os.PathLike[str], digest: str | None = None
+    ) -> InvertedIndex:
+        """Index of ``document_path``; ``digest`` is its SHA-256 when already known."""
+        if digest is None:
+            digest = self._digest(document_path)
+        index_path = self.index_path(digest)
+        # An open index stays readable once evicted: the memory map outlives the file.
+        with self._files.locked(digest, shared=True):
+            if index_path.exists():
+                os.utime(index_path)
+                return InvertedIndex(index_path)
+        index = self._build(document_path, index_path, digest)
+        if self._files.evict(keep=digest):
+            self._drop_orphaned_digests()
+        return index
+
+    def _digest(self, document_path: str | os.PathLike[str]) -> str:
+        stat = os.stat(document_path)
+        identity = (
+            f"{os.path.realpath(document_path)}\0{stat.st_dev}\0{stat.st_ino}"
+            f"\0{stat.st_size}\0{stat.st_mtime_ns}"
+        )
+        cached = self._directory / "digests" / hashlib.sha256(
+            identity.encode("utf-8", errors="surrogateescape")
+        ).hexdigest()
+        try:
+            return cached.read_text()
+        except FileNotFoundError:
+            pass
+        with open(document_path, "rb") as handle:
+            digest = hashlib.file_digest(handle, "sha256").hexdigest()
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cached.parent, prefix=f".{cached.name}.")
+        try:
+            with os.fdopen(fd, "w") as tmp:
+                tmp.write(digest)
+            os.replace(tmp_path, cached)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        return digest
+
+    def _drop_orphaned_digests(self) -> None:
+        for cached in (self._directory / "digests").glob("[!.]*"):
+            try:
+                if not self.index_path(cached.read_text()).exists():
+                    cached.unlink(missing_ok=True)
+            except FileNotFoundError:
+                continue
+
+    def _build(
+        self, document_path: str | os.PathLike[str], index_path: Path, digest: str
+    ) -> InvertedIndex:
+        """Build the index unless another task did meanwhile, and open it."""
+        self._directory.mkdir(parents=True, exist_ok=True)
+        with self._files.locked(digest):
+            if not index_path.exists():
+                fd, tmp_path = tempfile.mkstemp(dir=self._directory, prefix=f".{index_path.name}")
+                os.close(fd)
+                try:
+                    InvertedIndex.build(document_path, tmp_path)
+                    os.replace(tmp_path, index_path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+            return InvertedIndex(index_path)
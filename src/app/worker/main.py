@@ -1,25 +1,91 @@
+import argparse
 import os
+import signal
+import subprocess
+import sys
+import time
 
-from src.setup.stream_config import configure_stream_publisher
+from src.setup.stream_config import configure_worker_dependencies
+from src.setup.worker_config import WorkerPoolSettings, get_worker_settings
 from src.app.infrastructure.celery.app import celery_app
 
+# Pools whose size Celery can change at runtime; the others run at max_concurrency.
+AUTOSCALING_POOLS = {"prefork", "threads"}
+# Celery's thread pool cannot resize, so threads run on a subclass that can.
+POOL_IMPLEMENTATIONS = {"threads": "src.app.worker.pools:ResizableThreadPool"}
+
+
+def pool_implementation(pool: WorkerPoolSettings) -> str:
+    """Celery ``worker_pool`` setting (alias or ``module:Class``) for ``pool``."""
+    return POOL_IMPLEMENTATIONS.get(pool.pool, pool.pool)
+
+
+def worker_argv(pool: WorkerPoolSettings, log_level: str) -> list[str]:
+    """
+    Celery ``worker`` arguments for one per-queue pool. ``--pool`` only accepts Celery's
+    own aliases, so the pool class is set through ``worker_pool`` by ``run_pool``.
+    """
+    argv = [
+        "worker",
+        "-l",
+        log_level,
+        "-Q",
+        pool.queue,
+        "-n",
+        f"{pool.queue}@%h",
+        "--prefetch-multiplier",
+        str(pool.prefetch_multiplier),
+    ]
+    if pool.pool in AUTOSCALING_POOLS and pool.min_concurrency < pool.max_concurrency:
+        argv += ["--autoscale", f"{pool.max_concurrency},{pool.min_concurrency}"]
+    else:
+        argv += ["--concurrency", str(pool.max_concurrency)]
+    return argv
+
+
+def run_pool(queue: str) -> None:
+    """Run the worker for ``queue`` in this process."""
+    settings = get_worker_settings()
+    pool = next((pool for pool in settings.WORKER_POOLS if pool.queue == queue), None)
+    if pool is None:
+        raise SystemExit(f"No worker pool configured for queue {queue!r}")
+    configure_worker_dependencies()
+    celery_app.conf.worker_pool = pool_implementation(pool)
+    celery_app.conf.worker_autoscaler = "src.app.worker.autoscale:QueueDepthAutoscaler"
+    celery_app.worker_main(worker_argv(pool, os.getenv("LOG_LEVEL", "INFO")))
+
+
+def supervise() -> None:
+    """Start one worker process per configured pool and stop them all if one exits."""
+    children = [
+        subprocess.Popen([sys.executable, "-m", "src.app.worker.main", "--queue", pool.queue])
+        for pool in get_worker_settings().WORKER_POOLS
+    ]
+
+    def _terminate(signum, _frame) -> None:
+        for child in children:
+            if child.poll() is None:
+                child.send_signal(signum)
+
+    signal.signal(signal.SIGTERM, _terminate)
+    signal.signal(signal.SIGINT, _terminate)
+    try:
+        while all(child.poll() is None for child in children):
+            time.sleep(1.0)
+    finally:
+        _terminate(signal.SIGTERM, None)
+        exit_codes = [child.wait() for child in children]
+    sys.exit(next((code for code in exit_codes if code), 0))
+
 
 def main() -> None:
-    log_level = os.getenv("LOG_LEVEL", "INFO")
-    concurrency = os.getenv("CELERY_CONCURRENCY", "2")
-    queues = os.getenv("CELERY_QUEUES", "celery,doc-tasks")
-    configure_stream_publisher()
-    celery_app.worker_main(
-        [
-            "worker",
-            "-l",
-            log_level,
-            "--concurrency",
-            concurrency,
-            "-Q",
-            queues,
-        ]
-    )
+    parser = argparse.ArgumentParser(description="Celery worker launcher.")
+    parser.add_argument("--queue", help="Run only the pool consuming this queue.")
+    args = parser.parse_args()
+    if args.queue:
+        run_pool(args.queue)
+    else:
+        supervise()
 
 
 if __name__ == "__main__":
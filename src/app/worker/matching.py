@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Protocol
+
+# Above this many keywords one alternation regex degrades to trying every alternative at
+# every position; the automaton's cost does not depend on the keyword count.
+AHO_CORASICK_MIN_KEYWORDS = 50
+
+
+@dataclass(frozen=True, slots=True)
+class KeywordMatch:
+    start: int
+    end: int
+    # The matched text as it appears in the document (original case).
+    text: str | bytes
+
+
+class KeywordMatcher(Protocol):
+    # Whether matches may overlap; non-overlapping matchers can resume after a match.
+    overlapping: bool
+
+    def finditer(self, text: str | bytes, pos: int = 0) -> Iterator[KeywordMatch]: ...
+
+
+class RegexMatcher:
+    """
+    One case-insensitive alternation of the escaped keywords.
+    Matches do not overlap: at each position the first keyword in list order wins.
+
+    With ``binary=True`` the matcher scans UTF-8 bytes: the input is lower-cased as
+    ASCII and searched with a case-sensitive pattern of the lower-cased keywords, which
+    is several times faster than ``re.IGNORECASE``. That folds ASCII letters only, so
+    ``build_matcher`` uses it for ASCII keywords and wraps the str matcher in a
+    ``DecodingMatcher`` otherwise.
+    """
+
+    overlapping = False
+
+    def __init__(self, keywords: Iterable[str], *, binary: bool = False) -> None:
+        self._binary = binary
+        if binary:
+            self._pattern = re.compile(
+                b"|".join(re.escape(keyword.lower().encode("utf-8")) for keyword in keywords)
+            )
+        else:
+            self._pattern = re.compile(
+                "|".join(re.escape(keyword) for keyword in keywords), re.IGNORECASE
+            )
+
+    def finditer(self, text: str | bytes, pos: int = 0) -> Iterator[KeywordMatch]:
+        searched = text.lower() if self._binary else text
+        for match in self._pattern.finditer(searched, pos):
+            start, end = match.span()
+            yield KeywordMatch(start, end, text[start:end])
+
+
+class AhoCorasickMatcher:
+    """
+    Aho-Corasick automaton over the lower-cased keywords.
+
+    Unlike ``RegexMatcher`` every occurrence of every keyword is reported, including
+    overlapping ones and keywords contained in longer ones ("he" and "she" in "ushers").
+    Matches are ordered by end offset, and by length, longest first, when they end at
+    the same offset. Case folding is per character through ``str.lower`` so offsets
+    always refer to the original text. ``binary=True`` scans UTF-8 bytes with ASCII
+    case folding, as in ``RegexMatcher``, and is only correct for ASCII keywords.
+    """
+
+    overlapping = True
+
+    def __init__(self, keywords: Iterable[str], *, binary: bool = False) -> None:
+        self._binary = binary
+        self._goto: list[dict[str | int, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[int, ...]] = [()]
+        for keyword in dict.fromkeys(keyword.lower() for keyword in keywords if keyword):
+            self._add(keyword.encode("utf-8") if binary else keyword)
+        self._link()
+
+    def _add(self, keyword: str | bytes) -> None:
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = next_state
+        self._out[state] = (len(keyword),)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def finditer(self, text: str | bytes, pos: int = 0) -> Iterator[KeywordMatch]:
+        folded = text.lower()
+        if len(folded) != len(text):
+            folded = "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        state = 0
+        for index, char in enumerate(folded[pos:] if pos else folded, pos):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0) if state else root.get(char, 0)
+            if out[state]:
+                end = index + 1
+                for length in out[state]:
+                    yield KeywordMatch(end - length, end, text[end - length : end])
+
+
+class DecodingMatcher:
+    """
+    A str matcher run over UTF-8 bytes, with offsets mapped back to bytes.
+
+    Used in binary mode when a keyword has non-ASCII characters, which byte-level ASCII
+    folding cannot match case-insensitively ("Ärger" against "ärger"). Bytes that are
+    not valid UTF-8 round-trip through ``surrogateescape``, so offsets stay exact.
+    """
+
+    def __init__(self, matcher: KeywordMatcher) -> None:
+        self._matcher = matcher
+        self.overlapping = matcher.overlapping
+
+    def finditer(self, text: str | bytes, pos: int = 0) -> Iterator[KeywordMatch]:
+        decoded = text.decode("utf-8", errors="surrogateescape")
+        char_pos = len(text[:pos].decode("utf-8", errors="surrogateescape")) if pos else 0
+        # Byte offset of the last mapped character; matches arrive roughly in order, so
+        # each mapping only encodes the characters between it and the previous one.
+        mapped_char, mapped_byte = 0, 0
+        for match in self._matcher.finditer(decoded, char_pos):
+            start = mapped_byte + _encoded_length(decoded, mapped_char, match.start)
+            end = start + _encoded_length(decoded, match.start, match.end)
+            mapped_char, mapped_byte = match.start, start
+            yield KeywordMatch(start, end, text[start:end])
+
+
+def _encoded_length(text: str, start: int, stop: int) -> int:
+    """UTF-8 length of ``text[start:stop]``, negative if ``stop`` comes first."""
+    if stop < start:
+        return -_encoded_length(text, stop, start)
+    return len(text[start:stop].encode("utf-8", errors="surrogateescape"))
+
+
+def build_matcher(
+    keywords: Iterable[str],
+    aho_corasick_min_keywords: int | None = None,
+    *,
+    binary: bool = False,
+) -> KeywordMatcher:
+    """
+    Regex alternation for short keyword lists, Aho-Corasick from the threshold on. In
+    binary mode keywords with non-ASCII characters are matched on the decoded text.
+    """
+    keywords = list(keywords)
+    if binary and not all(keyword.isascii() for keyword in keywords):
+        return DecodingMatcher(build_matcher(keywords, aho_corasick_min_keywords))
+    if aho_corasick_min_keywords is None:
+        aho_corasick_min_keywords = AHO_CORASICK_MIN_KEYWORDS
+    if len(keywords) >= aho_corasick_min_keywords:
+        return AhoCorasickMatcher(keywords, binary=binary)
+    return RegexMatcher(keywords, binary=binary)
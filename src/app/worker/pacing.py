@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import random
+import time
+from typing import Any
+
+from src.app.domain.models.pacing import PacingConfig, PacingMode
+
+
+class Pacer:
+    """Sleeps between task steps according to a ``PacingConfig``."""
+
+    def __init__(self, mode: PacingMode, delay_seconds: float) -> None:
+        self.mode = mode
+        self.delay_seconds = delay_seconds
+
+    @classmethod
+    def for_task(
+        cls, payload: dict[str, Any], *, default_mode: str, default_delay: float
+    ) -> Pacer:
+        """
+        Pacer for a task message body: its ``pacing`` entry (from ``ExecutionConfig``)
+        overrides the worker defaults field by field.
+        """
+        raw = payload.get("pacing")
+        if raw is None:
+            return cls(PacingMode(default_mode), default_delay)
+        config = PacingConfig.model_validate(raw)
+        delay = config.delay_seconds if config.delay_seconds is not None else default_delay
+        return cls(config.mode, delay)
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != PacingMode.NONE and self.delay_seconds > 0
+
+    def next_delay(self) -> float:
+        if not self.enabled:
+            return 0.0
+        if self.mode == PacingMode.RANDOM:
+            return random.uniform(0.0, 2 * self.delay_seconds)
+        return self.delay_seconds
+
+    def pause(self) -> None:
+        delay = self.next_delay()
+        if delay:
+            time.sleep(delay)
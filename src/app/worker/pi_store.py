@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import fcntl
+import logging
+import mmap
+import os
+import tempfile
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+from src.app.worker.chudnovsky import pi_decimals as compute_pi_decimals
+
+logger = logging.getLogger(__name__)
+
+ROUNDING_POLICIES = ("TRUNCATE", "ROUND")
+# Size of the first block computed while streaming from an empty store; later blocks
+# double it, so the time to the first digit does not depend on the requested length.
+STREAM_FIRST_BLOCK = 1000
+
+
+class PiDigitStore:
+    """
+    Decimals of π persisted as ASCII bytes in one memory-mapped file.
+
+    The file holds the digits after ``3.`` and is computed once to at least
+    ``min_digits``. Requests past its end grow it (at least doubling) under an exclusive
+    ``flock``, then replace it atomically, so worker processes sharing the path compute
+    each length once and readers never see a partial file. Any prefix is a slice of the
+    mapping.
+
+    ``iter_pi`` streams the same digits: what is already stored is yielded at once and
+    the rest is computed in doubling blocks, each yielded as soon as it is written.
+    """
+
+    def __init__(
+        self, path: str | os.PathLike[str], min_digits: int = 0, processes: int = 1
+    ) -> None:
+        self._path = Path(path)
+        self._min_digits = min_digits
+        self._processes = processes
+        self._lock = threading.Lock()
+        self._mmap: mmap.mmap | None = None
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def __len__(self) -> int:
+        return len(self._mmap) if self._mmap is not None else 0
+
+    def decimals(self, start: int, stop: int) -> str:
+        """Decimals ``[start, stop)`` of π, 0-based from the first digit after the point."""
+        if not 0 <= start <= stop:
+            raise ValueError("expected 0 <= start <= stop")
+        if start == stop:
+            return ""
+        return self._ensure(stop)[start:stop].decode("ascii")
+
+    def pi(self, digits: int, rounding: str = "TRUNCATE") -> str:
+        """
+        π to ``digits`` significant digits, e.g. ``pi(3) == "3.14"``.
+        ``ROUND`` rounds half up on the next decimal, ``TRUNCATE`` cuts it off.
+        """
+        if digits >= 1:
+            self._ensure(digits)
+        return "".join(self.iter_pi(digits, rounding))
+
+    def iter_pi(self, digits: int, rounding: str = "TRUNCATE") -> Iterator[str]:
+        """Chunks of ``pi(digits, rounding)``, yielded as the digits become available."""
+        if digits < 1:
+            raise ValueError("digits must be a positive integer")
+        if rounding not in ROUNDING_POLICIES:
+            raise ValueError(f"rounding must be one of {ROUNDING_POLICIES}, got {rounding!r}")
+        # π's decimals start with 1, so a carry never reaches the integer part.
+        yield "3"
+        places = digits - 1
+        if not places:
+            return
+        yield "."
+        # Rounding up only changes the last kept digit that is not a 9 and the nines
+        # after it, so that suffix is held back until the next decimal is known.
+        held = ""
+        for chunk in self._decimal_blocks(places):
+            if rounding == "ROUND":
+                chunk = held + chunk
+                cut = max(len(chunk.rstrip("9")) - 1, 0)
+                chunk, held = chunk[:cut], chunk[cut:]
+            if chunk:
+                yield chunk
+        if held:
+            if self.decimals(places, places + 1) >= "5":
+                held = str(int(held) + 1).zfill(len(held))
+            yield held
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+
+    def _decimal_blocks(self, count: int) -> Iterator[str]:
+        start = 0
+        while start < count:
+            view = self._ensure(start + 1, target=max(2 * start, STREAM_FIRST_BLOCK))
+            stop = min(count, len(view))
+            yield view[start:stop].decode("ascii")
+            start = stop
+
+    def _ensure(self, count: int, target: int | None = None) -> mmap.mmap:
+        view = self._mmap
+        if view is not None and len(view) >= count:
+            return view
+        with self._lock:
+            if self._mmap is None or len(self._mmap) < count:
+                self._remap()
+            if self._mmap is None or len(self._mmap) < count:
+                self._grow(count, target)
+                self._remap()
+            return self._mmap
+
+    def _remap(self) -> None:
+        try:
+            with self._path.open("rb") as handle:
+                size = os.fstat(handle.fileno()).st_size
+                view = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        except FileNotFoundError:
+            view = None
+        # The previous mapping may still be sliced by readers on the lock-free path; it is
+        # released once the last reference goes away.
+        self._mmap = view
+
+    def _grow(self, count: int, target: int | None = None) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path = self._path.with_name(self._path.name + ".lock")
+        with lock_path.open("a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                current = self._path.stat().st_size if self._path.exists() else 0
+                if current >= count:
+                    return
+                if target is None:
+                    target = max(2 * current, self._min_digits)
+                target = max(target, count)
+                logger.info("Extending π digit store %s to %d digits", self._path, target)
+                digits = compute_pi_decimals(target, self._processes).encode("ascii")
+                fd, tmp_path = tempfile.mkstemp(dir=self._path.parent, prefix=self._path.name)
+                try:
+                    with os.fdopen(fd, "wb") as tmp:
+                        tmp.write(digits)
+                        tmp.flush()
+                        os.fsync(tmp.fileno())
+                    os.replace(tmp_path, self._path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from celery.concurrency.thread import TaskPool
+
+
+class ResizableThreadPool(TaskPool):
+    """
+    Celery's thread pool with the ``grow``/``shrink`` the autoscaler needs.
+
+    A ``ThreadPoolExecutor`` cannot change its size, so resizing starts a new executor
+    with the new limit and retires the old one without waiting: tasks already running on
+    it finish on their threads, new tasks go to the new executor. The autoscaler lowers
+    the consumer's prefetch count along with the limit, so a shrunken pool stops taking
+    new work while the retired threads drain.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._retired: list[ThreadPoolExecutor] = []
+
+    def grow(self, n: int = 1) -> None:
+        self._resize(self.limit + n)
+
+    def shrink(self, n: int = 1) -> None:
+        self._resize(max(self.limit - n, 1))
+
+    def _resize(self, limit: int) -> None:
+        if limit == self.limit:
+            return
+        retired, self.executor = self.executor, ThreadPoolExecutor(max_workers=limit)
+        self.limit = limit
+        retired.shutdown(wait=False)
+        # Celery's own pool info reads ``_threads`` too; executors whose threads all
+        # exited have nothing left to wait for on stop.
+        self._retired = [
+            executor
+            for executor in (*self._retired, retired)
+            if any(thread.is_alive() for thread in executor._threads)
+        ]
+
+    def on_stop(self) -> None:
+        for retired in self._retired:
+            retired.shutdown()
+        self._retired.clear()
+        super().on_stop()
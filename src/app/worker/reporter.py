@@ -1,24 +1,75 @@
 from __future__ import annotations
 
-from typing import Any, Iterable
+import time
+from typing import Any, Callable, Iterable, Sequence
 
 import inject
 
 from src.app.domain.events.task_event import TaskEvent
+from src.app.domain.models.task_progress import TaskProgress
+from src.app.domain.models.task_state import TaskState
 from src.app.domain.models.task_status import TaskStatus
-from src.app.domain.repositories import TaskEventPublisherRepository
+from src.app.domain.repositories import TaskCancellationRepository, TaskEventPublisherRepository
+
+# Cancellation flags are read at most this often per task.
+CANCEL_CHECK_SECONDS = 0.5
 
 
 class TaskReporter:
-    """Publish task events to the stream."""
+    """
+    Publish task events to the stream.
+
+    ``cancel_requested`` lets task loops stop cooperatively; the cancellation repository
+    is resolved on its first call, so reporters that never check do not need one.
+    """
 
     def __init__(
         self,
         task_id: str,
         publisher: TaskEventPublisherRepository | None = None,
+        cancellation: TaskCancellationRepository | None = None,
+        cancel_check_interval: float | None = None,
     ) -> None:
         self._task_id = task_id
         self._publisher = publisher or inject.instance(TaskEventPublisherRepository)
+        self._cancellation = cancellation
+        self._cancel_check_interval = (
+            CANCEL_CHECK_SECONDS if cancel_check_interval is None else cancel_check_interval
+        )
+        self._cancel_checked_at: float | None = None
+        self._cancel_requested = False
+
+    def cancel_requested(self) -> bool:
+        """
+        Whether cancellation of the task was requested. The flag is read at most once
+        per ``cancel_check_interval`` seconds and stays set once seen, so loops can call
+        this for every item.
+        """
+        if self._cancel_requested:
+            return True
+        now = time.monotonic()
+        if (
+            self._cancel_checked_at is not None
+            and now - self._cancel_checked_at < self._cancel_check_interval
+        ):
+            return False
+        self._cancel_checked_at = now
+        if self._cancellation is None:
+            self._cancellation = inject.instance(TaskCancellationRepository)
+        self._cancel_requested = self._cancellation.is_cancel_requested(self._task_id)
+        return self._cancel_requested
+
+    def report_cancelled(
+        self, progress: TaskProgress, metrics: dict[str, Any] | None = None
+    ) -> None:
+        self.report_status(
+            TaskStatus(
+                state=TaskState.CANCELLED,
+                progress=progress,
+                message="cancelled",
+                metrics=metrics,
+            )
+        )
 
     def report_status(self, status: TaskStatus) -> None:
         event = TaskEvent.status(self._task_id, status)
@@ -28,40 +79,104 @@ class TaskReporter:
         event = TaskEvent.result(self._task_id, result_snapshot)
         self._publish(event)
 
-    def report_result_chunk(self, batch_size: int = 1) -> "ResultChunkReporter":
-        return ResultChunkReporter(self, batch_size)
+    def report_result_chunk(
+        self,
+        batch_size: int = 1,
+        *,
+        columnar: bool = False,
+        header: Sequence[str] = (),
+        dictionary: Sequence[str] = (),
+        flush_interval: float | None = None,
+        progress: Callable[[], TaskProgress] | None = None,
+    ) -> "ResultChunkReporter":
+        return ResultChunkReporter(
+            self,
+            batch_size,
+            columnar=columnar,
+            header=header,
+            dictionary=dictionary,
+            flush_interval=flush_interval,
+            progress=progress,
+        )
 
     def _publish(self, event: TaskEvent) -> None:
         self._publisher.publish(event)
 
 
 class ResultChunkReporter:
-    def __init__(self, reporter: TaskReporter, batch_size: int) -> None:
+    """
+    Batches result items into ``task.result_chunk`` events.
+
+    With ``columnar=True`` items are dicts and each chunk carries them as parallel
+    arrays instead of a list (see ``to_columns``): ``header`` fields are sent once per
+    chunk, so a chunk is flushed early when they change, and ``dictionary`` fields are
+    sent as indexes into a per-chunk table of their distinct values. ``flush_interval``
+    flushes a partial batch on the next item once that many seconds have passed.
+    ``progress`` is sampled as each chunk is published and sent along as its progress
+    watermark, so consumers can follow progress without separate status events.
+    """
+
+    def __init__(
+        self,
+        reporter: TaskReporter,
+        batch_size: int,
+        *,
+        columnar: bool = False,
+        header: Sequence[str] = (),
+        dictionary: Sequence[str] = (),
+        flush_interval: float | None = None,
+        progress: Callable[[], TaskProgress] | None = None,
+    ) -> None:
         if batch_size <= 0:
             raise ValueError("batch_size must be a positive integer")
         self._reporter = reporter
         self._batch_size = batch_size
+        self._columnar = columnar
+        self._header = tuple(header)
+        self._dictionary = tuple(dictionary)
+        self._flush_interval = flush_interval
+        self._progress = progress
         self._chunk_index = 0
         self._batch: list[Any] = []
+        self._batch_header: tuple[Any, ...] | None = None
+        self._flushed_at = time.monotonic()
 
     def emit(self, item: Any) -> None:
+        if self._columnar:
+            item_header = tuple(item.get(field) for field in self._header)
+            if self._batch and item_header != self._batch_header:
+                self._flush(is_last=False)
+            self._batch_header = item_header
         self._batch.append(item)
-        if len(self._batch) >= self._batch_size:
+        if len(self._batch) >= self._batch_size or (
+            self._flush_interval is not None
+            and time.monotonic() - self._flushed_at >= self._flush_interval
+        ):
             self._flush(is_last=False)
 
     def extend(self, items: Iterable[Any]) -> None:
         for item in items:
             self.emit(item)
-        
+
+    def flush(self) -> None:
+        """Publish the pending items, if any, as a chunk of their own."""
+        if self._batch:
+            self._flush(is_last=False)
 
     def _flush(self, is_last: bool) -> None:
+        if self._columnar:
+            data: Any = to_columns(self._batch, self._header, self._dictionary)
+        else:
+            data = list(self._batch)
         event = TaskEvent.result_chunk(
             self._reporter._task_id,
             str(self._chunk_index),
-            list(self._batch),
+            data,
             is_last=is_last,
+            progress=self._progress() if self._progress is not None else None,
         )
         self._reporter._publish(event)
+        self._flushed_at = time.monotonic()
         if is_last:
             return
         self._chunk_index += 1
@@ -72,3 +187,71 @@ class ResultChunkReporter:
 
     def __exit__(self, exc_type, exc, tb) -> None:
         self._flush(is_last=True)
+
+
+def to_columns(
+    items: Sequence[dict[str, Any]], header: Sequence[str] = (), dictionary: Sequence[str] = ()
+) -> dict[str, Any]:
+    """
+    Columnar form of ``items``: nested dicts are flattened to dotted keys, ``header``
+    fields (equal in every item) are kept once, ``dictionary`` fields become indexes into
+    a table of their distinct values and every other field becomes a parallel array.
+    """
+    rows = [_flatten(item) for item in items]
+    columns: dict[str, list[Any]] = {}
+    for row in rows:
+        for key in row:
+            if key not in header and key not in columns:
+                columns[key] = []
+    for key, values in columns.items():
+        values.extend(row.get(key) for row in rows)
+    dictionaries: dict[str, list[Any]] = {}
+    for key in dictionary:
+        if key not in columns:
+            continue
+        table: dict[Any, int] = {}
+        columns[key] = [table.setdefault(value, len(table)) for value in columns[key]]
+        dictionaries[key] = list(table)
+    return {
+        "format": "columnar",
+        "count": len(rows),
+        "header": {key: rows[0][key] for key in header if rows and key in rows[0]},
+        "dictionaries": dictionaries,
+        "columns": columns,
+    }
+
+
+def from_columns(data: dict[str, Any]) -> list[dict[str, Any]]:
+    """Items of a ``to_columns`` chunk, with dotted keys nested again."""
+    dictionaries = data.get("dictionaries", {})
+    items = []
+    for index in range(data["count"]):
+        row = dict(data.get("header", {}))
+        for key, values in data["columns"].items():
+            value = values[index]
+            if key in dictionaries:
+                value = dictionaries[key][value]
+            row[key] = value
+        items.append(_nest(row))
+    return items
+
+
+def _flatten(item: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    flat: dict[str, Any] = {}
+    for key, value in item.items():
+        if isinstance(value, dict) and value:
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def _nest(row: dict[str, Any]) -> dict[str, Any]:
+    item: dict[str, Any] = {}
+    for key, value in row.items():
+        *parents, leaf = key.split(".")
+        target = item
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = value
+    return item
@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import mmap
+import os
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import Any
+
+from billiard import Pool
+
+from src.app.worker.inverted_index import InvertedIndex, is_indexable
+from src.app.worker.matching import KeywordMatch, build_matcher
+
+WINDOW_BYTES = 8 * 1024 * 1024
+SNIPPET_RADIUS = 30
+# At most this many hits are kept per block of HIT_BLOCK_LINES document lines, so the
+# cap follows match density rather than the window size.
+MAX_HITS_PER_BLOCK = 2000
+HIT_BLOCK_LINES = 50
+# Maps ASCII whitespace (what bytes.split() splits on) to b" " and every other byte to
+# b"x": a word then ends wherever b"x " occurs, which bytes.count finds without
+# materialising the words.
+_WORD_MARKS = bytes(0x20 if byte in b" \t\n\r\x0b\x0c" else 0x78 for byte in range(256))
+
+
+@dataclass(frozen=True, slots=True)
+class ScanHit:
+    start: int
+    end: int
+    line: int
+    keyword: str
+    snippet: str
+
+
+@dataclass(frozen=True, slots=True)
+class ScanWindow:
+    index: int
+    start: int
+    end: int
+    lines: int
+    words: int
+    hits: list[ScanHit]
+
+
+class _HitBudget:
+    """Hits kept so far in the current block of lines; carried from window to window."""
+
+    __slots__ = ("_limit", "_block_lines", "_block", "_count")
+
+    def __init__(self, limit: int | None, block_lines: int) -> None:
+        self._limit = limit
+        self._block_lines = block_lines
+        self._block = -1
+        self._count = 0
+
+    def take(self, line: int) -> bool:
+        """Count a hit on ``line``; False if its block is already full."""
+        if self._limit is None:
+            return True
+        block = (line - 1) // self._block_lines
+        if block != self._block:
+            self._block, self._count = block, 0
+        if self._count >= self._limit:
+            return False
+        self._count += 1
+        return True
+
+
+class DocumentScanner:
+    """
+    Keyword scan of a file through one read-only memory map.
+
+    The file is searched in fixed-size byte windows. Each window is read together with
+    ``longest keyword - 1`` bytes of the next one, so a match crossing the boundary is
+    found once, by the window it starts in. Line numbers come from counting newlines
+    between consecutive matches and per window, so no per-line work is done. Offsets are
+    byte offsets; snippets and keywords are decoded as UTF-8, ignoring broken sequences
+    at the snippet edges. At most ``max_hits_per_block`` hits are kept per
+    ``block_lines`` lines (no cap if None); the rest are skipped.
+    """
+
+    def __init__(
+        self,
+        keywords: Iterable[str],
+        *,
+        window_bytes: int = WINDOW_BYTES,
+        snippet_radius: int = SNIPPET_RADIUS,
+        max_hits_per_block: int | None = MAX_HITS_PER_BLOCK,
+        block_lines: int = HIT_BLOCK_LINES,
+    ) -> None:
+        keywords = [keyword for keyword in keywords if keyword]
+        if not keywords:
+            raise ValueError("keywords are required")
+        self._options: dict[str, Any] = {
+            "keywords": keywords,
+            "window_bytes": window_bytes,
+            "snippet_radius": snippet_radius,
+            "max_hits_per_block": max_hits_per_block,
+            "block_lines": block_lines,
+        }
+        self._matcher = build_matcher(keywords, binary=True)
+        self._overlap = max(len(keyword.encode("utf-8")) for keyword in keywords) - 1
+        self._window_bytes = window_bytes
+        self._snippet_radius = snippet_radius
+        self._max_hits = max_hits_per_block
+        self._block_lines = block_lines
+        self.indexable = all(is_indexable(keyword) for keyword in keywords)
+
+    def scan(
+        self,
+        path: str | os.PathLike[str],
+        start: int = 0,
+        stop: int | None = None,
+        first_line: int = 1,
+    ) -> Iterator[ScanWindow]:
+        """
+        Windows covering matches that start in ``[start, stop)``; ``first_line`` is the
+        line number of ``start``.
+        """
+        with open(path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            stop = size if stop is None else min(stop, size)
+            if start >= stop:
+                return
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                yield from self._scan(view, size, start, stop, first_line)
+
+    def scan_parallel(
+        self,
+        path: str | os.PathLike[str],
+        processes: int,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> Iterator[ScanWindow]:
+        """
+        Scan line-aligned byte ranges of ``path`` in a process pool.
+
+        Yields one window per range, in document order and with document-wide line
+        numbers, as soon as the range and all ranges before it are done. The hit cap
+        counts line blocks from the start of each range.
+        ``on_progress`` receives the bytes scanned so far each time a range finishes,
+        in completion order.
+        """
+        ranges = line_aligned_ranges(path, processes)
+        if len(ranges) <= 1:
+            yield from self.scan(path)
+            return
+        # billiard, unlike multiprocessing, may fork from the daemonic children of
+        # Celery's prefork pool.
+        with Pool(processes=len(ranges)) as pool:
+            spans = [(index, start, stop) for index, (start, stop) in enumerate(ranges)]
+            finished: dict[int, ScanWindow] = {}
+            next_index, line_offset, scanned = 0, 0, 0
+            for window in pool.imap_unordered(
+                partial(_scan_range, self._options, os.fspath(path)), spans
+            ):
+                finished[window.index] = window
+                scanned += window.end - window.start
+                if on_progress is not None:
+                    on_progress(scanned)
+                while next_index in finished:
+                    window = finished.pop(next_index)
+                    hits = [replace(hit, line=hit.line + line_offset) for hit in window.hits]
+                    yield replace(window, hits=hits)
+                    line_offset += window.lines
+                    next_index += 1
+
+    def scan_stream(self, blocks: Iterable[bytes]) -> Iterator[ScanWindow]:
+        """
+        Windows of a document arriving as ``blocks`` (e.g. an HTTP body), each scanned as
+        soon as it and the bytes its boundary matches and snippets reach into have
+        arrived. The windows equal those of ``scan`` over the complete file.
+        """
+        view = _StreamView()
+        budget = self._budget()
+        lookahead = self._overlap + self._snippet_radius + 1
+        index, line, start, resume = 0, 1, 0, 0
+        for block in blocks:
+            view.append(block)
+            while view.end >= start + self._window_bytes + lookahead:
+                end = start + self._window_bytes
+                window, resume = self._scan_window(
+                    view, view.end, index, start, end, line, resume, budget
+                )
+                yield window
+                index, line, start = index + 1, line + window.lines, end
+                view.discard(start - self._snippet_radius)
+        while start < view.end:
+            end = min(start + self._window_bytes, view.end)
+            window, resume = self._scan_window(
+                view, view.end, index, start, end, line, resume, budget
+            )
+            yield window
+            index, line, start = index + 1, line + window.lines, end
+
+    def scan_indexed(
+        self, path: str | os.PathLike[str], index: InvertedIndex
+    ) -> Iterator[ScanWindow]:
+        """
+        The windows of ``scan(path)`` answered from ``index`` of the same content, with
+        the matcher run over the index vocabulary instead of the document. Requires
+        ``indexable`` keywords. Hits and lines are those of ``scan``; the document's word
+        count is reported on the last window.
+        """
+        # Grouped by the window they start in, then in the matcher's order within it.
+        matches = sorted(
+            index.find(self._matcher),
+            key=lambda match: (match[0] // self._window_bytes, match[1], match[0]),
+        )
+        with open(path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size == 0:
+                return
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                budget = self._budget()
+                cursor = 0
+                for number, window_start in enumerate(range(0, size, self._window_bytes)):
+                    window_end = min(window_start + self._window_bytes, size)
+                    hits: list[ScanHit] = []
+                    while cursor < len(matches) and matches[cursor][0] < window_end:
+                        start, end = matches[cursor]
+                        cursor += 1
+                        line = index.line(start)
+                        if budget.take(line):
+                            match = KeywordMatch(start, end, view[start:end])
+                            hits.append(self._hit(view, size, 0, match, line))
+                    lines = index.newlines(window_start, window_end)
+                    words = index.words if window_end == size else 0
+                    yield ScanWindow(number, window_start, window_end, lines, words, hits)
+
+    def _scan(
+        self, view: mmap.mmap, size: int, start: int, stop: int, first_line: int
+    ) -> Iterator[ScanWindow]:
+        line = first_line
+        resume = start
+        budget = self._budget()
+        for index, window_start in enumerate(range(start, stop, self._window_bytes)):
+            window_end = min(window_start + self._window_bytes, stop)
+            window, resume = self._scan_window(
+                view, size, index, window_start, window_end, line, resume, budget
+            )
+            yield window
+            line += window.lines
+
+    def _scan_window(
+        self,
+        view: mmap.mmap | _StreamView,
+        size: int,
+        index: int,
+        window_start: int,
+        window_end: int,
+        line: int,
+        resume: int,
+        budget: _HitBudget,
+    ) -> tuple[ScanWindow, int]:
+        """Window ``[window_start, window_end)`` and the offset the next one resumes at."""
+        data = view[window_start : min(window_end + self._overlap, size)]
+        owned = window_end - window_start
+        hits: list[ScanHit] = []
+        cursor, cursor_line = 0, line
+        for match in self._matcher.finditer(data, max(resume - window_start, 0)):
+            if match.start >= owned:
+                continue
+            if match.start >= cursor:
+                cursor_line += data.count(b"\n", cursor, match.start)
+                cursor = match.start
+                match_line = cursor_line
+            else:
+                match_line = cursor_line - data.count(b"\n", match.start, cursor)
+            if budget.take(match_line):
+                hits.append(self._hit(view, size, window_start, match, match_line))
+            if not self._matcher.overlapping:
+                resume = window_start + match.end
+        lines = data.count(b"\n", 0, owned)
+        words = self._count_words(data, owned, view[window_end : window_end + 1])
+        return ScanWindow(index, window_start, window_end, lines, words, hits), resume
+
+    def _budget(self) -> _HitBudget:
+        return _HitBudget(self._max_hits, self._block_lines)
+
+    @staticmethod
+    def _count_words(data: bytes, owned: int, next_byte: bytes) -> int:
+        """Words ending in ``data[:owned]``; ``next_byte`` follows it in the file."""
+        marks = data.translate(_WORD_MARKS)
+        words = marks.count(b"x ", 0, owned)
+        if marks[owned - 1 : owned] == b"x" and next_byte.translate(_WORD_MARKS) != b"x":
+            words += 1
+        return words
+
+    def _hit(
+        self, view: mmap.mmap | _StreamView, size: int, base: int, match: KeywordMatch, line: int
+    ) -> ScanHit:
+        start, end = base + match.start, base + match.end
+        snippet = view[max(start - self._snippet_radius, 0) : min(end + self._snippet_radius, size)]
+        return ScanHit(
+            start=start,
+            end=end,
+            line=line,
+            keyword=match.text.decode("utf-8", errors="ignore"),
+            snippet=snippet.decode("utf-8", errors="ignore"),
+        )
+
+
+class _StreamView:
+    """Sliding buffer of a streamed document, sliced by document offsets like an mmap."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._base = 0
+
+    @property
+    def end(self) -> int:
+        return self._base + len(self._buffer)
+
+    def append(self, block: bytes) -> None:
+        self._buffer += block
+
+    def discard(self, before: int) -> None:
+        """Drop the bytes before offset ``before``; later slices must start after it."""
+        drop = before - self._base
+        if drop > 0:
+            del self._buffer[:drop]
+            self._base += drop
+
+    def __getitem__(self, index: slice) -> bytes:
+        return bytes(self._buffer[index.start - self._base : index.stop - self._base])
+
+
+def line_aligned_ranges(path: str | os.PathLike[str], parts: int) -> list[tuple[int, int]]:
+    """Split ``path`` into at most ``parts`` byte ranges that each start at a line start."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    step = -(-size // max(parts, 1))
+    cuts = [0]
+    with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        for target in range(step, size, step):
+            newline = view.find(b"\n", max(target - 1, cuts[-1]))
+            if newline == -1 or newline + 1 >= size:
+                break
+            if newline + 1 > cuts[-1]:
+                cuts.append(newline + 1)
+    cuts.append(size)
+    return list(zip(cuts, cuts[1:]))
+
+
+def _scan_range(options: dict[str, Any], path: str, span: tuple[int, int, int]) -> ScanWindow:
+    """Process-pool entry point: one range folded into a single window, lines from 1."""
+    index, start, stop = span
+    hits: list[ScanHit] = []
+    lines = words = 0
+    for window in DocumentScanner(**options).scan(path, start, stop):
+        hits.extend(window.hits)
+        lines += window.lines
+        words += window.words
+    return ScanWindow(index, start, stop, lines, words, hits)
@@ -1,39 +1,58 @@
-import random
 import time
-
-from mpmath import mp
+from collections.abc import Iterator
+from itertools import chain
 
 from src.app.infrastructure.celery.app import celery_app
 from src.app.domain.models.task_progress import TaskProgress
 from src.app.domain.models.task_state import TaskState
 from src.app.domain.models.task_status import TaskStatus
+from src.app.worker.pacing import Pacer
+from src.app.worker.pi_store import PiDigitStore
 from src.app.worker.reporter import TaskReporter
 from src.setup.worker_config import get_worker_settings
 
 _settings = get_worker_settings()
+_pi_store = PiDigitStore(
+    _settings.PI_STORE_PATH,
+    min_digits=_settings.MAX_DIGITS,
+    processes=_settings.PI_ENGINE_PROCESSES,
+)
 
 
 def get_pi(digits: int) -> str:
-    mp.dps = digits
-    return str(mp.pi)
+    return _pi_store.pi(digits, rounding=_settings.ROUNDING_POLICY)
+
+
+def stream_pi(digits: int) -> Iterator[str]:
+    """Characters of ``get_pi(digits)``, available before the whole expansion is computed."""
+    return chain.from_iterable(_pi_store.iter_pi(digits, rounding=_settings.ROUNDING_POLICY))
 
 
 @celery_app.task(name="compute_pi", bind=True)
 def compute_pi(self, payload: dict) -> dict:
     """
     Pi computation task.
-    Simulates heavy pi calculation.
+    Streams the digits one by one, paced per ``PACING_MODE`` or the task's override,
+    and stops with a CANCELLED status when cancellation is requested.
     """
     reporter = TaskReporter(self.request.id)
     payload_data = payload["payload"]
     digits: int = payload_data["digits"]
-    pi: str = get_pi(digits)
+    pacer = Pacer.for_task(
+        payload,
+        default_mode=_settings.PACING_MODE,
+        default_delay=_settings.SLEEP_PER_DIGIT_SEC,
+    )
 
-    total = len(pi)
+    total = digits + 1 if digits > 1 else 1
+    emitted: list[str] = []
     start_time = time.monotonic()
+    cancelled = False
     with reporter.report_result_chunk(batch_size=1) as chunks:
-        for k, digit in enumerate(pi):
-            sleep_time = random.uniform(0.005, 1.5)
+        for k, digit in enumerate(stream_pi(digits)):
+            if reporter.cancel_requested():
+                cancelled = True
+                break
             done = k + 1
             progress = done / total if total else 1.0
             remaining = total - done
@@ -51,7 +70,17 @@ def compute_pi(self, payload: dict) -> dict:
             )
             reporter.report_status(status)
             chunks.emit(digit)
-            time.sleep(sleep_time)
+            emitted.append(digit)
+            pacer.pause()
+
+    if cancelled:
+        sent = len(emitted)
+        reporter.report_cancelled(
+            TaskProgress(current=sent, total=total, percentage=sent / total if total else 0.0),
+            metrics={"eta_seconds": 0.0, "digits_sent": sent, "digits_total": total},
+        )
+        return {"cancelled": True, "digits_sent": sent}
 
+    pi = "".join(emitted)
     reporter.report_result({"task_id": self.request.id, "data": pi})
     return {"result": pi}
@@ -1,26 +1,53 @@
-import itertools
+import base64
 import os
-import random
+import queue
+import sys
+import threading
 import time
-import bisect
-import re
 import logging
-import urllib.request
-from urllib.parse import urlparse
+from array import array
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Any
 
+from src.app.domain.models.payloads import DocumentSource, SnippetMode
 from src.app.domain.models.task_progress import TaskProgress
 from src.app.domain.models.task_state import TaskState
 from src.app.domain.models.task_status import TaskStatus
 from src.app.infrastructure.celery.app import celery_app
-from src.app.worker.reporter import TaskReporter
+from src.app.worker.download_cache import Download, DownloadCache
+from src.app.worker.inverted_index import DocumentIndexStore
+from src.app.worker.pacing import Pacer
+from src.app.worker.reporter import ResultChunkReporter, TaskReporter
+from src.app.worker.scanning import DocumentScanner, ScanHit, ScanWindow
+from src.setup.worker_config import get_worker_settings
 
-MIN_LINES_PER_CHUNK = 50
-MAX_LINES_PER_CHUNK = 300
 SNIPPET_RADIUS = 30
 MAX_SNIPPETS_PER_CHUNK = 2000
-DEFAULT_DOWNLOAD_DIR = "/data/books"
+# Snippets are capped at MAX_SNIPPETS_PER_CHUNK per this many lines, the smallest line
+# chunk the line-by-line scan used to cap them in.
+MIN_LINES_PER_CHUNK = 50
+# Snippets are sent in columnar chunks per window, or after this long when paced. Status
+# is reported once per window; chunks carry a progress watermark for the time between.
+SNIPPET_FLUSH_SECONDS = 0.5
+# Scanned windows waiting for the emitting thread; scanners block beyond this.
+MAX_PENDING_WINDOWS = 64
+# Download progress is reported each time this many more bytes have arrived.
+DOWNLOAD_PROGRESS_BYTES = 1024 * 1024
+# Longest wait for a scanner event before checking for cancellation again.
+EVENT_POLL_SECONDS = 0.5
 
 logger = logging.getLogger(__name__)
+_settings = get_worker_settings()
+_download_cache = DownloadCache(
+    _settings.DOWNLOAD_CACHE_DIR,
+    _settings.DOWNLOAD_CACHE_MAX_BYTES,
+    revalidate_after=_settings.DOWNLOAD_CACHE_REVALIDATE_SEC,
+)
+_index_store = DocumentIndexStore(
+    _settings.DOC_INDEX_DIR, _settings.DOC_INDEX_CACHE_MAX_BYTES
+)
 
 
 def _eta_seconds(start_time: float, processed_bytes: int, total_bytes: int) -> float:
@@ -33,52 +60,53 @@ def _eta_seconds(start_time: float, processed_bytes: int, total_bytes: int) -> f
 
 
 def _emit_snippet(
-    chunks: TaskReporter,
+    chunks: ResultChunkReporter,
     *,
-    match: re.Match[str],
-    chunk_text: str,
-    line_offsets: list[int],
-    line_number: int,
+    hit: ScanHit,
     chunk_index: int,
     document_path: str,
 ) -> None:
-    pos = match.start()
-    snippet_start = max(pos - SNIPPET_RADIUS, 0)
-    snippet_end = min(pos + len(match.group(0)) + SNIPPET_RADIUS, len(chunk_text))
-    snippet = chunk_text[snippet_start:snippet_end]
-    line_offset = bisect.bisect_right(line_offsets, pos) - 1
-    snippet_line = line_number + line_offset
     chunks.emit(
         {
             "type": "snippet_found",
-            "keyword": match.group(0),
-            "snippet": snippet,
+            "keyword": hit.keyword,
+            "snippet": hit.snippet,
             "location": {
                 "chunk_index": chunk_index,
-                "line": snippet_line,
+                "line": hit.line,
             },
             "file": document_path,
         }
     )
 
 
-def _resolve_document_path(document_path: str | None, document_url: str | None) -> str | None:
-    if document_url:
-        parsed = urlparse(document_url)
-        filename = os.path.basename(parsed.path) or "document.txt"
-        return os.path.join(DEFAULT_DOWNLOAD_DIR, filename)
-    return document_path
-
-
-def _ensure_document(document_path: str, document_url: str | None) -> None:
-    if not document_url:
-        return
-    if os.path.exists(document_path):
-        return
-    directory = os.path.dirname(document_path)
-    if directory:
-        os.makedirs(directory, exist_ok=True)
-    urllib.request.urlretrieve(document_url, document_path)
+def _emit_snippet_offsets(
+    chunks: ResultChunkReporter,
+    *,
+    window: ScanWindow,
+    keyword_ids: dict[str, int],
+    document_index: int,
+    document_path: str,
+) -> None:
+    """
+    One item for all hits of ``window``: little-endian uint64 ``(keyword_id, byte_offset,
+    line)`` triples, base64-encoded. ``keyword_id`` indexes the payload's ``keywords``.
+    """
+    packed = array("Q")
+    for hit in window.hits:
+        packed.extend((keyword_ids[hit.keyword.casefold()], hit.start, hit.line))
+    if sys.byteorder == "big":
+        packed.byteswap()
+    chunks.emit(
+        {
+            "type": "snippet_offsets",
+            "file": document_path,
+            "document": document_index,
+            "chunk_index": window.index,
+            "count": len(window.hits),
+            "hits": base64.b64encode(packed.tobytes()).decode("ascii"),
+        }
+    )
 
 
 def _report_failed(reporter: TaskReporter, message: str) -> dict:
@@ -93,132 +121,412 @@ def _report_failed(reporter: TaskReporter, message: str) -> dict:
     return {"error": message}
 
 
+class _DocumentProgress:
+    """Per-document byte progress folded into one task-level ``TaskStatus``."""
+
+    def __init__(self, documents: int) -> None:
+        self.documents = documents
+        self.sizes: dict[int, int] = {}
+        self.scanned: dict[int, int] = {}
+        # Bytes received per document still being downloaded.
+        self.downloading: dict[int, int] = {}
+        self.downloaded = 0
+        self.done = 0
+        self.failed = 0
+        self._percentage = 0.0
+
+    @property
+    def bytes_read(self) -> int:
+        return sum(self.scanned.values())
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self.sizes.values())
+
+    @property
+    def phase(self) -> str:
+        return "downloading" if self.downloading else "scanning"
+
+    @property
+    def percentage(self) -> float:
+        # Documents not started yet count as 0%; sizes of bodies streamed without a
+        # Content-Length grow as they arrive, so the value is kept from going backwards.
+        finished = float(self.failed)
+        for index, size in self.sizes.items():
+            if size:
+                finished += self.scanned.get(index, 0) / size
+            elif index not in self.downloading:
+                finished += 1.0
+        percentage = finished / self.documents if self.documents else 1.0
+        self._percentage = max(self._percentage, min(percentage, 1.0))
+        return self._percentage
+
+    def snapshot(self) -> TaskProgress:
+        return TaskProgress(
+            current=self.bytes_read,
+            total=self.total_bytes,
+            percentage=self.percentage,
+            phase=self.phase,
+        )
+
+    def advance(self, index: int, position: int) -> None:
+        self.scanned[index] = max(self.scanned.get(index, 0), position)
+
+    def receive(self, index: int, received: int, complete: bool) -> None:
+        self.downloaded += received - self.downloading.pop(index, 0)
+        self.sizes[index] = max(self.sizes.get(index, 0), received)
+        if not complete:
+            self.downloading[index] = received
+
+
 def _report_running_status(
     reporter: TaskReporter,
+    progress: _DocumentProgress,
     *,
-    bytes_read: int,
-    total_bytes: int,
     snippets_emitted: int,
     words_processed: int,
     start_time: float,
 ) -> None:
-    progress = bytes_read / total_bytes if total_bytes else 1.0
-    eta = _eta_seconds(start_time, bytes_read, total_bytes)
+    snapshot = progress.snapshot()
     reporter.report_status(
         TaskStatus(
             state=TaskState.RUNNING,
-            progress=TaskProgress(
-                current=bytes_read,
-                total=total_bytes,
-                percentage=progress,
-            ),
+            progress=snapshot,
             metrics={
-                "eta_seconds": eta,
+                "eta_seconds": _eta_seconds(start_time, snapshot.current, snapshot.total),
                 "snippets_emitted": snippets_emitted,
                 "words_processed": words_processed,
+                "bytes_downloaded": progress.downloaded,
+                "documents_total": progress.documents,
+                "documents_done": progress.done,
+                "documents_failed": progress.failed,
             },
         )
     )
 
 
+def _document_sources(payload_data: dict[str, Any]) -> list[DocumentSource]:
+    sources = [DocumentSource.model_validate(doc) for doc in payload_data.get("documents") or []]
+    single = DocumentSource(
+        document_path=payload_data.get("document_path"),
+        document_url=payload_data.get("document_url"),
+    )
+    if single.document_path or single.document_url:
+        sources.insert(0, single)
+    return sources
+
+
+def _put(events: queue.Queue, stop: threading.Event, event: tuple) -> bool:
+    """Queue ``event`` unless the emitting thread has given up; True if queued."""
+    while not stop.is_set():
+        try:
+            events.put(event, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _indexed_windows(
+    scanner: DocumentScanner, document_path: str, digest: str | None
+) -> Iterator[ScanWindow]:
+    with _index_store.open(document_path, digest) as index:
+        yield from scanner.scan_indexed(document_path, index)
+
+
+def _scan_file(
+    index: int,
+    document_path: str,
+    scanner: DocumentScanner,
+    events: queue.Queue,
+    stop: threading.Event,
+    processes: int,
+    digest: str | None = None,
+) -> bool:
+    """
+    Scan a local document; False if the emitting thread gave up. ``digest`` is the
+    document's SHA-256 when already known.
+    """
+    if not os.path.exists(document_path):
+        raise ValueError(f"document_path not found: {document_path}")
+    size = os.path.getsize(document_path)
+    if not _put(events, stop, ("started", index, (document_path, size))):
+        return False
+    if processes > 1 and size >= _settings.DOC_SCAN_PARALLEL_MIN_BYTES:
+        windows = scanner.scan_parallel(
+            document_path,
+            processes,
+            on_progress=lambda done: _put(events, stop, ("scanned", index, done)),
+        )
+    elif scanner.indexable and 0 < size <= _settings.DOC_INDEX_MAX_BYTES:
+        windows = _indexed_windows(scanner, document_path, digest)
+    else:
+        windows = scanner.scan(document_path)
+    return all(_put(events, stop, ("window", index, window)) for window in windows)
+
+
+def _scan_download(
+    index: int,
+    download: Download,
+    scanner: DocumentScanner,
+    events: queue.Queue,
+    stop: threading.Event,
+) -> bool:
+    """Scan a response body while it downloads into the cache."""
+    if not _put(events, stop, ("downloaded", index, (0, False))):
+        return False
+    if not _put(events, stop, ("started", index, (os.fspath(download.path), download.size or 0))):
+        return False
+
+    def _received() -> Iterator[bytes]:
+        received = reported = 0
+        try:
+            for block in download.blocks:
+                received += len(block)
+                if received - reported >= DOWNLOAD_PROGRESS_BYTES:
+                    _put(events, stop, ("downloaded", index, (received, False)))
+                    reported = received
+                yield block
+        except (OSError, ValueError) as exc:
+            raise ValueError(f"failed to download document: {exc}") from exc
+        _put(events, stop, ("downloaded", index, (received, True)))
+
+    return all(
+        _put(events, stop, ("window", index, window))
+        for window in scanner.scan_stream(_received())
+    )
+
+
+def _scan_document(
+    index: int,
+    source: DocumentSource,
+    scanner: DocumentScanner,
+    events: queue.Queue,
+    stop: threading.Event,
+    processes: int,
+) -> None:
+    """
+    Scan one document, handing its windows to the emitting thread. URLs not in the
+    download cache are scanned as their body arrives instead of after the download.
+    """
+    if stop.is_set():
+        return
+    try:
+        if source.document_url:
+            with ExitStack() as stack:
+                try:
+                    download = stack.enter_context(_download_cache.open(source.document_url))
+                except (OSError, ValueError) as exc:
+                    raise ValueError(f"failed to download document: {exc}") from exc
+                if download.blocks is None:
+                    scanned = _scan_file(
+                        index,
+                        os.fspath(download.path),
+                        scanner,
+                        events,
+                        stop,
+                        processes,
+                        download.sha256,
+                    )
+                else:
+                    scanned = _scan_download(index, download, scanner, events, stop)
+        elif source.document_path:
+            scanned = _scan_file(index, source.document_path, scanner, events, stop, processes)
+        else:
+            raise ValueError("document_path or document_url is required")
+    except Exception as exc:
+        _put(events, stop, ("failed", index, str(exc)))
+    else:
+        if scanned:
+            _put(events, stop, ("done", index, None))
+
+
 @celery_app.task(name="document_analysis", bind=True)
 def document_analysis(self, payload: dict) -> dict:
+    """
+    Scan one or more documents for keywords.
+
+    Documents are downloaded and scanned by up to ``DOC_ANALYSIS_MAX_CONCURRENT_DOCUMENTS``
+    threads sharing one compiled matcher; this thread emits their snippets (tagged with
+    ``file``) and folds per-document progress into a single status. The task fails only
+    when every document fails; a cancellation request stops the scanners and ends it
+    with a CANCELLED status.
+    """
     reporter = TaskReporter(self.request.id)
     payload_data = payload.get("payload") or {}
-    document_path = payload_data.get("document_path")
-    document_url = payload_data.get("document_url")
     keywords = payload_data.get("keywords") or []
+    pacer = Pacer.for_task(
+        payload,
+        default_mode=_settings.PACING_MODE,
+        default_delay=_settings.SLEEP_PER_SNIPPET_SEC,
+    )
 
-    document_path = _resolve_document_path(document_path, document_url)
-
-    if not document_path:
+    sources = _document_sources(payload_data)
+    if not sources:
         return _report_failed(reporter, "document_path or document_url is required")
 
     if not keywords:
         return _report_failed(reporter, "keywords are required")
 
-    try:
-        _ensure_document(document_path, document_url)
-    except Exception as exc:
-        return _report_failed(reporter, f"failed to download document: {exc}")
-
-    if not os.path.exists(document_path):
-        return _report_failed(reporter, f"document_path not found: {document_path}")
+    compact = payload_data.get("snippet_mode") == SnippetMode.COMPACT.value
+    keyword_ids: dict[str, int] = {}
+    for keyword_id, keyword in enumerate(keywords):
+        keyword_ids.setdefault(keyword.casefold(), keyword_id)
 
-    total_bytes = os.path.getsize(document_path)
-    pattern = re.compile("|".join(re.escape(keyword) for keyword in keywords), re.IGNORECASE)
+    scanner = DocumentScanner(
+        keywords,
+        snippet_radius=SNIPPET_RADIUS,
+        max_hits_per_block=MAX_SNIPPETS_PER_CHUNK,
+        block_lines=MIN_LINES_PER_CHUNK,
+    )
+    # Process-pool range scans only for a lone document; concurrent documents already
+    # keep the cores busy.
+    processes = _settings.DOC_SCAN_PROCESSES if len(sources) == 1 else 1
+    progress = _DocumentProgress(len(sources))
+    paths: dict[int, str] = {}
+    errors: list[str] = []
     start_time = time.monotonic()
     total_snippets_emitted = 0
     words_processed = 0
-    chunk_index = 0
-    line_number = 1
+    chunks_scanned = 0
+    cancelled = False
 
     reporter.report_status(
         TaskStatus(
             state=TaskState.RUNNING,
-            progress=TaskProgress(current=0, total=total_bytes, percentage=0.0),
+            progress=TaskProgress(current=0, total=0, percentage=0.0),
             message="started",
             metrics={
                 "eta_seconds": 0.0,
                 "snippets_emitted": 0,
                 "words_processed": 0,
+                "bytes_downloaded": 0,
+                "documents_total": len(sources),
+                "documents_done": 0,
+                "documents_failed": 0,
             },
         )
     )
 
-    with reporter.report_result_chunk(batch_size=1) as chunks:
-        with open(document_path, "rb") as handle:
-            while True:
-                lines_to_read = random.randint(MIN_LINES_PER_CHUNK, MAX_LINES_PER_CHUNK)
-                lines = list(itertools.islice(handle, lines_to_read))
-                if not lines:
-                    break
-
-                text_lines = [line.decode("utf-8", errors="ignore") for line in lines]
-                chunk_text = "".join(text_lines)
-                line_offsets = list(
-                    itertools.accumulate((len(line) for line in text_lines), initial=0)
-                )
-                words_processed += len(chunk_text.split())
+    def _report() -> None:
+        _report_running_status(
+            reporter,
+            progress,
+            snippets_emitted=total_snippets_emitted,
+            words_processed=words_processed,
+            start_time=start_time,
+        )
 
-                snippets_emitted = 0
-                for match in pattern.finditer(chunk_text):
-                    if snippets_emitted >= MAX_SNIPPETS_PER_CHUNK:
+    events: queue.Queue = queue.Queue(maxsize=MAX_PENDING_WINDOWS)
+    stop = threading.Event()
+    workers = min(_settings.DOC_ANALYSIS_MAX_CONCURRENT_DOCUMENTS, len(sources))
+    # Not a ``with`` block: leaving one would wait for every scanner, keeping a cancelled
+    # or failed task in its worker slot until the scans in progress finish.
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="doc-scan")
+    with reporter.report_result_chunk(
+        batch_size=MAX_SNIPPETS_PER_CHUNK,
+        columnar=True,
+        header=("type", "file", "document"),
+        dictionary=("keyword",),
+        flush_interval=SNIPPET_FLUSH_SECONDS,
+        progress=progress.snapshot,
+    ) as chunks:
+        try:
+            for index, source in enumerate(sources):
+                executor.submit(_scan_document, index, source, scanner, events, stop, processes)
+            finished = 0
+            while finished < len(sources):
+                if reporter.cancel_requested():
+                    cancelled = True
+                    break
+                try:
+                    kind, index, value = events.get(timeout=EVENT_POLL_SECONDS)
+                except queue.Empty:
+                    continue
+                if kind == "started":
+                    paths[index], progress.sizes[index] = value
+                elif kind == "scanned":
+                    progress.advance(index, value)
+                elif kind == "downloaded":
+                    progress.receive(index, *value)
+                elif kind == "window" and compact:
+                    words_processed += value.words
+                    if value.hits:
+                        _emit_snippet_offsets(
+                            chunks,
+                            window=value,
+                            keyword_ids=keyword_ids,
+                            document_index=index,
+                            document_path=paths[index],
+                        )
+                        chunks.flush()
+                        total_snippets_emitted += len(value.hits)
+                        pacer.pause()
+                    progress.advance(index, value.end)
+                    chunks_scanned += 1
+                elif kind == "window":
+                    words_processed += value.words
+                    for hit in value.hits:
+                        if reporter.cancel_requested():
+                            cancelled = True
+                            break
+                        _emit_snippet(
+                            chunks,
+                            hit=hit,
+                            chunk_index=value.index,
+                            document_path=paths[index],
+                        )
+                        total_snippets_emitted += 1
+                        pacer.pause()
+                        progress.advance(index, hit.end)
+                    chunks.flush()
+                    if cancelled:
                         break
-                    _emit_snippet(
-                        chunks,
-                        match=match,
-                        chunk_text=chunk_text,
-                        line_offsets=line_offsets,
-                        line_number=line_number,
-                        chunk_index=chunk_index,
-                        document_path=document_path,
-                    )
-                    snippets_emitted += 1
-                    total_snippets_emitted += 1
-                    time.sleep(random.uniform(0.1, 0.5))  # Simulate processing delay
-                    _report_running_status(
-                        reporter,
-                        bytes_read=handle.tell(),
-                        total_bytes=total_bytes,
-                        snippets_emitted=total_snippets_emitted,
-                        words_processed=words_processed,
-                        start_time=start_time,
-                    )
+                    progress.advance(index, value.end)
+                    chunks_scanned += 1
+                elif kind == "failed":
+                    logger.error("Document %d failed: %s", index, value)
+                    errors.append(value)
+                    progress.failed += 1
+                    progress.sizes.pop(index, None)
+                    progress.scanned.pop(index, None)
+                    progress.downloading.pop(index, None)
+                    finished += 1
+                else:
+                    progress.done += 1
+                    finished += 1
+                _report()
+        finally:
+            # Unblocks scanners waiting on a full queue if emitting failed or was
+            # cancelled, and drops documents not started yet; scanners still running
+            # stop at their next window without being waited for.
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
 
-                if snippets_emitted == 0:
-                    _report_running_status(
-                        reporter,
-                        bytes_read=handle.tell(),
-                        total_bytes=total_bytes,
-                        snippets_emitted=total_snippets_emitted,
-                        words_processed=words_processed,
-                        start_time=start_time,
-                    )
+    if cancelled:
+        snapshot = progress.snapshot()
+        reporter.report_cancelled(
+            snapshot,
+            metrics={
+                "eta_seconds": 0.0,
+                "snippets_emitted": total_snippets_emitted,
+                "words_processed": words_processed,
+                "bytes_downloaded": progress.downloaded,
+                "documents_total": len(sources),
+                "documents_done": progress.done,
+                "documents_failed": progress.failed,
+            },
+        )
+        return {
+            "cancelled": True,
+            "chunks_scanned": chunks_scanned,
+            "snippets_emitted": total_snippets_emitted,
+        }
 
-                chunk_index += 1
-                line_number += len(lines)
+    if progress.failed == len(sources):
+        return _report_failed(reporter, errors[0] if len(errors) == 1 else "; ".join(errors))
 
+    total_bytes = progress.total_bytes
     reporter.report_status(
         TaskStatus(
             state=TaskState.COMPLETED,
@@ -228,14 +536,19 @@ def document_analysis(self, payload: dict) -> dict:
                 "eta_seconds": 0.0,
                 "snippets_emitted": total_snippets_emitted,
                 "words_processed": words_processed,
+                "bytes_downloaded": progress.downloaded,
+                "documents_total": len(sources),
+                "documents_done": progress.done,
+                "documents_failed": progress.failed,
             },
         )
     )
     reporter.report_result(
         {
             "task_id": self.request.id,
-            "chunks_scanned": chunk_index,
+            "chunks_scanned": chunks_scanned,
             "snippets_emitted": total_snippets_emitted,
+            "documents_failed": errors,
         }
     )
-    return {"chunks_scanned": chunk_index, "snippets_emitted": total_snippets_emitted}
+    return {"chunks_scanned": chunks_scanned, "snippets_emitted": total_snippets_emitted}
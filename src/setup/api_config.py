@@ -7,5 +7,20 @@ class ApiSettings(BaseSettings):
     MAX_DIGITS: int = 2000
     APP_NAME: str = "posttager-pi"
     APP_VERSION: str = "0.1.0"
+    LONG_POLL_MAX_WAIT_MS: int = 30000
+    MAX_BATCH_STATUS_IDS: int = 500
+    MAX_BATCH_TASKS: int = 5000
+    # Reuse of identical submissions. Only compute_pi is deduplicated; every
+    # document_analysis submission runs, since its snippets cannot be replayed.
+    DEDUP_ENABLED: bool = True
+    DEDUP_RESULT_TTL_SECONDS: int = 3600
+    # Shared with the worker: where downloaded documents are cached, read for snippet context.
+    DOWNLOAD_CACHE_DIR: str = "/data/books"
+    # Snippet context is only served for document_path sources under this directory.
+    DOCUMENTS_DIR: str = "/data"
+    # Tasks one multiplexed WebSocket session (/ws/tasks) may subscribe to.
+    MAX_WS_SUBSCRIPTIONS: int = 1000
+    MAX_SNIPPET_CONTEXTS: int = 1000
+    MAX_SNIPPET_CONTEXT_RADIUS: int = 1000
 
     model_config = ConfigDict(env_file=".env", extra="ignore")
@@ -2,18 +2,43 @@ import inject
 
 from src.app.application.broadcaster import TaskStatusBroadcaster
 from src.app.domain.repositories import StorageRepository, TaskManagerRepository
+from src.app.infrastructure.celery.app import celery_app
+from src.app.infrastructure.celery.cancellation import RedisCancellationFlags
+from src.app.infrastructure.celery.publisher import RedisCeleryPublisher
 from src.app.infrastructure.celery.repositories import CeleryTaskManager
 from src.app.infrastructure.postgres.orm import PostgresOrm
 from src.app.infrastructure.postgres.repositories import PostgresStorageRepository
 from src.app.presentation.websockets import WebSocketStatusBroadcaster, connection_manager
+from src.setup.celery_config import CelerySettings, get_celery_settings
 from src.setup.db_config import DatabaseSettings
 
 
+def _build_task_manager(settings: CelerySettings) -> CeleryTaskManager:
+    publisher = None
+    cancellation_flags = None
+    is_redis = settings.REDIS_URL.startswith(("redis://", "rediss://"))
+    if is_redis:
+        cancellation_flags = RedisCancellationFlags.from_url(settings.REDIS_URL)
+    if settings.ENQUEUE_MODE == "redis" and is_redis:
+        publisher = RedisCeleryPublisher.from_url(
+            celery_app,
+            settings.REDIS_URL,
+            max_connections=settings.ENQUEUE_MAX_CONNECTIONS,
+            store_sent_state=settings.TASK_STATE_AUTHORITY == "celery",
+            result_ttl_seconds=settings.RESULT_TTL_SECONDS,
+        )
+    return CeleryTaskManager(
+        publisher=publisher,
+        executor_workers=settings.ENQUEUE_THREADS,
+        cancellation_flags=cancellation_flags,
+    )
+
+
 def _config(binder: inject.Binder) -> None:
     """Bind domain interfaces to concrete implementations."""
     db_settings = DatabaseSettings()
     orm = PostgresOrm(db_settings.DATABASE_URL)
-    binder.bind(TaskManagerRepository, CeleryTaskManager())
+    binder.bind(TaskManagerRepository, _build_task_manager(get_celery_settings()))
     binder.bind(StorageRepository, PostgresStorageRepository(orm))
     binder.bind(TaskStatusBroadcaster, WebSocketStatusBroadcaster(connection_manager))
 
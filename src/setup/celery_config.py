@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import ConfigDict
 from pydantic_settings import BaseSettings
 
@@ -5,6 +7,14 @@ from pydantic_settings import BaseSettings
 class CelerySettings(BaseSettings):
     REDIS_URL: str = "redis://redis:6379/0" 
     RESULT_TTL_SECONDS: int = 3600
+    # "postgres": Postgres plus the event stream own task state and the Celery result
+    # backend is not written at all. "celery": also keep SENT/result meta in Redis.
+    TASK_STATE_AUTHORITY: Literal["postgres", "celery"] = "postgres"
+    # "redis" publishes task messages over the async Redis client,
+    # "thread" falls back to send_task on a bounded executor.
+    ENQUEUE_MODE: Literal["redis", "thread"] = "redis"
+    ENQUEUE_MAX_CONNECTIONS: int = 50
+    ENQUEUE_THREADS: int = 8
 
     model_config = ConfigDict(env_file=".env", extra="ignore")
 
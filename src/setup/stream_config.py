@@ -5,7 +5,8 @@ from pydantic_settings import BaseSettings
 
 from src.app.application.handlers import TaskEventHandler
 from src.app.domain.events.task_event import EventType
-from src.app.domain.repositories import TaskEventPublisherRepository
+from src.app.domain.repositories import TaskCancellationRepository, TaskEventPublisherRepository
+from src.app.infrastructure.celery.cancellation import RedisTaskCancellationRepository
 from src.app.infrastructure.streams.client import StreamsClient, SyncStreamsClient
 from src.app.infrastructure.streams.consumer import (
     GROUP_API,
@@ -18,6 +19,7 @@ from src.app.infrastructure.streams.router import EventRouter
 
 _stream_consumer: StreamsConsumer | None = None
 _stream_publisher: StreamsSyncPublisher | None = None
+_task_cancellation: RedisTaskCancellationRepository | None = None
 
 
 class StreamSettings(BaseSettings):
@@ -68,26 +70,54 @@ def build_stream_publisher(settings: StreamSettings | None = None) -> StreamsSyn
     return StreamsSyncPublisher(client, settings.STREAM_NAME)
 
 
-def configure_stream_publisher(settings: StreamSettings | None = None) -> StreamsSyncPublisher:
-    global _stream_publisher
-    if _stream_publisher is None:
-        _stream_publisher = build_stream_publisher(settings)
-
+def _bind(bindings: dict[type, object]) -> None:
     if inject.is_configured():
         injector = inject.get_injector()
-        if hasattr(injector, "binder"):
-            injector.binder.bind(TaskEventPublisherRepository, _stream_publisher)
-        else:
-            injector.bind(TaskEventPublisherRepository, _stream_publisher)
+        for interface, instance in bindings.items():
+            if hasattr(injector, "binder"):
+                injector.binder.bind(interface, instance)
+            else:
+                injector.bind(interface, instance)
     else:
         def _config(binder: inject.Binder) -> None:
-            binder.bind(TaskEventPublisherRepository, _stream_publisher)
+            for interface, instance in bindings.items():
+                binder.bind(interface, instance)
 
         inject.configure(_config)
 
+
+def _ensure_stream_publisher(settings: StreamSettings | None) -> StreamsSyncPublisher:
+    global _stream_publisher
+    if _stream_publisher is None:
+        _stream_publisher = build_stream_publisher(settings)
     return _stream_publisher
 
 
+def configure_stream_publisher(settings: StreamSettings | None = None) -> StreamsSyncPublisher:
+    publisher = _ensure_stream_publisher(settings)
+    _bind({TaskEventPublisherRepository: publisher})
+    return publisher
+
+
+def configure_worker_dependencies(settings: StreamSettings | None = None) -> None:
+    """
+    Bind what worker tasks use: the event publisher and the cancellation flags, both
+    stored in the stream's Redis.
+    """
+    global _task_cancellation
+    if settings is None:
+        settings = StreamSettings()
+    publisher = _ensure_stream_publisher(settings)
+    if _task_cancellation is None:
+        _task_cancellation = RedisTaskCancellationRepository.from_url(settings.REDIS_URL)
+    _bind(
+        {
+            TaskEventPublisherRepository: publisher,
+            TaskCancellationRepository: _task_cancellation,
+        }
+    )
+
+
 def configure_stream_consumer() -> StreamsConsumer:
     global _stream_consumer
     if _stream_consumer is None:
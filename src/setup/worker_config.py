@@ -1,12 +1,90 @@
-from pydantic import ConfigDict
+import logging
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from pydantic_settings import BaseSettings
 
+logger = logging.getLogger(__name__)
+
+
+class WorkerPoolSettings(BaseModel):
+    """One Celery worker process consuming a single queue."""
+
+    queue: str
+    # No gevent/eventlet: run_pool starts Celery without its early monkey-patching.
+    pool: Literal["prefork", "threads", "solo"] = "prefork"
+    min_concurrency: int = Field(default=1, ge=1)
+    max_concurrency: int = Field(default=2, ge=1)
+    prefetch_multiplier: int = Field(default=1, ge=1)
+
 
 class WorkerSettings(BaseSettings):
+    # Demo pacing between reported steps (none/fixed/random); ExecutionConfig.pacing
+    # overrides it per task. random sleeps uniformly between 0 and twice the delay.
+    PACING_MODE: Literal["none", "fixed", "random"] = "none"
     SLEEP_PER_DIGIT_SEC: float = 0.1
-    ROUNDING_POLICY: str = "TRUNCATE"
+    SLEEP_PER_SNIPPET_SEC: float = 0.3
+    ROUNDING_POLICY: Literal["TRUNCATE", "ROUND"] = "TRUNCATE"
+    # Shared by the API (request limit) and the worker (size of the precomputed π store).
+    MAX_DIGITS: int = 2000
+    PI_STORE_PATH: str = "/tmp/posttagger/pi_digits.bin"
+    # Processes the Chudnovsky series is split across when the π store grows.
+    PI_ENGINE_PROCESSES: int = Field(default=1, ge=1)
+    # CPU-bound π runs on processes; I/O-bound document downloads on threads.
+    WORKER_POOLS: list[WorkerPoolSettings] = [
+        WorkerPoolSettings(queue="celery", pool="prefork", min_concurrency=1, max_concurrency=4),
+        WorkerPoolSettings(queue="doc-tasks", pool="threads", min_concurrency=2, max_concurrency=8),
+    ]
+    # Deprecated: the single worker's concurrency and comma-separated queues. Without
+    # WORKER_POOLS they become one fixed-size pool per queue (see _legacy_worker_pools).
+    CELERY_CONCURRENCY: int | None = Field(default=None, ge=1)
+    CELERY_QUEUES: str | None = None
+    AUTOSCALE_KEEPALIVE_SECONDS: int = 30
+    # Documents of at least DOC_SCAN_PARALLEL_MIN_BYTES are split into line-aligned
+    # ranges scanned by DOC_SCAN_PROCESSES processes; 1 scans every document in-task.
+    DOC_SCAN_PROCESSES: int = Field(default=1, ge=1)
+    DOC_SCAN_PARALLEL_MIN_BYTES: int = 32 * 1024 * 1024
+    # Documents of one multi-document task downloaded and scanned at the same time.
+    DOC_ANALYSIS_MAX_CONCURRENT_DOCUMENTS: int = Field(default=4, ge=1)
+    # Downloaded documents, keyed by URL hash and evicted least recently used first once
+    # they exceed DOWNLOAD_CACHE_MAX_BYTES; older copies are revalidated with the server.
+    DOWNLOAD_CACHE_DIR: str = "/data/books"
+    DOWNLOAD_CACHE_MAX_BYTES: int = Field(default=2 * 1024 * 1024 * 1024, ge=0)
+    DOWNLOAD_CACHE_REVALIDATE_SEC: float = Field(default=3600.0, ge=0)
+    # Inverted indexes of documents up to DOC_INDEX_MAX_BYTES, keyed by content hash and
+    # built on their first single-word query; 0 always scans. The least recently used
+    # indexes are evicted once they exceed DOC_INDEX_CACHE_MAX_BYTES.
+    DOC_INDEX_DIR: str = "/data/index"
+    DOC_INDEX_MAX_BYTES: int = Field(default=64 * 1024 * 1024, ge=0)
+    DOC_INDEX_CACHE_MAX_BYTES: int = Field(default=2 * 1024 * 1024 * 1024, ge=0)
 
     model_config = ConfigDict(env_file=".env", extra="ignore")
 
+    @model_validator(mode="after")
+    def _legacy_worker_pools(self) -> "WorkerSettings":
+        if self.CELERY_CONCURRENCY is None and self.CELERY_QUEUES is None:
+            return self
+        if "WORKER_POOLS" in self.model_fields_set:
+            logger.warning("CELERY_CONCURRENCY and CELERY_QUEUES are ignored; WORKER_POOLS is set")
+            return self
+        logger.warning("CELERY_CONCURRENCY and CELERY_QUEUES are deprecated; use WORKER_POOLS")
+        defaults = {pool.queue: pool for pool in self.WORKER_POOLS}
+        queues = [
+            queue.strip()
+            for queue in (self.CELERY_QUEUES or ",".join(defaults)).split(",")
+            if queue.strip()
+        ]
+        pools = []
+        for queue in queues:
+            pool = defaults.get(queue, WorkerPoolSettings(queue=queue))
+            if self.CELERY_CONCURRENCY is not None:
+                concurrency = self.CELERY_CONCURRENCY
+                pool = pool.model_copy(
+                    update={"min_concurrency": concurrency, "max_concurrency": concurrency}
+                )
+            pools.append(pool)
+        self.WORKER_POOLS = pools
+        return self
+
 def get_worker_settings() -> WorkerSettings:
     return WorkerSettings()
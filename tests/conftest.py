@@ -27,6 +27,8 @@ class StubTaskManager(TaskManagerRepository):
         self.enqueued_tasks: list[Task] = []
         self.status_by_id: dict[str, TaskStatus] = {}
         self.results_by_id: dict[str, TaskResult] = {}
+        self.failing_task_ids: set[str] = set()
+        self.cancelled_task_ids: list[str] = []
 
     async def enqueue(self, task: Task) -> str:
         if task.id is None:
@@ -35,6 +37,18 @@ class StubTaskManager(TaskManagerRepository):
         self.enqueued_tasks.append(task)
         return task_id
 
+    async def enqueue_many(self, tasks) -> list[str | Exception]:
+        outcomes: list[str | Exception] = []
+        for task in tasks:
+            if task.id in self.failing_task_ids:
+                outcomes.append(RuntimeError(f"broker rejected {task.id}"))
+            else:
+                outcomes.append(await self.enqueue(task))
+        return outcomes
+
+    async def request_cancellation(self, task_id: str) -> None:
+        self.cancelled_task_ids.append(task_id)
+
     async def get_status(self, task_id: str) -> TaskStatus:
         if task_id not in self.status_by_id:
             raise TaskNotFoundError(task_id)
@@ -50,16 +64,32 @@ class StubStorageRepository(StorageRepository):
     def __init__(self) -> None:
         self.status_by_id: dict[str, TaskStatus] = {}
         self.results_by_id: dict[str, TaskResult] = {}
+        self.status_versions: dict[str, int] = {}
+        self.result_versions: dict[str, int] = {}
+        self.status_updates: list[tuple[str, TaskStatus]] = []
+        self.bulk_status_updates = 0
+        self.results_set: list[tuple[str, TaskResult]] = []
+        self.tasks: list[Task] = []
+        self.dedup_leaders: dict[str, Task] = {}
+        self.followers: dict[str, list[str]] = {}
+        self.detached: list[str] = []
+        self.get_status_calls = 0
+        self.get_status_version_calls = 0
+        self.get_result_calls = 0
         self._counter = 0
 
     async def create_task(self, user_id: str, task: Task) -> str:
         if task.id is None:
             self._counter += 1
             task.id = f"{task.task_type.value}-{self._counter}"
+        self.tasks.append(task.model_copy())
         return task.id
 
+    async def create_tasks(self, user_id: str, tasks) -> list[str]:
+        return [await self.create_task(user_id, task) for task in tasks]
+
     async def get_task(self, user_id: str, task_id: str) -> Task | None:
-        return None
+        return next((task for task in self.tasks if task.id == task_id), None)
 
     async def list_tasks(
         self,
@@ -78,33 +108,79 @@ class StubStorageRepository(StorageRepository):
         status: TaskStatus,
         metadata: TaskMetadata | None = None,
     ) -> None:
+        self.status_updates.append((task_id, status))
         return None
 
+    async def update_task_statuses(self, statuses, metadata: TaskMetadata | None = None) -> None:
+        self.bulk_status_updates += 1
+        self.status_updates.extend(statuses.items())
+
     async def set_task_result(
         self,
         task_id: str,
         result: TaskResult,
         finished_at: datetime | None = None,
     ) -> None:
+        self.results_set.append((task_id, result))
         return None
 
+    async def find_dedup_leader(self, fingerprint: str, completed_since: datetime) -> Task | None:
+        return self.dedup_leaders.get(fingerprint)
+
+    async def get_follower_ids(self, task_id: str) -> list[str]:
+        return self.followers.get(task_id, [])
+
+    async def get_task_state(self, task_id: str) -> TaskState | None:
+        if task_id in self.status_by_id:
+            return self.status_by_id[task_id].state
+        task = await self.get_task("", task_id)
+        return task.status.state if task is not None else None
+
+    async def detach_follower(self, task_id: str) -> None:
+        self.detached.append(task_id)
+
     async def get_status(self, user_id: str, task_id: str) -> TaskStatus:
+        self.get_status_calls += 1
         if task_id not in self.status_by_id:
             raise TaskNotFoundError(task_id)
         return self.status_by_id[task_id]
 
     async def get_result(self, user_id: str, task_id: str) -> TaskResult:
+        self.get_result_calls += 1
         if task_id not in self.results_by_id:
             raise TaskNotFoundError(task_id)
         return self.results_by_id[task_id]
 
+    async def get_status_with_version(self, user_id: str, task_id: str) -> tuple[TaskStatus, int]:
+        status = await self.get_status(user_id, task_id)
+        return status, self.status_versions.get(task_id, 0)
+
+    async def get_statuses(self, user_id: str, task_ids) -> dict[str, TaskStatus]:
+        return {
+            task_id: self.status_by_id[task_id]
+            for task_id in task_ids
+            if task_id in self.status_by_id
+        }
+
+    async def get_status_version(self, user_id: str, task_id: str) -> int:
+        self.get_status_version_calls += 1
+        if task_id not in self.status_by_id:
+            raise TaskNotFoundError(task_id)
+        return self.status_versions.get(task_id, 0)
+
+    async def get_result_version(self, user_id: str, task_id: str) -> int:
+        if task_id not in self.results_by_id:
+            raise TaskNotFoundError(task_id)
+        return self.result_versions.get(task_id, 0)
+
 
 @pytest.fixture
-def env_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+def env_settings(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
     """Provide required environment variables for ApiSettings."""
     monkeypatch.setenv("MAX_DIGITS", "5")
     monkeypatch.setenv("APP_NAME", "Test API")
     monkeypatch.setenv("APP_VERSION", "0.1.0")
+    monkeypatch.setenv("DOCUMENTS_DIR", str(tmp_path))
 
 
 def _patch_inject_instance(
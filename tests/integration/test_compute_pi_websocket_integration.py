@@ -14,7 +14,12 @@ import inject
 from src.app.application.handlers import TaskEventHandler
 from src.app.domain.events.task_event import EventType
 from src.app.domain.models.task_status import TaskStatus
-from src.app.domain.repositories import StorageRepository, TaskEventPublisherRepository
+from src.app.domain.repositories import (
+    StorageRepository,
+    TaskCancellationRepository,
+    TaskEventPublisherRepository,
+)
+from src.app.infrastructure.celery.cancellation import RedisTaskCancellationRepository
 from src.app.infrastructure.streams.client import StreamsClient, SyncStreamsClient
 from src.app.infrastructure.streams.consumer import StreamsConsumer
 from src.app.infrastructure.streams.publisher import StreamsSyncPublisher
@@ -87,10 +92,13 @@ def test_compute_pi_streams_status_and_chunks(monkeypatch: pytest.MonkeyPatch) -
 
     streams_client = StreamsClient(redis_url)
     publisher = StreamsSyncPublisher(sync_client, stream_name)
+    cancellation = RedisTaskCancellationRepository(sync_client.redis)
 
     def fake_instance(interface: object) -> object:
         if interface is TaskEventPublisherRepository:
             return publisher
+        if interface is TaskCancellationRepository:
+            return cancellation
         raise RuntimeError(f"Unexpected dependency request: {interface}")
 
     monkeypatch.setattr(inject, "instance", fake_instance)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 import pytest
 import pytest_asyncio
@@ -82,3 +82,165 @@ async def test_get_status_enforces_acl(repo: PostgresStorageRepository):
 
     with pytest.raises(TaskAccessDeniedError):
         await repo.get_status("other-user", task_id)
+
+
+@pytest.mark.asyncio
+async def test_status_and_result_versions_increase_on_writes(repo: PostgresStorageRepository):
+    task = Task(
+        task_type=TaskType.COMPUTE_PI,
+        payload=ComputePiPayload(digits=4),
+        status=TaskStatus(state=TaskState.QUEUED, progress=TaskProgress()),
+        metadata=TaskMetadata(created_at=datetime.now(timezone.utc)),
+    )
+    task_id = await repo.create_task("user-1", task)
+    assert await repo.get_status_version("user-1", task_id) == 0
+    assert await repo.get_result_version("user-1", task_id) == 0
+
+    running = TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=0.5))
+    first = await repo.update_task_status(task_id, running)
+    second = await repo.update_task_status(task_id, running)
+    result_version = await repo.set_task_result(task_id, TaskResult(task_id=task_id, data="3.14"))
+
+    assert (first, second, result_version) == (1, 2, 1)
+    assert await repo.get_status_version("user-1", task_id) == 2
+    assert await repo.get_status_with_version("user-1", task_id) == (running, 2)
+    assert await repo.get_result_version("user-1", task_id) == 1
+    with pytest.raises(TaskAccessDeniedError):
+        await repo.get_status_version("other-user", task_id)
+
+
+@pytest.mark.asyncio
+async def test_get_statuses_filters_by_owner(repo: PostgresStorageRepository):
+    task_ids = []
+    for owner in ("user-1", "user-1", "other-user"):
+        task = Task(
+            task_type=TaskType.COMPUTE_PI,
+            payload=ComputePiPayload(digits=2),
+            status=TaskStatus(state=TaskState.QUEUED, progress=TaskProgress()),
+            metadata=TaskMetadata(created_at=datetime.now(timezone.utc)),
+        )
+        task_ids.append(await repo.create_task(owner, task))
+    await repo.update_task_status(
+        task_ids[1], TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=0.2))
+    )
+
+    statuses = await repo.get_statuses("user-1", [*task_ids, "missing"])
+
+    assert set(statuses) == {task_ids[0], task_ids[1]}
+    assert statuses[task_ids[0]].state == TaskState.QUEUED
+    assert statuses[task_ids[1]].progress.percentage == 0.2
+
+
+@pytest.mark.asyncio
+async def test_create_tasks_persists_batch(repo: PostgresStorageRepository):
+    tasks = [
+        Task(
+            task_type=TaskType.COMPUTE_PI,
+            payload=ComputePiPayload(digits=digits),
+            status=TaskStatus(state=TaskState.QUEUED, progress=TaskProgress()),
+            metadata=TaskMetadata(created_at=datetime.now(timezone.utc)),
+        )
+        for digits in (1, 2, 3)
+    ]
+
+    task_ids = await repo.create_tasks("user-1", tasks)
+
+    assert task_ids == [task.id for task in tasks]
+    stored = await repo.get_task("user-1", task_ids[2])
+    assert stored.payload.digits == 3
+    assert stored.status.state == TaskState.QUEUED
+
+
+@pytest.mark.asyncio
+async def test_find_dedup_leader_prefers_fresh_results_and_skips_followers(
+    repo: PostgresStorageRepository,
+):
+    def task(**fields) -> Task:
+        return Task(
+            task_type=TaskType.COMPUTE_PI,
+            payload=ComputePiPayload(digits=3),
+            status=TaskStatus(state=TaskState.RUNNING, progress=TaskProgress()),
+            metadata=TaskMetadata(created_at=datetime.now(timezone.utc)),
+            fingerprint="fp",
+            **fields,
+        )
+
+    now = datetime.now(timezone.utc)
+    running_id = await repo.create_task("user-1", task())
+    stale_id = await repo.create_task("user-1", task())
+    await repo.set_task_result(
+        stale_id, TaskResult(task_id=stale_id, data="old"), finished_at=now - timedelta(hours=2)
+    )
+
+    leader = await repo.find_dedup_leader("fp", completed_since=now - timedelta(hours=1))
+    assert leader.id == running_id
+    assert leader.result is None
+
+    fresh_id = await repo.create_task("user-2", task())
+    await repo.set_task_result(fresh_id, TaskResult(task_id=fresh_id, data="3.1"), finished_at=now)
+    follower_id = await repo.create_task("user-3", task(leader_id=running_id))
+
+    leader = await repo.find_dedup_leader("fp", completed_since=now - timedelta(hours=1))
+    assert leader.id == fresh_id
+    assert leader.result == "3.1"
+    assert await repo.get_follower_ids(running_id) == [follower_id]
+    assert await repo.find_dedup_leader("other", completed_since=now) is None
+
+
+@pytest.mark.asyncio
+async def test_detached_followers_stop_following_their_leader(repo: PostgresStorageRepository):
+    def task(**fields) -> Task:
+        return Task(
+            task_type=TaskType.COMPUTE_PI,
+            payload=ComputePiPayload(digits=3),
+            status=TaskStatus(state=TaskState.RUNNING, progress=TaskProgress()),
+            metadata=TaskMetadata(created_at=datetime.now(timezone.utc)),
+            fingerprint="fp",
+            **fields,
+        )
+
+    leader_id = await repo.create_task("user-1", task())
+    follower_id = await repo.create_task("user-2", task(leader_id=leader_id))
+
+    await repo.detach_follower(follower_id)
+
+    assert await repo.get_follower_ids(leader_id) == []
+    assert await repo.get_task_state(leader_id) == TaskState.RUNNING
+    assert await repo.get_task_state("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_update_task_statuses_writes_every_task_at_once(repo: PostgresStorageRepository):
+    tasks = [
+        Task(
+            task_type=TaskType.COMPUTE_PI,
+            payload=ComputePiPayload(digits=digits),
+            status=TaskStatus(state=TaskState.QUEUED, progress=TaskProgress()),
+            metadata=TaskMetadata(created_at=datetime.now(timezone.utc)),
+        )
+        for digits in (1, 2, 3)
+    ]
+    first, second, third = await repo.create_tasks("user-1", tasks)
+    updated_at = datetime.now(timezone.utc)
+
+    await repo.update_task_statuses(
+        {
+            first: TaskStatus(state=TaskState.FAILED, progress=TaskProgress(), message="down"),
+            second: TaskStatus(state=TaskState.FAILED, progress=TaskProgress(), message="down"),
+            third: TaskStatus(state=TaskState.FAILED, progress=TaskProgress(), message="full"),
+            "missing": TaskStatus(state=TaskState.FAILED, progress=TaskProgress()),
+        },
+        metadata=TaskMetadata(updated_at=updated_at),
+    )
+
+    statuses = await repo.get_statuses("user-1", [first, second, third])
+    assert [
+        (statuses[task_id].state, statuses[task_id].message) for task_id in (first, second, third)
+    ] == [
+        (TaskState.FAILED, "down"),
+        (TaskState.FAILED, "down"),
+        (TaskState.FAILED, "full"),
+    ]
+    assert await repo.get_status_version("user-1", third) == 1
+    stored = await repo.get_task("user-1", second)
+    assert stored.metadata.updated_at.replace(tzinfo=timezone.utc) == updated_at
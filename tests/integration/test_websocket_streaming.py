@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+import asyncio
+
+import pytest
+from fastapi import FastAPI, WebSocketDisconnect
 from fastapi.testclient import TestClient
 
 from src.app.application.handlers import TaskEventHandler
@@ -10,6 +13,7 @@ from src.app.domain.models.task_state import TaskState
 from src.app.domain.models.task_status import TaskStatus
 from src.app.domain.repositories import StorageRepository
 from src.app.presentation.websockets import (
+    MultiplexSession,
     WebSocketStatusBroadcaster,
     connection_manager,
     router as ws_router,
@@ -38,6 +42,9 @@ class StubStorage(StorageRepository):
     async def set_task_result(self, task_id: str, result, finished_at=None) -> None:
         return None
 
+    async def get_follower_ids(self, task_id: str) -> list[str]:
+        return []
+
 
 def _build_app() -> FastAPI:
     app = FastAPI()
@@ -74,3 +81,133 @@ def test_websocket_receives_status_and_chunks() -> None:
     assert chunk_msg["type"] == chunk_event.type.value
     assert chunk_msg["task_id"] == task_id
     assert chunk_msg["payload"] == chunk_event.payload
+
+
+def test_multiplexed_websocket_coalesces_status_per_tick() -> None:
+    connection_manager._connections.clear()
+    connection_manager._sessions.clear()
+    app = _build_app()
+    broadcaster = WebSocketStatusBroadcaster(connection_manager)
+    handler = TaskEventHandler(storage=StubStorage(), broadcaster=broadcaster)
+
+    def status_event(task_id: str, current: int) -> TaskEvent:
+        status = TaskStatus(
+            state=TaskState.RUNNING,
+            progress=TaskProgress(current=current, total=3, percentage=current / 3),
+        )
+        return TaskEvent.status(task_id, status)
+
+    async def emit_events() -> None:
+        for current in (1, 2, 3):
+            await handler.handle_status_event(status_event("task-a", current))
+        await handler.handle_result_chunk_event(
+            TaskEvent.result_chunk("task-b", "0", ["3"], is_last=False)
+        )
+        await handler.handle_status_event(status_event("task-c", 1))
+
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws/tasks") as ws:
+            ws.send_json({"action": "subscribe", "task_ids": ["task-a", "task-b"]})
+            ack = ws.receive_json()
+            client.portal.call(emit_events)
+            batch = ws.receive_json()
+
+    assert ack == {"type": "subscribed", "task_ids": ["task-a", "task-b"]}
+    assert batch["type"] == "batch"
+    events = batch["events"]
+    assert [event["task_id"] for event in events] == ["task-a", "task-b"]
+    assert events[0]["payload"]["status"]["progress"]["current"] == 3
+    assert events[1]["payload"]["data"] == ["3"]
+    assert connection_manager._sessions == {}
+
+
+@pytest.mark.asyncio
+async def test_multiplex_session_sends_a_newer_status_after_earlier_chunks() -> None:
+    class RecordingSocket:
+        def __init__(self) -> None:
+            self.frames: list[dict] = []
+
+        async def send_json(self, frame: dict) -> None:
+            self.frames.append(frame)
+
+    socket = RecordingSocket()
+    session = MultiplexSession(socket, tick_seconds=0)
+    session.enqueue({"type": "task.status", "task_id": "task-a", "state": "RUNNING"})
+    session.enqueue({"type": "task.result_chunk", "task_id": "task-a", "chunk_id": "0"})
+    session.enqueue({"type": "task.status", "task_id": "task-a", "state": "COMPLETED"})
+    await asyncio.sleep(0.01)
+
+    (frame,) = socket.frames
+    assert [event.get("state", event.get("chunk_id")) for event in frame["events"]] == [
+        "0",
+        "COMPLETED",
+    ]
+
+
+class SlowSocket:
+    """Records frames; each send takes ``delay`` and overlapping sends are counted."""
+
+    def __init__(self, delay: float, error: Exception | None = None) -> None:
+        self.frames: list[dict] = []
+        self.delay = delay
+        self.error = error
+        self.sending = 0
+        self.overlaps = 0
+
+    async def send_json(self, frame: dict) -> None:
+        if self.error is not None:
+            raise self.error
+        self.sending += 1
+        self.overlaps += self.sending > 1
+        await asyncio.sleep(self.delay)
+        self.frames.append(frame)
+        self.sending -= 1
+
+
+@pytest.mark.asyncio
+async def test_multiplex_session_never_sends_two_batches_at_once() -> None:
+    socket = SlowSocket(delay=0.05)
+    session = MultiplexSession(socket, tick_seconds=0)
+    session.enqueue({"type": "task.result_chunk", "task_id": "task-a", "chunk_id": "0"})
+    await asyncio.sleep(0.01)
+    # Arrives while the first batch is still being sent.
+    session.enqueue({"type": "task.result_chunk", "task_id": "task-a", "chunk_id": "1"})
+    await asyncio.sleep(0.2)
+
+    assert socket.overlaps == 0
+    assert [event["chunk_id"] for frame in socket.frames for event in frame["events"]] == [
+        "0",
+        "1",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_multiplex_session_closes_when_the_client_disconnected() -> None:
+    socket = SlowSocket(delay=0, error=WebSocketDisconnect(1006))
+    session = MultiplexSession(socket, tick_seconds=0)
+    session.enqueue({"type": "task.result_chunk", "task_id": "task-a", "chunk_id": "0"})
+    await asyncio.sleep(0.01)
+
+    session.enqueue({"type": "task.result_chunk", "task_id": "task-a", "chunk_id": "1"})
+    assert session._flush_task is None
+    assert session._pending == []
+
+
+def test_multiplexed_websocket_caps_subscriptions(monkeypatch) -> None:
+    connection_manager._sessions.clear()
+    monkeypatch.setattr(connection_manager, "_max_subscriptions", 2)
+    app = _build_app()
+
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws/tasks") as ws:
+            ws.send_json({"action": "subscribe", "task_ids": ["task-a", "task-b", "task-c"]})
+            error = ws.receive_json()
+            ack = ws.receive_json()
+
+    assert error == {
+        "type": "error",
+        "detail": "Subscription limit reached.",
+        "task_ids": ["task-c"],
+    }
+    assert ack == {"type": "subscribed", "task_ids": ["task-a", "task-b"]}
+    assert connection_manager._sessions == {}
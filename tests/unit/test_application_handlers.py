@@ -13,6 +13,9 @@ class StubStorage(StorageRepository):
     def __init__(self) -> None:
         self.status_calls: list[tuple[str, TaskStatus]] = []
         self.result_calls: list[tuple[str, object]] = []
+        self.followers: dict[str, list[str]] = {}
+        self.follower_lookups = 0
+        self.states: dict[str, TaskState] = {}
 
     async def create_task(self, user_id: str, task):  # pragma: no cover - not used
         raise NotImplementedError
@@ -35,6 +38,13 @@ class StubStorage(StorageRepository):
     async def set_task_result(self, task_id: str, result, finished_at=None) -> None:
         self.result_calls.append((task_id, result))
 
+    async def get_follower_ids(self, task_id: str) -> list[str]:
+        self.follower_lookups += 1
+        return self.followers.get(task_id, [])
+
+    async def get_task_state(self, task_id: str) -> TaskState | None:
+        return self.states.get(task_id, TaskState.RUNNING)
+
 
 class StubBroadcaster(TaskStatusBroadcaster):
     def __init__(self) -> None:
@@ -106,3 +116,107 @@ async def test_handle_result_chunk_event_broadcasts() -> None:
 
     assert broadcaster.chunk_events == [event]
     assert storage.result_calls == []
+
+
+@pytest.mark.asyncio
+async def test_handler_fans_events_out_to_dedup_followers() -> None:
+    storage = StubStorage()
+    storage.followers["leader"] = ["follower-1", "follower-2"]
+    broadcaster = StubBroadcaster()
+    handler = TaskEventHandler(storage=storage, broadcaster=broadcaster)
+    status = TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=0.5))
+
+    await handler.handle_status_event(TaskEvent.status("leader", status))
+    await handler.handle_result_chunk_event(
+        TaskEvent.result_chunk("leader", "0", ["3"], is_last=True)
+    )
+    await handler.handle_result_event(TaskEvent.result("leader", {"data": "3.1"}))
+
+    expected_ids = ["leader", "follower-1", "follower-2"]
+    assert [task_id for task_id, _ in storage.status_calls] == expected_ids
+    assert [event.task_id for event in broadcaster.status_events] == expected_ids
+    assert [event.task_id for event in broadcaster.chunk_events] == expected_ids
+    assert [(task_id, result.task_id) for task_id, result in storage.result_calls] == [
+        (task_id, task_id) for task_id in expected_ids
+    ]
+
+
+@pytest.mark.asyncio
+async def test_followers_are_reloaded_only_after_an_attach() -> None:
+    from src.app.application.notifier import TaskChangeNotifier
+
+    storage = StubStorage()
+    notifier = TaskChangeNotifier()
+    handler = TaskEventHandler(storage=storage, broadcaster=StubBroadcaster(), notifier=notifier)
+
+    def running(percentage: float) -> TaskEvent:
+        status = TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=percentage))
+        return TaskEvent.status("leader", status)
+
+    await handler.handle_status_event(running(0.1))
+    await handler.handle_status_event(running(0.2))
+    assert storage.follower_lookups == 1
+
+    storage.followers["leader"] = ["follower-1"]
+    notifier.notify_followers("leader")
+    await handler.handle_status_event(running(0.3))
+    await handler.handle_status_event(running(0.4))
+
+    assert storage.follower_lookups == 2
+    assert [task_id for task_id, _ in storage.status_calls][-2:] == ["leader", "follower-1"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_stops_receiving_its_run_events() -> None:
+    from src.app.application.notifier import TaskChangeNotifier
+
+    storage = StubStorage()
+    storage.followers["leader"] = ["follower-1"]
+    notifier = TaskChangeNotifier()
+    broadcaster = StubBroadcaster()
+    handler = TaskEventHandler(storage=storage, broadcaster=broadcaster, notifier=notifier)
+    status = TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=0.5))
+    await handler.handle_status_event(TaskEvent.status("leader", status))
+
+    storage.states["leader"] = TaskState.CANCELLED
+    notifier.notify_followers("leader")
+    storage.status_calls.clear()
+    broadcaster.status_events.clear()
+    done = TaskStatus(state=TaskState.COMPLETED, progress=TaskProgress(percentage=1.0))
+    await handler.handle_status_event(TaskEvent.status("leader", done))
+    await handler.handle_result_event(TaskEvent.result("leader", {"data": "3.1"}))
+
+    assert [task_id for task_id, _ in storage.status_calls] == ["follower-1"]
+    assert [event.task_id for event in broadcaster.status_events] == ["follower-1"]
+    assert [task_id for task_id, _ in storage.result_calls] == ["follower-1"]
+
+
+@pytest.mark.asyncio
+async def test_chunk_progress_watermark_updates_last_running_status() -> None:
+    storage = StubStorage()
+    broadcaster = StubBroadcaster()
+    handler = TaskEventHandler(storage=storage, broadcaster=broadcaster)
+
+    def chunk(chunk_id: str, percentage: float) -> TaskEvent:
+        progress = TaskProgress(current=int(percentage * 100), total=100, percentage=percentage)
+        return TaskEvent.result_chunk("task-4", chunk_id, [], progress=progress)
+
+    await handler.handle_result_chunk_event(chunk("0", 0.1))
+    assert storage.status_calls == []
+
+    status = TaskStatus(
+        state=TaskState.RUNNING,
+        progress=TaskProgress(current=0, total=100, percentage=0.0),
+        metrics={"snippets_emitted": 0},
+    )
+    await handler.handle_status_event(TaskEvent.status("task-4", status))
+    await handler.handle_result_chunk_event(chunk("1", 0.5))
+    await handler.handle_result_chunk_event(chunk("2", 0.51))
+    await handler.handle_result_chunk_event(chunk("3", 0.3))
+
+    stored = [stored_status for _, stored_status in storage.status_calls]
+    assert [item.progress.percentage for item in stored] == [0.0, 0.5]
+    assert stored[-1].state == TaskState.RUNNING
+    assert stored[-1].metrics == {"snippets_emitted": 0}
+    assert len(broadcaster.status_events) == 1
+    assert len(broadcaster.chunk_events) == 4
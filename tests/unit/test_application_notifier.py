@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.app.application.notifier import TaskChangeNotifier
+
+
+@pytest.mark.asyncio
+async def test_wait_for_status_returns_immediately_when_version_differs() -> None:
+    notifier = TaskChangeNotifier()
+    await notifier.notify_status("task-1")
+
+    version = await notifier.wait_for_status("task-1", since_version=0, timeout=5)
+
+    assert version == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_for_status_wakes_on_notify() -> None:
+    notifier = TaskChangeNotifier()
+    waiter = asyncio.create_task(notifier.wait_for_status("task-1", since_version=0, timeout=5))
+    await asyncio.sleep(0)
+
+    await notifier.notify_status("task-1")
+    version = await asyncio.wait_for(waiter, timeout=1)
+
+    assert version == 1
+    assert notifier._conditions == {}
+
+
+@pytest.mark.asyncio
+async def test_wait_for_status_times_out_without_change() -> None:
+    notifier = TaskChangeNotifier()
+
+    version = await notifier.wait_for_status("task-1", since_version=0, timeout=0.01)
+
+    assert version == 0
+    assert notifier._waiters == {}
@@ -37,3 +37,168 @@ async def test_task_service_returns_status_from_repository(stubbed_services):
     returned = await service.get_status("job-42")
 
     assert returned is status
+
+
+@pytest.mark.asyncio
+async def test_create_tasks_marks_rejected_items_failed(stubbed_services):
+    services_module, task_stub, storage_stub = stubbed_services
+    task_stub.failing_task_ids.update({"compute_pi-2", "compute_pi-4"})
+    service = services_module.TaskService()
+
+    tasks = await service.create_tasks(
+        [(TaskType.COMPUTE_PI, ComputePiPayload(digits=digits), None) for digits in (1, 2, 3, 4)]
+    )
+
+    assert [task.id for task in tasks] == [
+        "compute_pi-1",
+        "compute_pi-2",
+        "compute_pi-3",
+        "compute_pi-4",
+    ]
+    assert [task.status.state for task in tasks] == [
+        TaskState.QUEUED,
+        TaskState.FAILED,
+        TaskState.QUEUED,
+        TaskState.FAILED,
+    ]
+    assert [task.id for task in task_stub.enqueued_tasks] == ["compute_pi-1", "compute_pi-3"]
+    assert [(task_id, status.state) for task_id, status in storage_stub.status_updates] == [
+        ("compute_pi-2", TaskState.FAILED),
+        ("compute_pi-4", TaskState.FAILED),
+    ]
+    assert storage_stub.bulk_status_updates == 1
+
+
+def test_fingerprint_depends_on_keyword_order_and_digits():
+    from src.app.application.dedup import task_fingerprint
+    from src.app.domain.models import DocumentAnalysisPayload
+
+    # The first keyword of the alternation wins at a position, so order changes snippets.
+    doc_a = DocumentAnalysisPayload(document_path="/doc.txt", keywords=["he", "hello"])
+    doc_b = DocumentAnalysisPayload(document_path="/doc.txt", keywords=["hello", "he"])
+
+    assert task_fingerprint(TaskType.DOCUMENT_ANALYSIS, doc_a) != task_fingerprint(
+        TaskType.DOCUMENT_ANALYSIS, doc_b
+    )
+    assert task_fingerprint(TaskType.COMPUTE_PI, ComputePiPayload(digits=3)) != task_fingerprint(
+        TaskType.COMPUTE_PI, ComputePiPayload(digits=4)
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_task_reuses_completed_result_without_enqueue(stubbed_services):
+    services_module, task_stub, storage_stub = stubbed_services
+    service = services_module.TaskService(dedup_ttl_seconds=60)
+    first = await service.create_task(TaskType.COMPUTE_PI, ComputePiPayload(digits=3))
+    storage_stub.dedup_leaders[first.fingerprint] = first.model_copy(
+        update={"result": {"data": "3.14"}}
+    )
+
+    second = await service.create_task(TaskType.COMPUTE_PI, ComputePiPayload(digits=3))
+
+    assert [task.id for task in task_stub.enqueued_tasks] == [first.id]
+    assert second.id != first.id
+    assert second.leader_id == first.id
+    assert second.status.state == TaskState.COMPLETED
+    assert storage_stub.results_set[0][0] == second.id
+    assert storage_stub.results_set[0][1].data == {"data": "3.14"}
+
+
+@pytest.mark.asyncio
+async def test_document_analysis_is_never_deduplicated(stubbed_services):
+    from src.app.domain.models import DocumentAnalysisPayload
+
+    services_module, task_stub, storage_stub = stubbed_services
+    service = services_module.TaskService(dedup_ttl_seconds=60)
+    payload = DocumentAnalysisPayload(document_path="/doc.txt", keywords=["whale"])
+
+    first = await service.create_task(TaskType.DOCUMENT_ANALYSIS, payload)
+    second = await service.create_task(TaskType.DOCUMENT_ANALYSIS, payload)
+    batch = await service.create_tasks([(TaskType.DOCUMENT_ANALYSIS, payload, None)] * 2)
+
+    assert first.fingerprint is None and second.leader_id is None
+    assert [task.fingerprint for task in batch] == [None, None]
+    assert [task.id for task in task_stub.enqueued_tasks] == [
+        first.id,
+        second.id,
+        *(task.id for task in batch),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_create_task_attaches_to_in_flight_leader(stubbed_services):
+    services_module, task_stub, storage_stub = stubbed_services
+    service = services_module.TaskService(dedup_ttl_seconds=60)
+    first = await service.create_task(TaskType.COMPUTE_PI, ComputePiPayload(digits=3))
+    running = TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=0.5))
+    storage_stub.dedup_leaders[first.fingerprint] = first.model_copy(update={"status": running})
+
+    second = await service.create_task(TaskType.COMPUTE_PI, ComputePiPayload(digits=3))
+
+    assert len(task_stub.enqueued_tasks) == 1
+    assert second.leader_id == first.id
+    assert second.status.state == TaskState.RUNNING
+    assert storage_stub.tasks[-1].leader_id == first.id
+    assert storage_stub.results_set == []
+
+
+@pytest.mark.asyncio
+async def test_follower_runs_itself_when_the_leader_failed_before_it_attached(stubbed_services):
+    services_module, task_stub, storage_stub = stubbed_services
+    service = services_module.TaskService(dedup_ttl_seconds=60)
+    first = await service.create_task(TaskType.COMPUTE_PI, ComputePiPayload(digits=3))
+    running = TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=0.5))
+    storage_stub.dedup_leaders[first.fingerprint] = first.model_copy(update={"status": running})
+    # The leader fails after the lookup returned it as in flight.
+    storage_stub.status_by_id[first.id] = TaskStatus(
+        state=TaskState.FAILED, progress=TaskProgress()
+    )
+
+    second = await service.create_task(TaskType.COMPUTE_PI, ComputePiPayload(digits=3))
+
+    assert second.leader_id is None
+    assert second.status.state == TaskState.QUEUED
+    assert storage_stub.detached == [second.id]
+    assert [task.id for task in task_stub.enqueued_tasks] == [first.id, second.id]
+
+
+@pytest.mark.asyncio
+async def test_cancelling_a_follower_detaches_it_without_stopping_the_run(stubbed_services):
+    services_module, task_stub, storage_stub = stubbed_services
+    service = services_module.TaskService(dedup_ttl_seconds=60)
+    leader = await service.create_task(TaskType.COMPUTE_PI, ComputePiPayload(digits=3))
+    running = TaskStatus(state=TaskState.RUNNING, progress=TaskProgress(percentage=0.5))
+    storage_stub.dedup_leaders[leader.fingerprint] = leader.model_copy(update={"status": running})
+    follower = await service.create_task(TaskType.COMPUTE_PI, ComputePiPayload(digits=3))
+
+    await service.cancel_task(follower.id)
+
+    assert storage_stub.detached == [follower.id]
+    assert storage_stub.status_updates[-1][0] == follower.id
+    assert storage_stub.status_updates[-1][1].state == TaskState.CANCELLED
+    assert task_stub.cancelled_task_ids == []
+
+
+@pytest.mark.asyncio
+async def test_cancelling_a_leader_keeps_the_run_going_for_its_followers(stubbed_services):
+    services_module, task_stub, storage_stub = stubbed_services
+    service = services_module.TaskService(dedup_ttl_seconds=60)
+    leader = await service.create_task(TaskType.COMPUTE_PI, ComputePiPayload(digits=3))
+    storage_stub.followers[leader.id] = ["follower-1"]
+
+    await service.cancel_task(leader.id)
+
+    assert [(task_id, status.state) for task_id, status in storage_stub.status_updates] == [
+        (leader.id, TaskState.CANCELLED)
+    ]
+    assert task_stub.cancelled_task_ids == []
+
+    # Once the last follower leaves, nobody waits for the run any more.
+    storage_stub.status_by_id[leader.id] = storage_stub.status_updates[-1][1]
+    storage_stub.tasks.append(
+        storage_stub.tasks[0].model_copy(update={"id": "follower-1", "leader_id": leader.id})
+    )
+    storage_stub.followers[leader.id] = []
+    await service.cancel_task("follower-1")
+
+    assert task_stub.cancelled_task_ids == [leader.id]
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import base64
+import heapq
+import json
+from collections import deque
+
+import pytest
+from celery.signals import after_task_publish
+from redis.exceptions import ResponseError
+
+from src.app.domain.models.payloads import ComputePiPayload
+from src.app.domain.models.task import Task
+from src.app.domain.models.task_metadata import TaskMetadata
+from src.app.domain.models.task_progress import TaskProgress
+from src.app.domain.models.task_state import TaskState
+from src.app.domain.models.task_status import TaskStatus
+from src.app.domain.models.task_type import TaskType
+from src.app.infrastructure.celery.app import celery_app, mark_task_sent
+from src.app.domain.models.execution_config import ExecutionConfig
+from src.app.domain.models.pacing import PacingConfig, PacingMode
+from src.app.infrastructure.celery.publisher import (
+    DEFAULT_PRIORITY_SEP,
+    RedisCeleryPublisher,
+    TaskMessage,
+    broker_queue_key,
+)
+from src.app.infrastructure.celery.task_registry import PRIORITY_STEPS
+from src.app.infrastructure.celery.repositories import CeleryTaskManager
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self._redis = redis
+        self._commands: list[tuple] = []
+
+    def lpush(self, key, value):
+        self._commands.append(("lpush", key, value))
+
+    def set(self, key, value, ex=None):
+        self._commands.append(("set", key, value, ex))
+
+    async def execute(self, raise_on_error=True):
+        replies = []
+        for command in self._commands:
+            self._redis.commands.append(command)
+            if command[0] != "lpush":
+                replies.append(True)
+            elif command[1].split(DEFAULT_PRIORITY_SEP)[0] in self._redis.rejected_queues:
+                replies.append(ResponseError("OOM command not allowed"))
+            else:
+                self._redis.lists.setdefault(command[1], deque()).appendleft(command[2])
+                replies.append(len(self._redis.lists[command[1]]))
+        return replies
+
+
+class FakeRedis:
+    def __init__(self, rejected_queues: set[str] | None = None) -> None:
+        self.commands: list[tuple] = []
+        self.lists: dict[str, deque[str]] = {}
+        self.rejected_queues = rejected_queues or set()
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+def _task(
+    task_id: str | None, task_type: TaskType, execution: ExecutionConfig | None = None
+) -> Task:
+    return Task(
+        id=task_id,
+        task_type=task_type,
+        payload=ComputePiPayload(digits=3),
+        status=TaskStatus(state=TaskState.QUEUED, progress=TaskProgress()),
+        metadata=TaskMetadata(),
+        execution=execution,
+    )
+
+
+def _decode(envelope: str) -> dict:
+    decoded = json.loads(envelope)
+    decoded["body"] = json.loads(base64.b64decode(decoded["body"]))
+    return decoded
+
+
+@pytest.mark.asyncio
+async def test_publish_writes_kombu_envelope_and_sent_meta():
+    redis = FakeRedis()
+    publisher = RedisCeleryPublisher(celery_app, redis, result_ttl_seconds=60)
+
+    await publisher.publish(
+        TaskMessage(task_id="task-1", name="compute_pi", args=({"payload": {"digits": 5}},))
+    )
+
+    (_, queue, raw), (_, meta_key, meta, ttl) = redis.commands
+    envelope = _decode(raw)
+    assert queue == "celery"
+    assert envelope["headers"]["task"] == "compute_pi"
+    assert envelope["headers"]["id"] == "task-1"
+    assert envelope["body"] == [[{"payload": {"digits": 5}}], {}, envelope["body"][2]]
+    assert envelope["properties"]["correlation_id"] == "task-1"
+    assert envelope["properties"]["body_encoding"] == "base64"
+    assert envelope["properties"]["delivery_info"] == {
+        "exchange": "celery",
+        "routing_key": "celery",
+    }
+    assert meta_key == b"celery-task-meta-task-1"
+    assert json.loads(meta)["status"] == "SENT"
+    assert ttl == 60
+
+
+@pytest.mark.asyncio
+async def test_enqueue_many_reports_rejected_messages_per_task():
+    redis = FakeRedis(rejected_queues={"doc-tasks"})
+    publisher = RedisCeleryPublisher(celery_app, redis, store_sent_state=False)
+    manager = CeleryTaskManager(publisher=publisher)
+    pi_task = _task("pi-1", TaskType.COMPUTE_PI)
+    doc_task = _task("doc-1", TaskType.DOCUMENT_ANALYSIS)
+    missing_id = _task(None, TaskType.COMPUTE_PI)
+
+    outcomes = await manager.enqueue_many([pi_task, doc_task, missing_id])
+
+    assert outcomes[0] == "pi-1"
+    assert isinstance(outcomes[1], ResponseError)
+    assert isinstance(outcomes[2], ValueError)
+    assert [command[1] for command in redis.commands] == [
+        "celery",
+        f"doc-tasks{DEFAULT_PRIORITY_SEP}6",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_execution_config_maps_to_message_options():
+    redis = FakeRedis()
+    manager = CeleryTaskManager(
+        publisher=RedisCeleryPublisher(celery_app, redis, store_sent_state=False)
+    )
+    execution = ExecutionConfig(
+        priority=9,
+        time_limit_seconds=30,
+        soft_time_limit_seconds=20,
+        pacing=PacingConfig(mode=PacingMode.FIXED, delay_seconds=0.5),
+    )
+
+    await manager.enqueue(_task("pi-1", TaskType.COMPUTE_PI, execution))
+
+    (_, key, raw), = redis.commands
+    envelope = _decode(raw)
+    assert key == f"celery{DEFAULT_PRIORITY_SEP}9"
+    assert envelope["properties"]["priority"] == 9
+    assert envelope["headers"]["timelimit"] == [30, 20]
+    (body,), _, _ = envelope["body"]
+    assert body["pacing"] == {"mode": "fixed", "delay_seconds": 0.5}
+
+
+def _drain(redis: FakeRedis, durations: dict[str, float], slots: int) -> dict[str, float]:
+    """
+    Replay a worker pool against the fake broker the way kombu's Redis channel polls it:
+    on every free slot, pop from the first non-empty list in priority-major key order.
+    Returns the queueing delay of each task id.
+    """
+    keys = [
+        broker_queue_key(celery_app, queue, step)
+        for step in PRIORITY_STEPS
+        for queue in ("celery", "doc-tasks")
+    ]
+    free_at = [0.0] * slots
+    heapq.heapify(free_at)
+    waits: dict[str, float] = {}
+    while any(redis.lists.get(key) for key in keys):
+        now = heapq.heappop(free_at)
+        key = next(key for key in keys if redis.lists.get(key))
+        task_id = _decode(redis.lists[key].pop())["headers"]["id"]
+        waits[task_id] = now
+        heapq.heappush(free_at, now + durations[task_id])
+    return waits
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pi_priority", [None, 9])
+async def test_priority_classes_isolate_short_tasks_from_long_scans(pi_priority):
+    redis = FakeRedis()
+    publisher = RedisCeleryPublisher(celery_app, redis, store_sent_state=False)
+    manager = CeleryTaskManager(publisher=publisher)
+    pi_execution = ExecutionConfig(priority=pi_priority)
+    scans = [_task(f"doc-{i}", TaskType.DOCUMENT_ANALYSIS) for i in range(20)]
+    pi_jobs = [_task(f"pi-{i}", TaskType.COMPUTE_PI, pi_execution) for i in range(5)]
+    durations = {task.id: 3600.0 for task in scans} | {task.id: 1.0 for task in pi_jobs}
+
+    await manager.enqueue_many(scans + pi_jobs)
+    waits = _drain(redis, durations, slots=2)
+
+    worst_pi_wait = max(waits[task.id] for task in pi_jobs)
+    if pi_priority is None:
+        # Default class: π jobs only wait for each other, never for the scans queued first.
+        assert worst_pi_wait < sum(durations[task.id] for task in pi_jobs)
+    else:
+        # Demoted below the scans' class, they wait for all 20 hour-long scans on 2 slots.
+        assert worst_pi_wait >= 10 * 3600.0
+
+
+def test_postgres_authority_disables_result_backend_writes():
+    receivers = [receiver() for _, receiver in after_task_publish.receivers]
+
+    assert celery_app.conf.task_ignore_result is True
+    assert mark_task_sent not in receivers
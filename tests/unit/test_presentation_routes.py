@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from src.app.domain.models.task_progress import TaskProgress
+from src.app.domain.models.task_result import TaskResult
 from src.app.domain.models.task_type import TaskType
 from src.app.domain.models.task_state import TaskState
 from src.app.domain.models.task_status import TaskStatus
@@ -38,6 +39,19 @@ def test_calculate_pi_enqueues_task_with_stub(api_client):
     assert enqueued.payload.digits == 3
 
 
+def test_calculate_pi_forwards_execution_config(api_client):
+    client, task_stub, _storage_stub = api_client
+
+    response = client.post(
+        "/calculate_pi", json={"n": 3, "execution": {"priority": 9, "time_limit_seconds": 60}}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["execution"]["priority"] == 9
+    execution = task_stub.enqueued_tasks[0].execution
+    assert (execution.priority, execution.time_limit_seconds) == (9, 60)
+
+
 def test_check_progress_requires_task_id(api_client):
     client, _task_stub, _storage_stub = api_client
 
@@ -58,6 +72,9 @@ def test_check_progress_returns_status_payload(api_client):
     response = client.get("/check_progress", params={"task_id": "job-1"})
 
     assert response.status_code == 200
+    # A plain poll is answered by a single status lookup that also yields the version.
+    assert (storage_stub.get_status_calls, storage_stub.get_status_version_calls) == (1, 0)
+    assert response.headers["ETag"] == '"s-0"'
     assert response.json() == {
         "state": "RUNNING",
         "progress": {
@@ -79,3 +96,205 @@ def test_check_progress_returns_404_for_missing_task(api_client):
 
     assert response.status_code == 404
     assert response.json()["detail"] == "Task with id 'missing' was not found."
+
+
+def test_check_progress_long_poll_returns_status_version(api_client):
+    client, _task_stub, storage_stub = api_client
+    storage_stub.status_by_id["job-2"] = TaskStatus(
+        state=TaskState.QUEUED,
+        progress=TaskProgress(),
+    )
+
+    first = client.get("/check_progress", params={"task_id": "job-2"})
+    version = first.headers["X-Status-Version"]
+    polled = client.get(
+        "/check_progress",
+        params={"task_id": "job-2", "since_version": version, "wait_ms": 10},
+    )
+
+    assert first.status_code == 200
+    assert polled.status_code == 200
+    assert polled.headers["X-Status-Version"] == version
+    assert polled.json()["state"] == "QUEUED"
+
+
+def test_check_progress_answers_if_none_match_with_304(api_client):
+    client, _task_stub, storage_stub = api_client
+    storage_stub.status_by_id["job-3"] = TaskStatus(
+        state=TaskState.RUNNING,
+        progress=TaskProgress(percentage=0.1),
+    )
+    storage_stub.status_versions["job-3"] = 4
+
+    first = client.get("/check_progress", params={"task_id": "job-3"})
+    etag = first.headers["ETag"]
+    calls_before = storage_stub.get_status_calls
+    cached = client.get(
+        "/check_progress", params={"task_id": "job-3"}, headers={"If-None-Match": etag}
+    )
+    storage_stub.status_versions["job-3"] = 5
+    changed = client.get(
+        "/check_progress", params={"task_id": "job-3"}, headers={"If-None-Match": etag}
+    )
+
+    assert etag == '"s-4"'
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert storage_stub.get_status_calls == calls_before + 1
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] == '"s-5"'
+
+
+def test_task_result_answers_if_none_match_with_304(api_client):
+    client, _task_stub, storage_stub = api_client
+    storage_stub.results_by_id["job-4"] = TaskResult(task_id="job-4", data={"pi": "3.14"})
+    storage_stub.result_versions["job-4"] = 1
+
+    first = client.get("/task_result", params={"task_id": "job-4"})
+    cached = client.get(
+        "/task_result",
+        params={"task_id": "job-4"},
+        headers={"If-None-Match": first.headers["ETag"]},
+    )
+
+    assert first.status_code == 200
+    assert first.json()["data"] == {"pi": "3.14"}
+    assert cached.status_code == 304
+    assert storage_stub.get_result_calls == 1
+
+
+def test_batch_status_returns_known_statuses_and_missing_ids(api_client):
+    client, _task_stub, storage_stub = api_client
+    storage_stub.status_by_id["job-5"] = TaskStatus(
+        state=TaskState.COMPLETED,
+        progress=TaskProgress(percentage=1.0),
+    )
+
+    response = client.post(
+        "/tasks/status:batch", json={"task_ids": ["job-5", "ghost", "job-5"]}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert list(body["statuses"]) == ["job-5"]
+    assert body["statuses"]["job-5"]["state"] == "COMPLETED"
+    assert body["missing"] == ["ghost"]
+
+
+def test_batch_status_rejects_empty_request(api_client):
+    client, _task_stub, _storage_stub = api_client
+
+    response = client.post("/tasks/status:batch", json={"task_ids": []})
+
+    assert response.status_code == 422
+
+
+def test_batch_create_reports_per_item_ids_and_errors(api_client):
+    client, task_stub, _storage_stub = api_client
+
+    response = client.post(
+        "/tasks:batch",
+        json={
+            "tasks": [
+                {"task_type": "compute_pi", "payload": {"digits": 3}},
+                {"task_type": "compute_pi", "payload": {"digits": 99}},
+                {"task_type": "document_analysis", "payload": {"keywords": ["whale"]}},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["index"] for item in items] == [0, 1, 2]
+    assert items[0]["id"] == "compute_pi-1"
+    assert items[0]["error"] is None
+    assert items[1]["id"] is None
+    assert "digits" in items[1]["error"]
+    assert items[2]["id"] == "document_analysis-2"
+    assert len(task_stub.enqueued_tasks) == 2
+
+
+def test_snippet_context_reads_around_compact_offsets(api_client, tmp_path):
+    client, _task_stub, _storage_stub = api_client
+    document = tmp_path / "moby.txt"
+    document.write_text("Call me Ishmael. The whale, the WHALE!\n")
+    created = client.post(
+        "/tasks/document-analysis",
+        json={
+            "document_path": str(document),
+            "keywords": ["ishmael", "whale"],
+            "snippet_mode": "compact",
+        },
+    ).json()
+
+    response = client.post(
+        f"/tasks/{created['id']}/snippets:context",
+        json={
+            "radius": 4,
+            "snippets": [{"keyword_id": 1, "offset": 32}, {"keyword_id": 0, "offset": 8}],
+        },
+    )
+
+    assert response.status_code == 200
+    assert [item["snippet"] for item in response.json()["snippets"]] == [
+        "the WHALE!\n",
+        " me Ishmael. Th",
+    ]
+
+
+def test_snippet_context_rejects_snippets_outside_the_task(api_client, tmp_path):
+    client, _task_stub, _storage_stub = api_client
+    document = tmp_path / "moby.txt"
+    document.write_text("whale\n")
+    created = client.post(
+        "/tasks/document-analysis",
+        json={"document_path": str(document), "keywords": ["whale"], "snippet_mode": "compact"},
+    ).json()
+    url = f"/tasks/{created['id']}/snippets:context"
+
+    assert client.post(url, json={"snippets": [{"keyword_id": 1, "offset": 0}]}).status_code == 400
+    assert client.post(url, json={"snippets": [{"keyword_id": 0, "offset": 9}]}).status_code == 400
+    missing = client.post(
+        "/tasks/unknown/snippets:context", json={"snippets": [{"keyword_id": 0, "offset": 0}]}
+    )
+    assert missing.status_code == 404
+    document.unlink()
+    assert client.post(url, json={"snippets": [{"keyword_id": 0, "offset": 0}]}).status_code == 404
+
+
+def test_snippet_context_rejects_documents_outside_the_documents_dir(api_client, tmp_path):
+    client, _task_stub, _storage_stub = api_client
+    created = client.post(
+        "/tasks/document-analysis",
+        json={"document_path": "/etc/passwd", "keywords": ["root"], "snippet_mode": "compact"},
+    ).json()
+    escape = tmp_path / "escape.txt"
+    escape.symlink_to("/etc/passwd")
+    linked = client.post(
+        "/tasks/document-analysis",
+        json={"document_path": str(escape), "keywords": ["root"], "snippet_mode": "compact"},
+    ).json()
+
+    for task in (created, linked):
+        response = client.post(
+            f"/tasks/{task['id']}/snippets:context",
+            json={"snippets": [{"keyword_id": 0, "offset": 0}]},
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"] == "document_path is outside the documents directory"
+
+
+def test_cancel_flags_running_tasks_and_rejects_finished_ones(api_client):
+    client, task_stub, storage_stub = api_client
+    task_id = client.post("/calculate_pi", json={"n": 3}).json()["id"]
+
+    response = client.post(f"/tasks/{task_id}/cancel")
+
+    assert response.status_code == 202
+    assert response.json()["state"] == "QUEUED"
+    assert task_stub.cancelled_task_ids == [task_id]
+
+    storage_stub.tasks[0].status = TaskStatus(state=TaskState.COMPLETED, progress=TaskProgress())
+    assert client.post(f"/tasks/{task_id}/cancel").status_code == 409
+    assert client.post("/tasks/missing/cancel").status_code == 404
+    assert task_stub.cancelled_task_ids == [task_id]
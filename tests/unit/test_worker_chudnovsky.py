@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import billiard
+import pytest
+from mpmath import mp
+
+from src.app.worker import chudnovsky
+from src.app.worker.chudnovsky import divide, pi_decimals, to_decimal_string
+
+
+def _mpmath_decimals(count: int) -> str:
+    with mp.workdps(count + 20):
+        return str(mp.pi)[2 : 2 + count]
+
+
+@pytest.mark.parametrize("count", [1, 13, 14, 15, 1000, 5000])
+def test_pi_decimals_match_mpmath(count):
+    assert pi_decimals(count) == _mpmath_decimals(count)
+
+
+def test_pi_decimals_in_a_process_pool_match_serial(monkeypatch):
+    monkeypatch.setattr(chudnovsky, "MIN_TERMS_PER_PROCESS", 50)
+
+    assert pi_decimals(3000, processes=3) == pi_decimals(3000)
+
+
+def _pi_decimals_into(results, count: int, processes: int) -> None:
+    try:
+        results.put(pi_decimals(count, processes))
+    except BaseException as exc:
+        results.put(repr(exc))
+
+
+def test_process_pool_split_runs_inside_a_daemonic_process(monkeypatch):
+    # Celery's prefork pool runs tasks in daemonic billiard children.
+    monkeypatch.setattr(chudnovsky, "MIN_TERMS_PER_PROCESS", 50)
+    results = billiard.Queue()
+    child = billiard.Process(target=_pi_decimals_into, args=(results, 3000, 3), daemon=True)
+    child.start()
+    try:
+        assert results.get(timeout=60) == _mpmath_decimals(3000)
+    finally:
+        child.join(timeout=10)
+
+
+def test_decimal_string_splits_large_values():
+    value = 7 * 10**5001 + 12
+
+    assert to_decimal_string(value, 5005) == "0007" + "0" * 4999 + "12"
+
+
+def test_newton_division_is_exact():
+    a = 3**200_000 + 12345
+    b = 7**40_000 + 1
+
+    assert divide(a, b) == a // b
+    assert divide(b * 5**30_000, b) == 5**30_000
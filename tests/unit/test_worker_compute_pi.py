@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import importlib
+
+import inject
+import pytest
+
+from src.app.domain.events.task_event import EventType, TaskEvent
+from src.app.domain.repositories import TaskCancellationRepository, TaskEventPublisherRepository
+
+compute_pi_module = importlib.import_module("src.app.worker.tasks.compute_pi")
+reporter_module = importlib.import_module("src.app.worker.reporter")
+
+
+class RecordingPublisher:
+    def __init__(self) -> None:
+        self.events: list[TaskEvent] = []
+
+    def publish(self, event: TaskEvent) -> None:
+        self.events.append(event)
+
+
+class CancelAfterDigits:
+    """Requests cancellation once ``digits`` result chunks have been published."""
+
+    def __init__(self, publisher: RecordingPublisher, digits: int) -> None:
+        self._publisher = publisher
+        self._digits = digits
+
+    def is_cancel_requested(self, task_id: str) -> bool:
+        chunks = [e for e in self._publisher.events if e.type == EventType.TASK_RESULT_CHUNK]
+        return len(chunks) >= self._digits
+
+
+@pytest.fixture
+def publisher(monkeypatch) -> RecordingPublisher:
+    recording = RecordingPublisher()
+    cancellation = CancelAfterDigits(recording, 3)
+
+    def fake_instance(interface: object) -> object:
+        if interface is TaskEventPublisherRepository:
+            return recording
+        if interface is TaskCancellationRepository:
+            return cancellation
+        raise RuntimeError(f"Unexpected dependency request: {interface}")
+
+    monkeypatch.setattr(inject, "instance", fake_instance)
+    monkeypatch.setattr(compute_pi_module._settings, "PACING_MODE", "none")
+    monkeypatch.setattr(compute_pi_module, "stream_pi", lambda digits: iter("3.14159265"))
+    monkeypatch.setattr(reporter_module, "CANCEL_CHECK_SECONDS", 0)
+    return recording
+
+
+def test_cancellation_stops_streaming_digits(publisher):
+    message = {"task_type": "compute_pi", "payload": {"digits": 9}}
+
+    outcome = compute_pi_module.compute_pi.apply(args=(message,), task_id="pi-1").get()
+
+    statuses = [e.payload["status"] for e in publisher.events if e.type == EventType.TASK_STATUS]
+    assert statuses[-1]["state"] == "CANCELLED"
+    assert outcome["cancelled"] is True
+    assert outcome["digits_sent"] == 3
+    assert statuses[-1]["progress"]["current"] == 3
+    assert not [e for e in publisher.events if e.type == EventType.TASK_RESULT]
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import base64
+import functools
+import importlib
+import sys
+import threading
+import time
+from array import array
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import inject
+import pytest
+
+from src.app.domain.events.task_event import EventType, TaskEvent
+from src.app.domain.repositories import TaskCancellationRepository, TaskEventPublisherRepository
+from src.app.worker.download_cache import DownloadCache
+from src.app.worker.inverted_index import DocumentIndexStore
+from src.app.worker.reporter import from_columns
+
+document_analysis_module = importlib.import_module("src.app.worker.tasks.document_analysis")
+document_analysis = document_analysis_module.document_analysis
+
+
+class RecordingPublisher:
+    def __init__(self) -> None:
+        self.events: list[TaskEvent] = []
+
+    def publish(self, event: TaskEvent) -> None:
+        self.events.append(event)
+
+
+class CancellationFlags:
+    def __init__(self) -> None:
+        self.cancelled: set[str] = set()
+
+    def is_cancel_requested(self, task_id: str) -> bool:
+        return task_id in self.cancelled
+
+
+@pytest.fixture
+def cancellation() -> CancellationFlags:
+    return CancellationFlags()
+
+
+@pytest.fixture
+def publisher(monkeypatch, tmp_path, cancellation) -> RecordingPublisher:
+    recording = RecordingPublisher()
+
+    def fake_instance(interface: object) -> object:
+        if interface is TaskEventPublisherRepository:
+            return recording
+        if interface is TaskCancellationRepository:
+            return cancellation
+        raise RuntimeError(f"Unexpected dependency request: {interface}")
+
+    monkeypatch.setattr(inject, "instance", fake_instance)
+    monkeypatch.setattr(document_analysis_module._settings, "PACING_MODE", "none")
+    monkeypatch.setattr(document_analysis_module._settings, "DOC_SCAN_PROCESSES", 1)
+    monkeypatch.setattr(
+        document_analysis_module, "_index_store", DocumentIndexStore(tmp_path / "index", max_bytes=1 << 30)
+    )
+    return recording
+
+
+def _run(payload: dict) -> None:
+    message = {"task_type": "document_analysis", "payload": payload}
+    document_analysis.apply(args=(message,), task_id="doc-1")
+
+
+def _snippets(publisher: RecordingPublisher) -> list[dict]:
+    return [
+        item
+        for event in publisher.events
+        if event.type == EventType.TASK_RESULT_CHUNK
+        for item in from_columns(event.payload["data"])
+    ]
+
+
+def _statuses(publisher: RecordingPublisher) -> list[dict]:
+    return [
+        event.payload["status"] for event in publisher.events if event.type == EventType.TASK_STATUS
+    ]
+
+
+def test_documents_are_scanned_in_one_task_and_snippets_tagged_by_file(tmp_path, publisher):
+    first = tmp_path / "a.txt"
+    second = tmp_path / "b.txt"
+    first.write_text("the whale\nno match\n")
+    second.write_text("a Whale and a whale\n")
+
+    _run(
+        {
+            "document_path": str(first),
+            "documents": [
+                {"document_path": str(second)},
+                {"document_path": str(tmp_path / "missing.txt")},
+            ],
+            "keywords": ["whale"],
+        }
+    )
+
+    snippets = _snippets(publisher)
+    assert sorted((item["file"], item["location"]["line"]) for item in snippets) == [
+        (str(first), 1),
+        (str(second), 1),
+        (str(second), 1),
+    ]
+    final = _statuses(publisher)[-1]
+    assert final["state"] == "COMPLETED"
+    assert final["progress"]["total"] == first.stat().st_size + second.stat().st_size
+    assert final["metrics"]["documents_done"] == 2
+    assert final["metrics"]["documents_failed"] == 1
+    percentages = [status["progress"]["percentage"] for status in _statuses(publisher)]
+    assert percentages == sorted(percentages)
+    (result,) = [event for event in publisher.events if event.type == EventType.TASK_RESULT]
+    assert result.payload["result"]["snippets_emitted"] == 3
+    assert result.payload["result"]["documents_failed"] == [
+        f"document_path not found: {tmp_path / 'missing.txt'}"
+    ]
+
+
+def test_task_fails_when_every_document_fails(tmp_path, publisher):
+    _run({"document_path": str(tmp_path / "missing.txt"), "keywords": ["whale"]})
+
+    final = _statuses(publisher)[-1]
+    assert final["state"] == "FAILED"
+    assert final["message"] == f"document_path not found: {tmp_path / 'missing.txt'}"
+
+
+def test_urls_are_scanned_while_downloading_into_the_cache(tmp_path, publisher, monkeypatch):
+    books = tmp_path / "books"
+    books.mkdir()
+    (books / "moby.txt").write_bytes(b"call me ishmael\nthe whale\n" * 50)
+    handler = functools.partial(SimpleHTTPRequestHandler, directory=str(books))
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    cache = DownloadCache(tmp_path / "cache", max_bytes=1 << 20, revalidate_after=3600)
+    monkeypatch.setattr(document_analysis_module, "_download_cache", cache)
+    url = f"http://127.0.0.1:{httpd.server_address[1]}/moby.txt"
+    try:
+        _run({"document_url": url, "keywords": ["whale"]})
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    snippets = _snippets(publisher)
+    assert [item["location"]["line"] for item in snippets] == list(range(2, 101, 2))
+    assert {item["file"] for item in snippets} == {str(cache.path_for(url))}
+    assert cache.path_for(url).read_bytes() == (books / "moby.txt").read_bytes()
+    statuses = _statuses(publisher)
+    assert "downloading" in [status["progress"]["phase"] for status in statuses]
+    assert statuses[-2]["progress"]["phase"] == "scanning"
+    assert statuses[-1]["metrics"]["bytes_downloaded"] == 1300
+
+
+def test_repeated_queries_are_answered_from_the_document_index(tmp_path, publisher):
+    document = tmp_path / "moby.txt"
+    document.write_text("Call me Ishmael.\nThe whale, the WHALE!\n")
+
+    _run({"document_path": str(document), "keywords": ["whale", "ishmael"]})
+    first = _snippets(publisher)
+    publisher.events.clear()
+    _run({"document_path": str(document), "keywords": ["whale", "ishmael"]})
+
+    assert len(list((tmp_path / "index").glob("*.idx"))) == 1
+    assert _snippets(publisher) == first
+    assert [(item["keyword"], item["location"]["line"]) for item in first] == [
+        ("Ishmael", 1),
+        ("whale", 2),
+        ("WHALE", 2),
+    ]
+    assert _statuses(publisher)[-1]["metrics"]["words_processed"] == 7
+
+
+def test_compact_mode_emits_packed_offsets_per_window(tmp_path, publisher):
+    document = tmp_path / "moby.txt"
+    document.write_text("Call me Ishmael.\nThe whale, the WHALE!\n")
+
+    _run(
+        {
+            "document_path": str(document),
+            "keywords": ["whale", "ishmael", "WHALE"],
+            "snippet_mode": "compact",
+        }
+    )
+
+    (item,) = _snippets(publisher)
+    packed = array("Q", base64.b64decode(item["hits"]))
+    if sys.byteorder == "big":
+        packed.byteswap()
+    assert (item["type"], item["file"], item["document"], item["count"]) == (
+        "snippet_offsets",
+        str(document),
+        0,
+        3,
+    )
+    triples = list(zip(packed[0::3], packed[1::3], packed[2::3]))
+    assert triples == [(1, 8, 1), (0, 21, 2), (0, 32, 2)]
+    assert _statuses(publisher)[-1]["metrics"]["snippets_emitted"] == 3
+
+
+def test_compact_mode_maps_non_ascii_matches_to_their_keyword(tmp_path, publisher):
+    document = tmp_path / "aerger.txt"
+    document.write_text("ärger ÄRGER\n", encoding="utf-8")
+
+    _run({"document_path": str(document), "keywords": ["Ärger"], "snippet_mode": "compact"})
+
+    (item,) = _snippets(publisher)
+    packed = array("Q", base64.b64decode(item["hits"]))
+    if sys.byteorder == "big":
+        packed.byteswap()
+    assert list(packed) == [0, 0, 1, 0, 7, 1]
+
+
+def test_status_is_reported_per_window_not_per_snippet(tmp_path, publisher):
+    document = tmp_path / "book.txt"
+    document.write_text("whale " * 500 + "\n")
+
+    _run({"document_path": str(document), "keywords": ["whale"]})
+
+    assert len(_snippets(publisher)) == 500
+    assert len(_statuses(publisher)) < 10
+    chunks = [event for event in publisher.events if event.type == EventType.TASK_RESULT_CHUNK]
+    watermarks = [event.payload["progress"] for event in chunks]
+    assert all(watermark["total"] == document.stat().st_size for watermark in watermarks)
+    assert [watermark["percentage"] for watermark in watermarks] == sorted(
+        watermark["percentage"] for watermark in watermarks
+    )
+    assert watermarks[-1]["percentage"] == 1.0
+
+
+def test_cancelled_task_stops_scanning_and_reports_cancelled(tmp_path, publisher, cancellation):
+    documents = []
+    for name in "abc":
+        document = tmp_path / f"{name}.txt"
+        document.write_text("the whale\n")
+        documents.append({"document_path": str(document)})
+    cancellation.cancelled.add("doc-1")
+
+    _run({"documents": documents, "keywords": ["whale"]})
+
+    final = _statuses(publisher)[-1]
+    assert final["state"] == "CANCELLED"
+    assert final["metrics"]["documents_done"] < 3
+    assert not [event for event in publisher.events if event.type == EventType.TASK_RESULT]
+
+
+def test_cancelled_task_does_not_wait_for_running_scanners(
+    tmp_path, publisher, cancellation, monkeypatch
+):
+    document = tmp_path / "a.txt"
+    document.write_text("the whale\n")
+    release = threading.Event()
+
+    def stuck_scan(*args) -> None:
+        release.wait(timeout=10)
+
+    monkeypatch.setattr(document_analysis_module, "_scan_document", stuck_scan)
+    cancellation.cancelled.add("doc-1")
+    try:
+        started = time.monotonic()
+        _run({"document_path": str(document), "keywords": ["whale"]})
+
+        assert time.monotonic() - started < 5
+        assert _statuses(publisher)[-1]["state"] == "CANCELLED"
+    finally:
+        release.set()
+
+
+def test_dense_documents_emit_every_snippet(tmp_path, publisher):
+    document = tmp_path / "dense.txt"
+    document.write_text("the cat and the hat on the mat\n" * 5000)
+
+    _run({"document_path": str(document), "keywords": ["the"]})
+
+    assert len(_snippets(publisher)) == 15000
+    assert _statuses(publisher)[-1]["metrics"]["snippets_emitted"] == 15000
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.app.worker.download_cache import DownloadCache
+
+
+@dataclass
+class BookServer:
+    """Serves ``documents`` with an ETag and counts full and 304 responses per path."""
+
+    url: str
+    documents: dict[str, bytes] = field(default_factory=dict)
+    etags: dict[str, str] = field(default_factory=dict)
+    downloads: dict[str, int] = field(default_factory=dict)
+    not_modified: int = 0
+    delay: threading.Event | None = None
+
+
+@pytest.fixture
+def server() -> Iterator[BookServer]:
+    state = BookServer(url="")
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            body = state.documents.get(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            etag = state.etags.get(self.path, '"v1"')
+            if self.headers.get("If-None-Match") == etag:
+                state.not_modified += 1
+                self.send_response(304)
+                self.end_headers()
+                return
+            if state.delay is not None:
+                state.delay.wait(5)
+            state.downloads[self.path] = state.downloads.get(self.path, 0) + 1
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    state.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    try:
+        yield state
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_urls_with_the_same_basename_are_cached_separately(tmp_path, server):
+    server.documents = {"/a/book.txt": b"first book\n", "/b/book.txt": b"second book\n"}
+    cache = DownloadCache(tmp_path, max_bytes=1 << 20, revalidate_after=3600)
+
+    first = cache.fetch(f"{server.url}/a/book.txt")
+    second = cache.fetch(f"{server.url}/b/book.txt")
+
+    assert first != second
+    assert first.read_bytes() == b"first book\n"
+    assert second.read_bytes() == b"second book\n"
+    assert cache.fetch(f"{server.url}/a/book.txt") == first
+    assert server.downloads == {"/a/book.txt": 1, "/b/book.txt": 1}
+    assert server.not_modified == 0
+
+
+def test_concurrent_fetches_of_one_url_download_it_once(tmp_path, server):
+    server.documents = {"/book.txt": b"whale\n" * 1000}
+    server.delay = threading.Event()
+    cache = DownloadCache(tmp_path, max_bytes=1 << 20, revalidate_after=3600)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(cache.fetch, f"{server.url}/book.txt") for _ in range(4)]
+        server.delay.set()
+        paths = {future.result() for future in futures}
+
+    assert len(paths) == 1
+    assert paths.pop().read_bytes() == b"whale\n" * 1000
+    assert server.downloads == {"/book.txt": 1}
+    assert not [name for name in os.listdir(tmp_path) if name.startswith(".")]
+
+
+def test_stale_copies_are_revalidated_and_replaced_when_changed(tmp_path, server):
+    server.documents = {"/book.txt": b"edition one\n"}
+    cache = DownloadCache(tmp_path, max_bytes=1 << 20, revalidate_after=0)
+    url = f"{server.url}/book.txt"
+
+    path = cache.fetch(url)
+    assert cache.fetch(url) == path
+    assert server.not_modified == 1
+    assert server.downloads == {"/book.txt": 1}
+
+    server.documents["/book.txt"] = b"edition two\n"
+    server.etags["/book.txt"] = '"v2"'
+    assert cache.fetch(url).read_bytes() == b"edition two\n"
+    assert server.downloads == {"/book.txt": 2}
+
+
+def test_cached_copy_is_served_when_revalidation_fails(tmp_path, server):
+    server.documents = {"/book.txt": b"whale\n"}
+    cache = DownloadCache(tmp_path, max_bytes=1 << 20, revalidate_after=0)
+    url = f"{server.url}/book.txt"
+    path = cache.fetch(url)
+
+    del server.documents["/book.txt"]
+
+    assert cache.fetch(url) == path
+    assert path.read_bytes() == b"whale\n"
+    with pytest.raises(OSError):
+        cache.fetch(f"{server.url}/missing.txt")
+
+
+def test_least_recently_used_documents_are_evicted_over_the_limit(tmp_path, server):
+    server.documents = {f"/{name}.txt": name.encode() * 100 for name in "abc"}
+    cache = DownloadCache(tmp_path, max_bytes=250, revalidate_after=3600)
+    a = cache.fetch(f"{server.url}/a.txt")
+    b = cache.fetch(f"{server.url}/b.txt")
+    os.utime(b, (1, 1))
+    os.utime(a, (2, 2))
+
+    c = cache.fetch(f"{server.url}/c.txt")
+
+    assert a.exists() and c.exists()
+    assert not b.exists()
+    assert not b.with_suffix(".json").exists()
+    cache.fetch(f"{server.url}/b.txt")
+    assert server.downloads["/b.txt"] == 2
+
+
+def test_streamed_body_is_committed_only_when_fully_read(tmp_path, server):
+    server.documents = {"/book.txt": b"whale\n" * 1000}
+    cache = DownloadCache(tmp_path, max_bytes=1 << 20, revalidate_after=3600)
+    url = f"{server.url}/book.txt"
+
+    with cache.open(url) as download:
+        assert download.size == 6000
+        next(download.blocks)
+        assert not download.path.exists()
+    assert not download.path.exists()
+
+    with cache.open(url) as download:
+        assert b"".join(download.blocks) == b"whale\n" * 1000
+    assert download.path.read_bytes() == b"whale\n" * 1000
+
+    with cache.open(url) as download:
+        assert download.blocks is None
+    assert server.downloads == {"/book.txt": 2}
+
+
+def test_readers_of_a_cached_copy_do_not_wait_for_each_other(tmp_path, server):
+    server.documents = {"/book.txt": b"whale\n"}
+    cache = DownloadCache(tmp_path, max_bytes=1 << 20, revalidate_after=3600)
+    url = f"{server.url}/book.txt"
+    cache.fetch(url)
+    inside = threading.Barrier(2, timeout=5)
+
+    def read() -> bytes:
+        with cache.open(url) as download:
+            inside.wait()
+            return download.path.read_bytes()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = [future.result() for future in [executor.submit(read) for _ in range(2)]]
+
+    assert results == [b"whale\n", b"whale\n"]
+
+
+def test_documents_in_use_are_not_evicted(tmp_path, server):
+    server.documents = {f"/{name}.txt": name.encode() * 100 for name in "ab"}
+    cache = DownloadCache(tmp_path, max_bytes=150, revalidate_after=3600)
+    a = cache.fetch(f"{server.url}/a.txt")
+    os.utime(a, (1, 1))
+
+    with cache.open(f"{server.url}/a.txt") as download:
+        os.utime(download.path, (1, 1))
+        b = cache.fetch(f"{server.url}/b.txt")
+        assert a.exists() and b.exists()
+
+    assert cache.evict() == 100
+    assert not a.exists()
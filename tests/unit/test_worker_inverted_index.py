@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import random
+import string
+
+import pytest
+
+from src.app.worker import matching
+from src.app.worker.inverted_index import DocumentIndexStore, is_indexable
+from src.app.worker.scanning import DocumentScanner
+
+WORDS = ["whale", "Whale", "WHALES", "aaaa", "she", "ushers", "he", "hers", "naïve"]
+
+
+@pytest.fixture
+def document(tmp_path):
+    rng = random.Random(3)
+    words = WORDS + [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 6))) for _ in range(50)
+    ]
+    text = "".join(rng.choice(words) + rng.choice([" ", "\n", ", ", "-"]) for _ in range(3000))
+    path = tmp_path / "document.txt"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def _windows(windows):
+    return [
+        (window.index, window.start, window.end, window.lines, window.hits) for window in windows
+    ]
+
+
+@pytest.mark.parametrize(
+    "keywords", [["whale"], ["aa"], ["he", "she", "hers", "ushers"], ["naïve", "whale"]]
+)
+@pytest.mark.parametrize("aho_corasick_min_keywords", [1, 100])
+def test_index_answers_queries_exactly_like_a_scan(
+    document, tmp_path, monkeypatch, keywords, aho_corasick_min_keywords
+):
+    monkeypatch.setattr(matching, "AHO_CORASICK_MIN_KEYWORDS", aho_corasick_min_keywords)
+    scanner = DocumentScanner(keywords, window_bytes=64)
+    store = DocumentIndexStore(tmp_path / "index", max_bytes=1 << 30)
+
+    with store.open(document) as index:
+        indexed = list(scanner.scan_indexed(document, index))
+
+    assert _windows(indexed) == _windows(scanner.scan(document))
+    assert sum(window.words for window in indexed) == len(document.read_bytes().split())
+
+
+def test_index_is_built_once_per_content(document, tmp_path):
+    copy = tmp_path / "copy.txt"
+    copy.write_bytes(document.read_bytes())
+    store = DocumentIndexStore(tmp_path / "index", max_bytes=1 << 30)
+
+    with store.open(document) as index:
+        size = index.size
+    with store.open(copy):
+        pass
+
+    assert size == document.stat().st_size
+    assert len(list((tmp_path / "index").glob("*.idx"))) == 1
+
+
+def test_only_single_token_keywords_are_indexable():
+    assert is_indexable("Whale")
+    assert is_indexable("naïve")
+    assert not is_indexable("moby dick")
+    assert not is_indexable("whale!")
+    assert not DocumentScanner(["whale", "sperm whale"]).indexable
+
+
+def test_indexed_scan_keeps_every_hit_of_a_dense_document(tmp_path):
+    path = tmp_path / "dense.txt"
+    path.write_bytes(b"the cat and the hat on the mat\n" * 20000)
+    store = DocumentIndexStore(tmp_path / "index", max_bytes=1 << 30)
+
+    with store.open(path) as index:
+        windows = list(DocumentScanner(["the"]).scan_indexed(path, index))
+
+    assert sum(len(window.hits) for window in windows) == 60000
+
+
+def test_index_folds_non_ascii_keywords(tmp_path):
+    path = tmp_path / "aerger.txt"
+    path.write_text("Ärger und ärger\nÄRGER\n" * 100, encoding="utf-8")
+    store = DocumentIndexStore(tmp_path / "index", max_bytes=1 << 30)
+    scanner = DocumentScanner(["Ärger"], window_bytes=64)
+
+    with store.open(path) as index:
+        indexed = list(scanner.scan_indexed(path, index))
+
+    assert sum(len(window.hits) for window in indexed) == 300
+    assert _windows(indexed) == _windows(scanner.scan(path))
+
+
+def test_unchanged_documents_are_hashed_once(document, tmp_path, monkeypatch):
+    from src.app.worker import inverted_index
+
+    hashed: list[str] = []
+    file_digest = inverted_index.hashlib.file_digest
+
+    def counting_digest(handle, name):
+        hashed.append(handle.name)
+        return file_digest(handle, name)
+
+    monkeypatch.setattr(inverted_index.hashlib, "file_digest", counting_digest)
+    store = DocumentIndexStore(tmp_path / "index", max_bytes=1 << 30)
+
+    for _ in range(3):
+        with store.open(document):
+            pass
+    assert len(hashed) == 1
+
+    document.write_bytes(document.read_bytes() + b" whale\n")
+    with store.open(document) as index:
+        assert index.size == document.stat().st_size
+    assert len(hashed) == 2
+
+    # A known digest (e.g. from the download cache) is used as is.
+    with store.open(document, digest="f" * 64) as index:
+        assert index.size == document.stat().st_size
+    assert len(hashed) == 2
+
+
+def test_least_recently_used_indexes_are_evicted_over_the_limit(tmp_path):
+    documents = []
+    for name in "abc":
+        path = tmp_path / f"{name}.txt"
+        path.write_text(f"{name}whale {name}sea\n" * 200)
+        documents.append(path)
+    store = DocumentIndexStore(tmp_path / "index", max_bytes=1)
+    a, b, c = documents
+
+    with store.open(a):
+        pass
+    with store.open(b) as index:
+        assert index.size == b.stat().st_size
+
+    assert [path.name for path in (tmp_path / "index").glob("*.idx")] == [
+        store.index_path(store._digest(b)).name
+    ]
+    assert len(list((tmp_path / "index" / "digests").iterdir())) == 1
+
+    with store.open(c):
+        pass
+    assert len(list((tmp_path / "index").glob("*.idx"))) == 1
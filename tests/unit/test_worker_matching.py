@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import pytest
+
+from src.app.worker.matching import (
+    AhoCorasickMatcher,
+    DecodingMatcher,
+    RegexMatcher,
+    build_matcher,
+)
+
+
+def _spans(matcher, text: str) -> list[tuple[int, int, str]]:
+    return [(match.start, match.end, match.text) for match in matcher.finditer(text)]
+
+
+def test_aho_corasick_reports_overlapping_and_nested_matches():
+    matcher = AhoCorasickMatcher(["he", "she", "his", "HERS"])
+
+    assert _spans(matcher, "uSHers his") == [
+        (1, 4, "SHe"),
+        (2, 4, "He"),
+        (2, 6, "Hers"),
+        (7, 10, "his"),
+    ]
+
+
+def test_aho_corasick_agrees_with_regex_on_non_overlapping_keywords():
+    keywords = ["whale", "Ahab", "sea", "harpoon"]
+    text = "Call me Ishmael. The WHALE, the sea and ahab's harpoon; Whales at sea."
+
+    assert _spans(AhoCorasickMatcher(keywords), text) == _spans(RegexMatcher(keywords), text)
+
+
+def test_case_folding_keeps_offsets_in_the_original_text():
+    # "İ".lower() is two code points; offsets must still index the original string.
+    text = "İstanbul and Straße"
+
+    assert _spans(AhoCorasickMatcher(["and", "straße"]), text) == [
+        (9, 12, "and"),
+        (13, 19, "Straße"),
+    ]
+
+
+def test_build_matcher_switches_to_aho_corasick_at_the_threshold():
+    assert isinstance(build_matcher(["a", "b"], aho_corasick_min_keywords=3), RegexMatcher)
+    assert isinstance(
+        build_matcher(["a", "b", "c"], aho_corasick_min_keywords=3), AhoCorasickMatcher
+    )
+
+
+@pytest.mark.parametrize("aho_corasick_min_keywords", [1, 100])
+@pytest.mark.parametrize("keyword", ["Ärger", "ärger", "ÄRGER"])
+def test_binary_matchers_fold_non_ascii_keywords(keyword, aho_corasick_min_keywords):
+    # The stray 0xff byte is not UTF-8; offsets after it must still be byte offsets.
+    text = "kein Ärger, viel ärger".encode() + b"\xff " + "ÄRGER".encode()
+    matcher = build_matcher([keyword], aho_corasick_min_keywords, binary=True)
+
+    assert isinstance(matcher, DecodingMatcher)
+    assert [(match.start, match.text) for match in matcher.finditer(text)] == [
+        (5, "Ärger".encode()),
+        (18, "ärger".encode()),
+        (26, "ÄRGER".encode()),
+    ]
+    assert [match.start for match in matcher.finditer(text, 18)] == [18, 26]
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import pytest
+
+from src.app.domain.models.pacing import PacingMode
+from src.app.worker import pacing as pacing_module
+from src.app.worker.pacing import Pacer
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    recorded: list[float] = []
+    monkeypatch.setattr(pacing_module.time, "sleep", recorded.append)
+    return recorded
+
+
+def test_worker_defaults_apply_without_a_task_override(sleeps):
+    pacer = Pacer.for_task({"payload": {}}, default_mode="none", default_delay=0.1)
+
+    pacer.pause()
+
+    assert pacer.mode == PacingMode.NONE
+    assert sleeps == []
+
+
+def test_task_override_replaces_mode_and_falls_back_to_default_delay(sleeps):
+    fixed = Pacer.for_task(
+        {"pacing": {"mode": "fixed", "delay_seconds": 0.25}},
+        default_mode="none",
+        default_delay=0.1,
+    )
+    demo = Pacer.for_task(
+        {"pacing": {"mode": "random"}}, default_mode="none", default_delay=0.1
+    )
+
+    fixed.pause()
+    for _ in range(50):
+        demo.pause()
+
+    assert sleeps[0] == 0.25
+    assert all(0.0 <= delay <= 0.2 for delay in sleeps[1:])
+
+
+def test_override_can_disable_worker_pacing(sleeps):
+    pacer = Pacer.for_task({"pacing": {"mode": "none"}}, default_mode="random", default_delay=1.0)
+
+    pacer.pause()
+
+    assert not pacer.enabled
+    assert sleeps == []
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from decimal import ROUND_HALF_UP, Decimal, localcontext
+
+from mpmath import mp
+
+from src.app.worker import pi_store as pi_store_module
+from src.app.worker.pi_store import PiDigitStore
+
+
+def _mpmath_pi(digits: int) -> str:
+    with mp.workdps(digits):
+        return str(mp.pi)
+
+
+def test_store_serves_prefixes_and_ranges_from_one_computation(tmp_path, monkeypatch):
+    computed: list[int] = []
+    real_compute = pi_store_module.compute_pi_decimals
+
+    def _compute(count: int, processes: int = 1) -> str:
+        computed.append(count)
+        return real_compute(count, processes)
+
+    monkeypatch.setattr(pi_store_module, "compute_pi_decimals", _compute)
+    store = PiDigitStore(tmp_path / "pi.bin", min_digits=200)
+
+    assert store.pi(1) == "3"
+    assert store.pi(3) == "3.14"
+    assert store.pi(150, rounding="ROUND") == _mpmath_pi(150)
+    assert store.decimals(10, 20) == _mpmath_pi(31)[12:22]
+    assert computed == [200]
+    assert (tmp_path / "pi.bin").stat().st_size == 200
+
+
+def test_store_truncates_by_default_and_rounds_on_request(tmp_path):
+    store = PiDigitStore(tmp_path / "pi.bin")
+
+    # 3.14159|2... and 3.141592|6...
+    assert store.pi(6) == "3.14159"
+    assert store.pi(7) == "3.141592"
+    assert store.pi(7, rounding="ROUND") == "3.141593"
+
+
+def test_store_grows_lazily_and_is_shared_between_instances(tmp_path):
+    path = tmp_path / "pi.bin"
+    first = PiDigitStore(path, min_digits=50)
+    assert first.decimals(0, 10) == "1415926535"
+    assert path.stat().st_size == 50
+
+    assert first.pi(500) == _mpmath_pi(520)[:501]
+    assert path.stat().st_size == 500
+
+    second = PiDigitStore(path)
+    assert second.decimals(490, 499) == first.decimals(490, 499)
+    assert path.stat().st_size == 500
+
+
+def test_iter_pi_yields_the_first_block_before_computing_the_rest(tmp_path, monkeypatch):
+    computed: list[int] = []
+    real_compute = pi_store_module.compute_pi_decimals
+
+    def _compute(count: int, processes: int = 1) -> str:
+        computed.append(count)
+        return real_compute(count, processes)
+
+    monkeypatch.setattr(pi_store_module, "compute_pi_decimals", _compute)
+    monkeypatch.setattr(pi_store_module, "STREAM_FIRST_BLOCK", 100)
+    store = PiDigitStore(tmp_path / "pi.bin", min_digits=5000)
+    chunks = store.iter_pi(700)
+
+    assert next(chunks) == "3"
+    assert next(chunks) == "."
+    assert next(chunks) == _mpmath_pi(120)[2:102]
+    assert computed == [100]
+
+    assert "".join(chunks) == _mpmath_pi(720)[102:701]
+    assert computed == [100, 200, 400, 800]
+
+
+def test_iter_pi_holds_back_nines_until_rounding_is_known(tmp_path):
+    store = PiDigitStore(tmp_path / "pi.bin")
+    exact = Decimal("3." + store.decimals(0, 800))
+
+    # Decimals 762-767 are the six nines of the Feynman point; mpmath's own str() rounds
+    # twice there, so the reference is the exact expansion rounded by ``decimal``.
+    for digits in range(758, 772):
+        with localcontext() as context:
+            context.prec = 1000
+            expected = exact.quantize(Decimal(1).scaleb(1 - digits), rounding=ROUND_HALF_UP)
+        assert "".join(store.iter_pi(digits, rounding="ROUND")) == str(expected)
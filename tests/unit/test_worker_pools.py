@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import threading
+from time import monotonic
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+
+from src.app.infrastructure.celery.app import celery_app
+from src.app.worker.autoscale import QueueDepthAutoscaler
+from src.app.worker.main import pool_implementation, worker_argv
+from src.app.worker.pools import ResizableThreadPool
+from src.setup.worker_config import WorkerPoolSettings, WorkerSettings
+
+
+class FakePool:
+    def __init__(self, processes: int) -> None:
+        self.num_processes = processes
+
+    def grow(self, n: int) -> None:
+        self.num_processes += n
+
+    def shrink(self, n: int) -> None:
+        self.num_processes -= n
+
+    def maintain_pool(self) -> None:
+        pass
+
+
+class FakePipeline:
+    def __init__(self, lengths: dict[str, int]) -> None:
+        self._lengths = lengths
+        self._keys: list[str] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def llen(self, key: str) -> None:
+        self._keys.append(key)
+
+    def execute(self) -> list[int]:
+        return [self._lengths.get(key, 0) for key in self._keys]
+
+
+def _autoscaler(pool: FakePool, lengths: dict[str, int]) -> QueueDepthAutoscaler:
+    scaler = QueueDepthAutoscaler(pool, 8, 2, worker=SimpleNamespace(app=celery_app), keepalive=1)
+    scaler._keys = list(lengths)
+    scaler._redis = SimpleNamespace(pipeline=lambda transaction: FakePipeline(lengths))
+    return scaler
+
+
+def test_autoscaler_grows_with_queue_depth_up_to_max():
+    pool = FakePool(processes=2)
+    scaler = _autoscaler(pool, {"celery": 3, "celery\x06\x166": 2})
+
+    scaler.maybe_scale()
+    assert pool.num_processes == 5
+
+    scaler._depth_checked_at = None
+    scaler._redis = SimpleNamespace(pipeline=lambda transaction: FakePipeline({"celery": 50}))
+    scaler.maybe_scale()
+    assert pool.num_processes == 8
+
+
+def test_autoscaler_shrinks_to_min_after_keepalive():
+    pool = FakePool(processes=6)
+    scaler = _autoscaler(pool, {"celery": 0})
+    scaler._last_scale_up = monotonic() - 10
+
+    scaler.maybe_scale()
+
+    assert pool.num_processes == 2
+
+
+def test_worker_argv_autoscales_prefork_and_thread_pools():
+    prefork = WorkerPoolSettings(
+        queue="celery", pool="prefork", min_concurrency=1, max_concurrency=4
+    )
+    threads = WorkerPoolSettings(queue="doc-tasks", pool="threads", max_concurrency=8)
+    solo = WorkerPoolSettings(queue="solo", pool="solo", max_concurrency=3)
+
+    prefork_argv = worker_argv(prefork, "INFO")
+    threads_argv = worker_argv(threads, "INFO")
+    solo_argv = worker_argv(solo, "INFO")
+
+    assert prefork_argv[prefork_argv.index("--autoscale") + 1] == "4,1"
+    assert prefork_argv[prefork_argv.index("-Q") + 1] == "celery"
+    assert threads_argv[threads_argv.index("--autoscale") + 1] == "8,1"
+    assert "--autoscale" not in solo_argv
+    assert solo_argv[solo_argv.index("--concurrency") + 1] == "3"
+    assert pool_implementation(threads) == "src.app.worker.pools:ResizableThreadPool"
+    assert pool_implementation(prefork) == "prefork"
+
+
+def test_thread_pool_resizes_and_lets_running_tasks_finish():
+    pool = ResizableThreadPool(limit=2)
+    release = threading.Event()
+    started = threading.Event()
+    running = pool.executor.submit(lambda: (started.set(), release.wait(timeout=10)))
+    started.wait(timeout=10)
+
+    pool.grow(3)
+    assert pool.num_processes == 5
+    assert pool.executor.submit(lambda: "new").result(timeout=10) == "new"
+    pool.shrink(4)
+    assert pool.num_processes == 1
+    assert not running.done()
+
+    release.set()
+    pool.on_stop()
+    assert running.done()
+
+
+def test_legacy_celery_settings_map_onto_worker_pools(monkeypatch):
+    monkeypatch.setenv("CELERY_CONCURRENCY", "3")
+    monkeypatch.setenv("CELERY_QUEUES", "doc-tasks, bulk")
+    monkeypatch.delenv("WORKER_POOLS", raising=False)
+
+    pools = WorkerSettings(_env_file=None).WORKER_POOLS
+
+    assert [(pool.queue, pool.pool, pool.min_concurrency, pool.max_concurrency) for pool in pools] == [
+        ("doc-tasks", "threads", 3, 3),
+        ("bulk", "prefork", 3, 3),
+    ]
+
+
+def test_worker_pools_take_precedence_over_legacy_celery_settings(monkeypatch):
+    monkeypatch.setenv("CELERY_CONCURRENCY", "3")
+    monkeypatch.setenv("WORKER_POOLS", '[{"queue": "celery", "max_concurrency": 6}]')
+
+    (pool,) = WorkerSettings(_env_file=None).WORKER_POOLS
+
+    assert (pool.queue, pool.max_concurrency) == ("celery", 6)
+
+
+@pytest.mark.parametrize("pool", ["gevent", "eventlet"])
+def test_green_pools_are_rejected(pool):
+    with pytest.raises(ValidationError):
+        WorkerPoolSettings(queue="doc-tasks", pool=pool)
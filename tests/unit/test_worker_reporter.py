@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+
+from src.app.domain.events.task_event import TaskEvent
+from src.app.worker.reporter import TaskReporter, from_columns, to_columns
+
+
+class RecordingPublisher:
+    def __init__(self) -> None:
+        self.events: list[TaskEvent] = []
+
+    def publish(self, event: TaskEvent) -> None:
+        self.events.append(event)
+
+
+def _snippet(file: str, keyword: str, line: int) -> dict:
+    return {
+        "type": "snippet_found",
+        "keyword": keyword,
+        "snippet": f"... {keyword} ...",
+        "location": {"chunk_index": 0, "line": line},
+        "file": file,
+    }
+
+
+def test_columns_round_trip_with_header_and_keyword_table():
+    items = [_snippet("moby.txt", "whale", 1), _snippet("moby.txt", "WHALE", 2)]
+    items.append(_snippet("moby.txt", "whale", 7))
+
+    data = to_columns(items, header=("type", "file"), dictionary=("keyword",))
+
+    assert data["header"] == {"type": "snippet_found", "file": "moby.txt"}
+    assert data["dictionaries"] == {"keyword": ["whale", "WHALE"]}
+    assert data["columns"]["keyword"] == [0, 1, 0]
+    assert data["columns"]["location.line"] == [1, 2, 7]
+    assert from_columns(data) == items
+    assert len(json.dumps(data)) < len(json.dumps(items))
+
+
+def test_columnar_chunks_split_on_header_change_and_flush():
+    publisher = RecordingPublisher()
+    reporter = TaskReporter("task-1", publisher=publisher)
+
+    with reporter.report_result_chunk(
+        batch_size=100, columnar=True, header=("type", "file"), dictionary=("keyword",)
+    ) as chunks:
+        chunks.emit(_snippet("a.txt", "whale", 1))
+        chunks.emit(_snippet("a.txt", "whale", 2))
+        chunks.emit(_snippet("b.txt", "whale", 1))
+        chunks.flush()
+        chunks.flush()
+        chunks.emit(_snippet("b.txt", "whale", 9))
+
+    payloads = [event.payload for event in publisher.events]
+    assert [payload["chunk_id"] for payload in payloads] == ["0", "1", "2"]
+    assert [payload["is_last"] for payload in payloads] == [False, False, True]
+    decoded = [from_columns(payload["data"]) for payload in payloads]
+    assert [[(item["file"], item["location"]["line"]) for item in chunk] for chunk in decoded] == [
+        [("a.txt", 1), ("a.txt", 2)],
+        [("b.txt", 1)],
+        [("b.txt", 9)],
+    ]
+
+
+class CountingCancellation:
+    def __init__(self) -> None:
+        self.cancelled = False
+        self.checks = 0
+
+    def is_cancel_requested(self, task_id: str) -> bool:
+        self.checks += 1
+        return self.cancelled
+
+
+def test_cancellation_flag_is_read_at_most_once_per_interval():
+    cancellation = CountingCancellation()
+    reporter = TaskReporter(
+        "task-1",
+        publisher=RecordingPublisher(),
+        cancellation=cancellation,
+        cancel_check_interval=3600,
+    )
+
+    assert not any(reporter.cancel_requested() for _ in range(1000))
+    cancellation.cancelled = True
+    assert not reporter.cancel_requested()
+    assert cancellation.checks == 1
+
+    reporter = TaskReporter(
+        "task-1", publisher=RecordingPublisher(), cancellation=cancellation, cancel_check_interval=0
+    )
+    assert reporter.cancel_requested()
+    cancellation.cancelled = False
+    assert reporter.cancel_requested()
+    assert cancellation.checks == 2
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import re
+
+import billiard
+import pytest
+
+from src.app.worker import matching
+from src.app.worker.scanning import DocumentScanner, line_aligned_ranges
+
+TEXT = (
+    "Call me Ishmael. Some years ago, never mind how long precisely,\n"
+    "having little or no money in my purse, and nothing particular\n"
+    "to interest me on shore, I thought I would sail about a little\n"
+    "and see the watery part of the world. Whale! WHALE! whale.\n"
+)
+
+
+def _expected(keyword_pattern: str) -> list[tuple[int, int, str]]:
+    hits = []
+    offset = 0
+    for number, line in enumerate(TEXT.splitlines(keepends=True), start=1):
+        for match in re.finditer(keyword_pattern, line, re.IGNORECASE):
+            hits.append((offset + match.start(), number, match.group(0)))
+        offset += len(line)
+    return hits
+
+
+def _scan(scanner: DocumentScanner, path) -> list[tuple[int, int, str]]:
+    return [
+        (hit.start, hit.line, hit.keyword)
+        for window in scanner.scan(path)
+        for hit in window.hits
+    ]
+
+
+@pytest.fixture
+def document(tmp_path):
+    path = tmp_path / "moby.txt"
+    path.write_bytes(TEXT.encode("utf-8"))
+    return path
+
+
+@pytest.mark.parametrize("window_bytes", [7, 16, 64, 1 << 20])
+def test_matches_and_line_numbers_do_not_depend_on_window_size(document, window_bytes):
+    scanner = DocumentScanner(["little", "whale", "me"], window_bytes=window_bytes)
+
+    assert _scan(scanner, document) == _expected("little|whale|me")
+
+
+def test_window_totals_cover_the_whole_document(document):
+    windows = list(DocumentScanner(["whale"], window_bytes=50).scan(document))
+
+    assert sum(window.lines for window in windows) == TEXT.count("\n")
+    assert windows[-1].end == len(TEXT)
+    assert sum(window.words for window in windows) == len(TEXT.split())
+
+
+def test_regex_matches_do_not_overlap_across_windows(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"aaaaaaa")
+
+    hits = _scan(DocumentScanner(["aa"], window_bytes=3), path)
+
+    assert [start for start, _, _ in hits] == [0, 2, 4]
+
+
+def test_aho_corasick_scan_reports_overlaps_once(document, monkeypatch):
+    monkeypatch.setattr(matching, "AHO_CORASICK_MIN_KEYWORDS", 2)
+    scanner = DocumentScanner(["whale", "hale", "WHAL"], window_bytes=16)
+
+    starts = [(start, keyword) for start, _, keyword in _scan(scanner, document)]
+
+    whale = TEXT.index("Whale")
+    assert starts[:3] == [(whale, "Whal"), (whale, "Whale"), (whale + 1, "hale")]
+    assert len(starts) == 9
+
+
+def test_snippets_are_cut_around_the_match(document):
+    scanner = DocumentScanner(["purse"], snippet_radius=5)
+
+    (window,) = scanner.scan(document)
+
+    assert window.hits[0].snippet == "n my purse, and"
+
+
+def test_ranges_start_at_line_starts_and_cover_the_file(document):
+    ranges = line_aligned_ranges(document, 3)
+
+    assert [start for start, _ in ranges] == [0, TEXT.index("to "), TEXT.index("and see")]
+    assert ranges[-1][1] == len(TEXT)
+    assert all(stop == start for (_, stop), (start, _) in zip(ranges, ranges[1:]))
+
+
+def test_parallel_scan_merges_ranges_in_document_order(document):
+    scanner = DocumentScanner(["little", "whale", "me"], window_bytes=16)
+    progress: list[int] = []
+
+    windows = list(scanner.scan_parallel(document, 3, on_progress=progress.append))
+    hits = [(hit.start, hit.line, hit.keyword) for window in windows for hit in window.hits]
+
+    assert hits == _expected("little|whale|me")
+    assert [window.index for window in windows] == [0, 1, 2]
+    assert sum(window.words for window in windows) == len(TEXT.split())
+    assert len(progress) == 3 and progress[-1] == len(TEXT)
+
+
+def _parallel_hits_into(results, path, keywords: list[str]) -> None:
+    try:
+        scanner = DocumentScanner(keywords, window_bytes=16)
+        results.put([hit.start for window in scanner.scan_parallel(path, 3) for hit in window.hits])
+    except BaseException as exc:
+        results.put(repr(exc))
+
+
+def test_parallel_scan_runs_inside_a_daemonic_process(document):
+    # Celery's prefork pool runs tasks in daemonic billiard children.
+    results = billiard.Queue()
+    child = billiard.Process(
+        target=_parallel_hits_into, args=(results, document, ["whale"]), daemon=True
+    )
+    child.start()
+    try:
+        assert results.get(timeout=60) == [start for start, _, _ in _expected("whale")]
+    finally:
+        child.join(timeout=10)
+
+
+@pytest.mark.parametrize("block_bytes", [1, 5, 64, 1 << 20])
+def test_streamed_scan_matches_the_file_scan(document, block_bytes):
+    scanner = DocumentScanner(["little", "whale", "me"], window_bytes=16, snippet_radius=8)
+    data = TEXT.encode("utf-8")
+    blocks = (data[start : start + block_bytes] for start in range(0, len(data), block_bytes))
+
+    assert list(scanner.scan_stream(blocks)) == list(scanner.scan(document))
+
+
+def test_dense_documents_keep_every_hit_below_the_line_cap(tmp_path):
+    path = tmp_path / "dense.txt"
+    path.write_bytes(b"the cat and the hat on the mat\n" * 20000)
+    scanner = DocumentScanner(["the"])
+
+    assert sum(len(window.hits) for window in scanner.scan(path)) == 60000
+    assert sum(len(window.hits) for window in scanner.scan_parallel(path, 3)) == 60000
+
+
+def test_hits_are_capped_per_block_of_lines(tmp_path):
+    path = tmp_path / "dense.txt"
+    path.write_bytes(b"a a a a a\n" * 10 + b"a\n" * 10)
+    scanner = DocumentScanner(["a"], window_bytes=16, max_hits_per_block=3, block_lines=5)
+
+    lines = [hit.line for window in scanner.scan(path) for hit in window.hits]
+
+    assert lines == [1, 1, 1, 6, 6, 6, 11, 12, 13, 16, 17, 18]
+
+
+def test_non_ascii_keywords_match_in_any_case(tmp_path):
+    path = tmp_path / "aerger.txt"
+    path.write_text("Ärger und ärger\nÄRGER\n" * 100, encoding="utf-8")
+
+    for keyword in ("Ärger", "ärger"):
+        hits = _scan(DocumentScanner([keyword], window_bytes=64), path)
+        assert len(hits) == 300